@@ -0,0 +1,46 @@
+"""
+Gunicorn configuration for serving the ASGI application in production.
+
+Each worker runs a uvicorn event loop, so async views can keep many Langfuse
+calls in flight per worker instead of tying up one thread per call.
+
+Usage:
+    gunicorn admin.asgi:application -c admin/gunicorn.conf.py
+
+The WSGI entry point (admin.wsgi) keeps working for sync-only deployments;
+async views are then executed per request through Django's async adapter.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+# uvicorn's gunicorn worker; Django does not implement the ASGI lifespan protocol
+worker_class = 'uvicorn_worker.UvicornWorker'
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+
+# Requests that wait on slow Langfuse responses should not be killed early
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', '5'))
+
+accesslog = '-'
+
+
+def post_worker_init(worker):
+    """
+    Warm the score config registry so scoring never waits on a lookup.
+
+    Done here rather than in AppConfig.ready() so management commands and
+    test runs never start the background loop or call Langfuse.
+    """
+    from core.langfuse.config import config
+    if config.preload_score_configs and config.public_key:
+        from core.langfuse.service import langfuse_service
+        langfuse_service.preload_score_configs()
+
+
+def worker_exit(server, worker):
+    """Close pooled Langfuse connections when a worker shuts down."""
+    from core.langfuse.runner import background_loop
+    background_loop.stop()
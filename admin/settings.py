@@ -187,3 +187,139 @@ CSRF_TRUSTED_ORIGINS = os.environ.get(
 LANGFUSE_PUBLIC_KEY = os.environ.get('LANGFUSE_PUBLIC_KEY')
 LANGFUSE_SECRET_KEY = os.environ.get('LANGFUSE_SECRET_KEY')
 LANGFUSE_API_BASE_URL = os.environ.get('LANGFUSE_API_BASE_URL')
+
+# Langfuse HTTP connection pool
+# A single keep-alive client is shared per process so repeated calls reuse
+# TCP/TLS connections instead of opening a new one per request
+LANGFUSE_HTTP_MAX_CONNECTIONS = int(os.environ.get('LANGFUSE_HTTP_MAX_CONNECTIONS', '20'))
+LANGFUSE_HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get('LANGFUSE_HTTP_MAX_KEEPALIVE_CONNECTIONS', '10'))
+LANGFUSE_HTTP_KEEPALIVE_EXPIRY = float(os.environ.get('LANGFUSE_HTTP_KEEPALIVE_EXPIRY', '30'))
+LANGFUSE_HTTP_TIMEOUT = float(os.environ.get('LANGFUSE_HTTP_TIMEOUT', '10'))
+LANGFUSE_HTTP_CONNECT_TIMEOUT = float(os.environ.get('LANGFUSE_HTTP_CONNECT_TIMEOUT', '5'))
+
+# Upper bound (seconds) a sync view waits on a Langfuse call running on the
+# background event loop before giving up
+LANGFUSE_SYNC_TIMEOUT = float(os.environ.get('LANGFUSE_SYNC_TIMEOUT', '30'))
+
+# Langfuse payload caching
+# Sessions are cached in-process (LRU bounded by MAX_ENTRIES). Set
+# LANGFUSE_CACHE_ALIAS to a configured Django cache alias to share cached
+# payloads across workers instead.
+LANGFUSE_CACHE_ALIAS = os.environ.get('LANGFUSE_CACHE_ALIAS') or None
+LANGFUSE_SESSION_CACHE_TTL = float(os.environ.get('LANGFUSE_SESSION_CACHE_TTL', '300'))
+# Sessions whose latest trace is newer than ACTIVE_WINDOW seconds are still
+# receiving traces and only cached for ACTIVE_TTL seconds
+LANGFUSE_SESSION_CACHE_ACTIVE_TTL = float(os.environ.get('LANGFUSE_SESSION_CACHE_ACTIVE_TTL', '15'))
+LANGFUSE_SESSION_ACTIVE_WINDOW = float(os.environ.get('LANGFUSE_SESSION_ACTIVE_WINDOW', '900'))
+LANGFUSE_SESSION_CACHE_MAX_ENTRIES = int(os.environ.get('LANGFUSE_SESSION_CACHE_MAX_ENTRIES', '64'))
+# Last good copy of each session, served for up to STALE_IF_ERROR seconds
+# when Langfuse is down or its circuit breaker is open
+LANGFUSE_SESSION_CACHE_STALE_IF_ERROR = float(os.environ.get('LANGFUSE_SESSION_CACHE_STALE_IF_ERROR', '3600'))
+# Decode sessions keeping only the fields and messages the chat views render
+# instead of the full payload
+LANGFUSE_SESSION_PROJECTION = os.environ.get('LANGFUSE_SESSION_PROJECTION', 'True').lower() in ('true', '1', 't')
+# Parse projected sessions incrementally with ijson (when installed) instead
+# of a full orjson decode: lower peak memory, but several times slower
+LANGFUSE_SESSION_STREAMING = os.environ.get('LANGFUSE_SESSION_STREAMING', 'False').lower() in ('true', '1', 't')
+# Queue list and queue metadata are served stale-while-revalidate: refreshed
+# in the background after SOFT_TTL, refetched inline after HARD_TTL, and kept
+# for STALE_IF_ERROR seconds as a fallback when Langfuse errors
+LANGFUSE_QUEUE_CACHE_SOFT_TTL = float(os.environ.get('LANGFUSE_QUEUE_CACHE_SOFT_TTL', '30'))
+LANGFUSE_QUEUE_CACHE_HARD_TTL = float(os.environ.get('LANGFUSE_QUEUE_CACHE_HARD_TTL', '600'))
+LANGFUSE_QUEUE_CACHE_STALE_IF_ERROR = float(os.environ.get('LANGFUSE_QUEUE_CACHE_STALE_IF_ERROR', '86400'))
+
+# Parsed session chat structures are memoized in-process per session and
+# trace set so repeat views of an unchanged session skip parsing. Parsed
+# turns are also kept per trace, so a session that grew only parses its new
+# traces
+SESSION_CHAT_CACHE_MAX_ENTRIES = int(os.environ.get('SESSION_CHAT_CACHE_MAX_ENTRIES', '64'))
+SESSION_CHAT_CACHE_TTL = float(os.environ.get('SESSION_CHAT_CACHE_TTL', '3600'))
+# Sessions that are not memoized yet are streamed by the session viewer, one
+# chat turn at a time as it is parsed
+SESSION_VIEWER_STREAMING = os.environ.get('SESSION_VIEWER_STREAMING', 'True').lower() in ('true', '1', 't')
+# Expanded tool panels show at most this many bytes of a tool's output, with
+# a link that streams the rest
+SESSION_TOOL_OUTPUT_MAX_BYTES = int(os.environ.get('SESSION_TOOL_OUTPUT_MAX_BYTES', '16384'))
+# Session chats render their first WINDOW_SIZE turns with the page and load
+# the rest in windows of the same size as the user scrolls
+SESSION_CHAT_WINDOW_SIZE = int(os.environ.get('SESSION_CHAT_WINDOW_SIZE', '50'))
+# Chat messages are rendered from markdown to sanitized HTML on the server;
+# rendered HTML is memoized in-process by the hash of the source text
+MARKDOWN_CACHE_MAX_ENTRIES = int(os.environ.get('MARKDOWN_CACHE_MAX_ENTRIES', '4096'))
+MARKDOWN_CACHE_TTL = float(os.environ.get('MARKDOWN_CACHE_TTL', '86400'))
+
+# Score configs are loaded into memory when a gunicorn worker starts (when
+# credentials are set, see admin/gunicorn.conf.py) or on first use, and
+# re-checked in the background every REFRESH_INTERVAL seconds
+LANGFUSE_PRELOAD_SCORE_CONFIGS = os.environ.get('LANGFUSE_PRELOAD_SCORE_CONFIGS', 'True').lower() in ('true', '1', 't')
+LANGFUSE_SCORE_CONFIG_REFRESH_INTERVAL = float(os.environ.get('LANGFUSE_SCORE_CONFIG_REFRESH_INTERVAL', '300'))
+LANGFUSE_SCORE_CONFIG_MAX_AGE = float(os.environ.get('LANGFUSE_SCORE_CONFIG_MAX_AGE', '3600'))
+
+# Full-queue crawls read page 1 for totalPages, then fetch the remaining
+# pages with at most CONCURRENCY requests in flight
+LANGFUSE_CRAWL_PAGE_SIZE = int(os.environ.get('LANGFUSE_CRAWL_PAGE_SIZE', '100'))
+LANGFUSE_CRAWL_CONCURRENCY = int(os.environ.get('LANGFUSE_CRAWL_CONCURRENCY', '8'))
+
+# queue_detail is served from the local tables filled by the
+# sync_annotation_queues command while the queue's last item sync is younger
+# than MAX_AGE seconds; older or never-synced queues are read from Langfuse
+ANNOTATION_QUEUE_SYNC_MAX_AGE = float(os.environ.get('ANNOTATION_QUEUE_SYNC_MAX_AGE', '900'))
+
+# Langfuse calls that hit a throttle (429), a 5xx or a network error are
+# retried up to MAX_ATTEMPTS times with jittered exponential backoff
+# (BASE * 2^n seconds, capped at BACKOFF_MAX) or after the server's
+# Retry-After. DEADLINE bounds each call including its retries.
+LANGFUSE_RETRY_MAX_ATTEMPTS = int(os.environ.get('LANGFUSE_RETRY_MAX_ATTEMPTS', '4'))
+LANGFUSE_RETRY_BACKOFF_BASE = float(os.environ.get('LANGFUSE_RETRY_BACKOFF_BASE', '0.5'))
+LANGFUSE_RETRY_BACKOFF_MAX = float(os.environ.get('LANGFUSE_RETRY_BACKOFF_MAX', '8'))
+LANGFUSE_RETRY_DEADLINE = float(os.environ.get('LANGFUSE_RETRY_DEADLINE', '20'))
+
+# Client-side rate limits per Langfuse endpoint family as
+# (requests per second, burst). Requests wait up to MAX_WAIT seconds for a
+# slot before failing. Limits are per process unless
+# LANGFUSE_RATE_LIMIT_CACHE_ALIAS names a Django cache shared by all workers,
+# which must be Redis or Memcached (their increments are atomic).
+LANGFUSE_RATE_LIMIT_ENABLED = os.environ.get('LANGFUSE_RATE_LIMIT_ENABLED', 'True').lower() in ('true', '1', 't')
+LANGFUSE_RATE_LIMITS = {
+    'annotation_queues': (
+        float(os.environ.get('LANGFUSE_RATE_LIMIT_ANNOTATION_QUEUES', '10')),
+        int(os.environ.get('LANGFUSE_RATE_LIMIT_ANNOTATION_QUEUES_BURST', '20')),
+    ),
+    'sessions': (
+        float(os.environ.get('LANGFUSE_RATE_LIMIT_SESSIONS', '10')),
+        int(os.environ.get('LANGFUSE_RATE_LIMIT_SESSIONS_BURST', '20')),
+    ),
+    'scores': (
+        float(os.environ.get('LANGFUSE_RATE_LIMIT_SCORES', '5')),
+        int(os.environ.get('LANGFUSE_RATE_LIMIT_SCORES_BURST', '10')),
+    ),
+    'traces': (
+        float(os.environ.get('LANGFUSE_RATE_LIMIT_TRACES', '10')),
+        int(os.environ.get('LANGFUSE_RATE_LIMIT_TRACES_BURST', '20')),
+    ),
+}
+LANGFUSE_RATE_LIMIT_MAX_WAIT = float(os.environ.get('LANGFUSE_RATE_LIMIT_MAX_WAIT', '5'))
+LANGFUSE_RATE_LIMIT_CACHE_ALIAS = os.environ.get('LANGFUSE_RATE_LIMIT_CACHE_ALIAS') or None
+
+# Per endpoint family, FAILURE_THRESHOLD consecutive failed Langfuse calls
+# (timeouts, network errors, 5xx) open a circuit breaker: calls then fail
+# fast, or fall back to cached data, for RESET_TIMEOUT seconds before a
+# single probe call is let through. State is visible to staff at
+# /langfuse/status/.
+LANGFUSE_CIRCUIT_ENABLED = os.environ.get('LANGFUSE_CIRCUIT_ENABLED', 'True').lower() in ('true', '1', 't')
+LANGFUSE_CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get('LANGFUSE_CIRCUIT_FAILURE_THRESHOLD', '5'))
+LANGFUSE_CIRCUIT_RESET_TIMEOUT = float(os.environ.get('LANGFUSE_CIRCUIT_RESET_TIMEOUT', '30'))
+
+# Concurrent identical Langfuse GETs share one upstream request per process.
+# Set LANGFUSE_SINGLE_FLIGHT_CACHE_ALIAS to a Django cache shared by all
+# workers to also coalesce across workers: one worker fetches under a lock
+# held for at most LOCK_TIMEOUT seconds and publishes the payload for
+# RESULT_TTL seconds to the others.
+LANGFUSE_SINGLE_FLIGHT_ENABLED = os.environ.get('LANGFUSE_SINGLE_FLIGHT_ENABLED', 'True').lower() in ('true', '1', 't')
+LANGFUSE_SINGLE_FLIGHT_CACHE_ALIAS = os.environ.get('LANGFUSE_SINGLE_FLIGHT_CACHE_ALIAS') or None
+LANGFUSE_SINGLE_FLIGHT_LOCK_TIMEOUT = float(os.environ.get('LANGFUSE_SINGLE_FLIGHT_LOCK_TIMEOUT', '10'))
+LANGFUSE_SINGLE_FLIGHT_RESULT_TTL = float(os.environ.get('LANGFUSE_SINGLE_FLIGHT_RESULT_TTL', '2'))
+
+# JSON decoder for Langfuse responses: "auto" picks the fastest installed of
+# orjson, msgspec and the stdlib json module, or name one explicitly
+LANGFUSE_JSON_BACKEND = os.environ.get('LANGFUSE_JSON_BACKEND', 'auto')
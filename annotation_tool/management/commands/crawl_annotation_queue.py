@@ -0,0 +1,77 @@
+"""
+Management command to fetch every item of a Langfuse annotation queue.
+Pages are crawled concurrently instead of one request at a time.
+"""
+
+import json
+import time
+from django.core.management.base import BaseCommand, CommandError
+from core.langfuse.exceptions import LangfuseAPIError
+from core.langfuse.service import langfuse_service
+
+
+class Command(BaseCommand):
+    help = 'Fetch all items of an annotation queue from Langfuse using concurrent page requests'
+
+    def add_arguments(self, parser):
+        """Add command line arguments"""
+        parser.add_argument(
+            'queue_id',
+            type=str,
+            help='Langfuse annotation queue ID'
+        )
+        parser.add_argument(
+            '--status',
+            type=str,
+            choices=['PENDING', 'COMPLETED'],
+            help='Only fetch items with this status'
+        )
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            help='Items per page request (defaults to LANGFUSE_CRAWL_PAGE_SIZE)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            help='Maximum page requests in flight (defaults to LANGFUSE_CRAWL_CONCURRENCY)'
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='Write items as JSON lines to this file ("-" for stdout)'
+        )
+
+    def handle(self, *args, **options):
+        """Main command handler"""
+        queue_id = options['queue_id']
+        crawl_options = {
+            key: options[key]
+            for key in ('page_size', 'concurrency')
+            if options[key] is not None
+        }
+
+        output = None
+        if options['output'] and options['output'] != '-':
+            output = open(options['output'], 'w', encoding='utf-8')
+
+        started = time.monotonic()
+        count = 0
+        try:
+            for item in langfuse_service.iter_queue_items(queue_id, options['status'], **crawl_options):
+                count += 1
+                line = json.dumps(item, ensure_ascii=False)
+                if output:
+                    output.write(line + '\n')
+                elif options['output'] == '-':
+                    self.stdout.write(line)
+        except LangfuseAPIError as e:
+            raise CommandError(f'Failed to crawl queue {queue_id} after {count} items: {e}')
+        finally:
+            if output:
+                output.close()
+
+        elapsed = time.monotonic() - started
+        self.stderr.write(
+            self.style.SUCCESS(f'✓ Fetched {count} items from queue {queue_id} in {elapsed:.2f}s')
+        )
@@ -0,0 +1,76 @@
+"""
+Management command to mirror Langfuse annotation queues and items into the
+local database. Run it on a schedule so queue pages can be served locally.
+"""
+
+import time
+from django.core.management.base import BaseCommand, CommandError
+from core.langfuse.exceptions import LangfuseAPIError
+from annotation_tool.models import AnnotationQueue
+from annotation_tool.sync import sync_queues, sync_queue_items
+
+
+class Command(BaseCommand):
+    help = 'Sync annotation queues and their items from Langfuse into the local database'
+
+    def add_arguments(self, parser):
+        """Add command line arguments"""
+        parser.add_argument(
+            'queue_ids',
+            nargs='*',
+            type=str,
+            help='Only sync items of these queues (defaults to every active queue)'
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Rewrite every item instead of only new or changed ones'
+        )
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            help='Items per page request (defaults to LANGFUSE_CRAWL_PAGE_SIZE)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            help='Maximum page requests in flight (defaults to LANGFUSE_CRAWL_CONCURRENCY)'
+        )
+
+    def handle(self, *args, **options):
+        """Main command handler"""
+        crawl_options = {
+            key: options[key]
+            for key in ('page_size', 'concurrency')
+            if options[key] is not None
+        }
+
+        queue_ids = options['queue_ids']
+        if not queue_ids:
+            try:
+                queues = sync_queues()
+            except LangfuseAPIError as e:
+                raise CommandError(f'Failed to sync annotation queues: {e}')
+            self.stdout.write(f'Synced {len(queues)} queues')
+            queue_ids = list(
+                AnnotationQueue.objects.filter(is_active=True).values_list('queue_id', flat=True)
+            )
+
+        failed = []
+        for queue_id in queue_ids:
+            started = time.monotonic()
+            try:
+                result = sync_queue_items(queue_id, full=options['full'], **crawl_options)
+            except LangfuseAPIError as e:
+                self.stderr.write(self.style.ERROR(f'✗ Failed to sync queue {queue_id}: {e}'))
+                failed.append(queue_id)
+                continue
+            elapsed = time.monotonic() - started
+            self.stdout.write(self.style.SUCCESS(
+                f'✓ {queue_id}: {result.fetched} fetched, {result.created} created, '
+                f'{result.updated} updated, {result.unchanged} unchanged, '
+                f'{result.deleted} deleted in {elapsed:.2f}s'
+            ))
+
+        if failed:
+            raise CommandError(f'Failed to sync {len(failed)} of {len(queue_ids)} queues')
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnnotationQueue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('queue_id', models.CharField(help_text='Langfuse queue ID', max_length=255, unique=True)),
+                ('name', models.CharField(help_text='Queue display name', max_length=255)),
+                ('description', models.TextField(blank=True, help_text='Queue description', null=True)),
+                ('created_at', models.DateTimeField(help_text='Queue creation timestamp from API')),
+                ('updated_at', models.DateTimeField(help_text='Queue last update timestamp from API')),
+                ('is_active', models.BooleanField(default=True, help_text='Whether queue is active')),
+                ('items_synced_at', models.DateTimeField(blank=True, help_text="When this queue's items were last synced from Langfuse", null=True)),
+                ('created', models.DateTimeField(auto_now_add=True, help_text='Local creation timestamp')),
+                ('modified', models.DateTimeField(auto_now=True, help_text='Local modification timestamp')),
+            ],
+            options={
+                'verbose_name': 'Annotation Queue',
+                'verbose_name_plural': 'Annotation Queues',
+                'ordering': ['-updated_at'],
+                'indexes': [models.Index(fields=['queue_id'], name='annotation__queue_i_262761_idx'), models.Index(fields=['name'], name='annotation__name_e82f29_idx'), models.Index(fields=['is_active'], name='annotation__is_acti_3e8537_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='AnnotationQueueItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('item_id', models.CharField(help_text='Langfuse item ID', max_length=255, unique=True)),
+                ('queue_id', models.CharField(help_text='Parent queue ID', max_length=255)),
+                ('object_id', models.CharField(help_text='ID of object being annotated', max_length=255)),
+                ('object_type', models.CharField(help_text='Type of object (TRACE, SESSION, etc.)', max_length=50)),
+                ('status', models.CharField(help_text='Item status (PENDING, COMPLETED, etc.)', max_length=50)),
+                ('created_at', models.DateTimeField(help_text='Item creation timestamp from API')),
+                ('updated_at', models.DateTimeField(help_text='Item last update timestamp from API')),
+                ('completed_at', models.DateTimeField(blank=True, help_text='Item completion timestamp', null=True)),
+                ('created', models.DateTimeField(auto_now_add=True, help_text='Local creation timestamp')),
+                ('modified', models.DateTimeField(auto_now=True, help_text='Local modification timestamp')),
+            ],
+            options={
+                'verbose_name': 'Annotation Queue Item',
+                'verbose_name_plural': 'Annotation Queue Items',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['item_id'], name='annotation__item_id_3e1faf_idx'), models.Index(fields=['queue_id'], name='annotation__queue_i_2c445a_idx'), models.Index(fields=['status'], name='annotation__status_986613_idx'), models.Index(fields=['object_type'], name='annotation__object__ea2742_idx'), models.Index(fields=['queue_id', '-created_at'], name='queue_item_queue_created_idx'), models.Index(fields=['queue_id', 'status', '-created_at'], name='queue_item_status_created_idx')],
+            },
+        ),
+    ]
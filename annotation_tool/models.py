@@ -1,4 +1,5 @@
 from django.db import models
+from core.langfuse.timestamps import parse_optional_timestamp, parse_timestamp
 
 
 class AnnotationQueue(models.Model):
@@ -6,8 +7,8 @@ class AnnotationQueue(models.Model):
     Model representing an annotation queue from Langfuse API.
     
     This model provides a data structure for annotation queue information
-    fetched from the Langfuse API. Currently used for data representation
-    only - no database persistence for MVP.
+    fetched from the Langfuse API. Rows are upserted by the sync engine in
+    annotation_tool.sync; views also build unsaved instances from API data.
     """
     
     # Langfuse queue identifier (primary key from API)
@@ -24,6 +25,11 @@ class AnnotationQueue(models.Model):
     # Additional fields for future use
     is_active = models.BooleanField(default=True, help_text="Whether queue is active")
     
+    # Local sync state
+    items_synced_at = models.DateTimeField(
+        null=True, blank=True, help_text="When this queue's items were last synced from Langfuse"
+    )
+    
     # Django model metadata
     created = models.DateTimeField(auto_now_add=True, help_text="Local creation timestamp")
     modified = models.DateTimeField(auto_now=True, help_text="Local modification timestamp")
@@ -53,11 +59,9 @@ class AnnotationQueue(models.Model):
         Returns:
             AnnotationQueue: Model instance (not saved to database)
         """
-        from datetime import datetime
-        
         # Parse timestamps from API
-        created_at = datetime.fromisoformat(api_data['createdAt'].replace('Z', '+00:00'))
-        updated_at = datetime.fromisoformat(api_data['updatedAt'].replace('Z', '+00:00'))
+        created_at = parse_timestamp(api_data['createdAt'])
+        updated_at = parse_timestamp(api_data['updatedAt'])
         
         return cls(
             queue_id=api_data['id'],
@@ -95,7 +99,8 @@ class AnnotationQueueItem(models.Model):
     Model representing an item in an annotation queue.
     
     This model provides structure for queue items fetched from Langfuse API.
-    Currently used for data representation only - no database persistence for MVP.
+    Rows are upserted by the sync engine in annotation_tool.sync so queue
+    pages, status filters and counts can be served from the database.
     """
     
     # Item identifiers
@@ -125,6 +130,9 @@ class AnnotationQueueItem(models.Model):
             models.Index(fields=['queue_id']),
             models.Index(fields=['status']),
             models.Index(fields=['object_type']),
+            # Queue detail pages: items of one queue, optionally by status, newest first
+            models.Index(fields=['queue_id', '-created_at'], name='queue_item_queue_created_idx'),
+            models.Index(fields=['queue_id', 'status', '-created_at'], name='queue_item_status_created_idx'),
         ]
     
     def __str__(self):
@@ -142,15 +150,10 @@ class AnnotationQueueItem(models.Model):
         Returns:
             AnnotationQueueItem: Model instance (not saved to database)
         """
-        from datetime import datetime
-        
         # Parse timestamps from API
-        created_at = datetime.fromisoformat(api_data['createdAt'].replace('Z', '+00:00'))
-        updated_at = datetime.fromisoformat(api_data['updatedAt'].replace('Z', '+00:00'))
-        
-        completed_at = None
-        if api_data.get('completedAt'):
-            completed_at = datetime.fromisoformat(api_data['completedAt'].replace('Z', '+00:00'))
+        created_at = parse_timestamp(api_data['createdAt'])
+        updated_at = parse_timestamp(api_data['updatedAt'])
+        completed_at = parse_optional_timestamp(api_data.get('completedAt'))
         
         return cls(
             item_id=api_data['id'],
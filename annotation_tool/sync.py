@@ -0,0 +1,180 @@
+"""
+Sync engine that mirrors Langfuse annotation queues and their items into the
+local AnnotationQueue / AnnotationQueueItem tables.
+
+Rows are upserted in bulk with a single INSERT ... ON CONFLICT statement per
+batch. Item syncs are incremental: the crawl compares each item's updatedAt
+with the stored row and only writes items that are new or changed. Items no
+longer returned by Langfuse are deleted once a crawl has completed, unless
+the queue changed during the crawl (see sync_queue_items).
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Iterable, List, Optional
+from django.db import transaction
+from django.utils import timezone
+from core.langfuse.service import langfuse_service
+from .models import AnnotationQueue, AnnotationQueueItem
+
+logger = logging.getLogger(__name__)
+
+# Rows written per INSERT ... ON CONFLICT statement
+BATCH_SIZE = 500
+
+QUEUE_UPDATE_FIELDS = ['name', 'description', 'created_at', 'updated_at', 'is_active', 'modified']
+ITEM_UPDATE_FIELDS = [
+    'queue_id', 'object_id', 'object_type', 'status',
+    'created_at', 'updated_at', 'completed_at', 'modified',
+]
+
+
+@dataclass
+class ItemSyncResult:
+    """Counts from syncing the items of one queue."""
+    queue_id: str
+    fetched: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+
+
+def upsert_queues(queues: Iterable[AnnotationQueue]) -> None:
+    """Insert or update queues keyed on queue_id."""
+    AnnotationQueue.objects.bulk_create(
+        list(queues),
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['queue_id'],
+        update_fields=QUEUE_UPDATE_FIELDS,
+    )
+
+
+def upsert_items(items: List[AnnotationQueueItem]) -> None:
+    """Insert or update queue items keyed on item_id."""
+    AnnotationQueueItem.objects.bulk_create(
+        items,
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['item_id'],
+        update_fields=ITEM_UPDATE_FIELDS,
+    )
+
+
+def sync_queues(limit: int = 100) -> List[AnnotationQueue]:
+    """
+    Sync every annotation queue from Langfuse.
+
+    Queues that no longer exist upstream are kept but marked inactive.
+
+    Returns:
+        List[AnnotationQueue]: The queues returned by Langfuse
+    """
+    queues = []
+    page = 1
+    while True:
+        response = langfuse_service.get_annotation_queues(page, limit)
+        queues.extend(AnnotationQueue.from_api_data(data) for data in response.data)
+        total_pages = (response.meta or {}).get('totalPages', 1)
+        if not response.data or page >= total_pages:
+            break
+        page += 1
+
+    with transaction.atomic():
+        upsert_queues(queues)
+        AnnotationQueue.objects.exclude(
+            queue_id__in=[queue.queue_id for queue in queues]
+        ).update(is_active=False)
+    return queues
+
+
+def sync_queue_items(queue_id: str, full: bool = False, **crawl_options) -> ItemSyncResult:
+    """
+    Sync the items of one queue from Langfuse.
+
+    Items missing from the crawl are deleted only when every page reported
+    the same totalItems and the crawl saw exactly that many items.
+
+    Args:
+        queue_id (str): Queue identifier
+        full (bool): Rewrite every item instead of only new or changed ones
+        **crawl_options: page_size, concurrency for the crawler
+
+    Returns:
+        ItemSyncResult: Counts of what was written
+    """
+    result = ItemSyncResult(queue_id=queue_id)
+    upsert_queues([AnnotationQueue.from_api_data(langfuse_service.get_annotation_queue(queue_id))])
+
+    known = dict(
+        AnnotationQueueItem.objects.filter(queue_id=queue_id).values_list('item_id', 'updated_at')
+    )
+    seen = set()
+    pending = []
+    totals: List[int] = []
+
+    for data in langfuse_service.iter_queue_items(queue_id, totals=totals, **crawl_options):
+        item = AnnotationQueueItem.from_api_data(data)
+        result.fetched += 1
+        seen.add(item.item_id)
+
+        stored_updated_at = known.get(item.item_id)
+        if stored_updated_at is None:
+            result.created += 1
+        elif full or stored_updated_at != item.updated_at:
+            result.updated += 1
+        else:
+            result.unchanged += 1
+            continue
+
+        pending.append(item)
+        if len(pending) >= BATCH_SIZE:
+            upsert_items(pending)
+            pending = []
+
+    # Offset pages shift when items are added or removed mid-crawl, so live
+    # items may have been skipped. Only a crawl whose pages all reported the
+    # same total, and that saw that many items, proves the rest are gone.
+    consistent = len(set(totals)) == 1 and totals[0] == len(seen)
+    if consistent:
+        removed = [item_id for item_id in known if item_id not in seen]
+    else:
+        removed = []
+        logger.warning(
+            f"Queue {queue_id} changed during the crawl (saw {len(seen)} items, totals {sorted(set(totals))}), "
+            "not deleting missing items until the next sync"
+        )
+    with transaction.atomic():
+        if pending:
+            upsert_items(pending)
+        for start in range(0, len(removed), BATCH_SIZE):
+            deleted, _ = AnnotationQueueItem.objects.filter(
+                item_id__in=removed[start:start + BATCH_SIZE]
+            ).delete()
+            result.deleted += deleted
+        AnnotationQueue.objects.filter(queue_id=queue_id).update(items_synced_at=timezone.now())
+
+    logger.info(
+        f"Synced queue {queue_id}: {result.fetched} fetched, {result.created} created, "
+        f"{result.updated} updated, {result.unchanged} unchanged, {result.deleted} deleted"
+    )
+    return result
+
+
+def get_synced_queue(queue_id: str, max_age: Optional[float] = None) -> Optional[AnnotationQueue]:
+    """
+    Return the stored queue if its items have been synced recently enough.
+
+    Args:
+        queue_id (str): Queue identifier
+        max_age (Optional[float]): Maximum seconds since the last item sync
+
+    Returns:
+        Optional[AnnotationQueue]: The queue, or None if it should be read from Langfuse
+    """
+    queues = AnnotationQueue.objects.filter(queue_id=queue_id, items_synced_at__isnull=False)
+    if max_age is not None:
+        queues = queues.filter(items_synced_at__gte=timezone.now() - timedelta(seconds=max_age))
+    return queues.first()
@@ -260,3 +260,360 @@ class AnnotationViewIntegrationTests(TestCase):
         self.assertEqual(item_dict['item_id'], 'item-123')
         self.assertEqual(item_dict['object_type'], 'TRACE')
         self.assertEqual(item_dict['status'], 'PENDING')
+
+
+class AnnotationAsyncViewTests(TestCase):
+    """Test cases for the async annotation views with a mocked Langfuse service."""
+
+    def setUp(self):
+        """Set up a superuser for the async views."""
+        self.superuser = User.objects.create_user(
+            username='admin',
+            password='testpass123',
+            is_superuser=True
+        )
+        self.superuser.must_change_password = False
+        self.superuser.save()
+        self.regular_user = User.objects.create_user(
+            username='user',
+            password='testpass123'
+        )
+        self.regular_user.must_change_password = False
+        self.regular_user.save()
+
+    def test_langfuse_views_are_async(self):
+        """Test that views talking to Langfuse are coroutine functions."""
+        from asgiref.sync import iscoroutinefunction
+        from annotation_tool import views
+
+        for view in (views.queue_list, views.queue_detail, views.annotate_object, views.submit_comment):
+            self.assertTrue(iscoroutinefunction(view), view.__name__)
+
+    async def test_queue_list_awaits_service(self):
+        """Test that the async queue list renders queues from the service."""
+        from unittest.mock import AsyncMock, patch
+        from core.langfuse.models import APIResponse
+
+        response_data = APIResponse(
+            data=[{
+                'id': 'queue-1',
+                'name': 'Async Queue',
+                'description': None,
+                'createdAt': '2024-01-01T00:00:00Z',
+                'updatedAt': '2024-01-02T00:00:00Z',
+            }],
+            meta={'totalItems': 1, 'page': 1, 'totalPages': 1}
+        )
+        await self.async_client.aforce_login(self.superuser)
+        with patch(
+            'annotation_tool.utils.langfuse_service.aget_annotation_queues',
+            new=AsyncMock(return_value=response_data)
+        ):
+            response = await self.async_client.get(reverse('annotation_tool:queue_list'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Async Queue')
+
+    async def test_async_view_permission_denied_redirects(self):
+        """Test that async views still enforce tool permissions."""
+        await self.async_client.aforce_login(self.regular_user)
+        response = await self.async_client.get(reverse('annotation_tool:queue_list'))
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.url, reverse('core:dashboard'))
+
+    async def test_submit_comment_awaits_service(self):
+        """Test that comment submission awaits the async scoring call."""
+        from unittest.mock import AsyncMock, patch
+
+        await self.async_client.aforce_login(self.superuser)
+        mock_comment = AsyncMock(return_value={'id': 'score-1'})
+        with patch('annotation_tool.views.langfuse_service.acreate_trace_comment', new=mock_comment):
+            response = await self.async_client.post(
+                reverse('annotation_tool:submit_comment'),
+                {'trace_id': 'trace-1', 'comment_text': 'Looks good'}
+            )
+
+        self.assertEqual(response.json(), {'success': True})
+        mock_comment.assert_awaited_once_with('trace-1', 'Looks good')
+
+    async def test_queue_detail_fetches_queue_and_items(self):
+        """Test that queue detail renders when both concurrent fetches succeed."""
+        from unittest.mock import AsyncMock, patch
+        from core.langfuse.models import APIResponse
+
+        queue = {
+            'id': 'queue-1',
+            'name': 'Parallel Queue',
+            'description': None,
+            'createdAt': '2024-01-01T00:00:00Z',
+            'updatedAt': '2024-01-02T00:00:00Z',
+        }
+        items = APIResponse(
+            data=[{
+                'id': 'item-1',
+                'queueId': 'queue-1',
+                'objectId': 'session-1',
+                'objectType': 'SESSION',
+                'status': 'PENDING',
+                'createdAt': '2024-01-01T00:00:00Z',
+                'updatedAt': '2024-01-02T00:00:00Z',
+            }],
+            meta={'totalItems': 1, 'page': 1, 'totalPages': 1}
+        )
+        await self.async_client.aforce_login(self.superuser)
+        with patch('annotation_tool.utils.langfuse_service.aget_annotation_queue', new=AsyncMock(return_value=queue)), \
+             patch('annotation_tool.utils.langfuse_service.aget_queue_items', new=AsyncMock(return_value=items)):
+            response = await self.async_client.get(
+                reverse('annotation_tool:queue_detail', kwargs={'queue_id': 'queue-1'})
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Parallel Queue')
+        self.assertEqual(response.context['total_items'], 1)
+
+    async def test_queue_detail_links_keep_live_mode(self):
+        """Test that pagination and filter links keep ?refresh=1 after "Load live"."""
+        from unittest.mock import AsyncMock, patch
+        from core.langfuse.models import APIResponse
+
+        queue = {
+            'id': 'queue-1',
+            'name': 'Live Queue',
+            'description': None,
+            'createdAt': '2024-01-01T00:00:00Z',
+            'updatedAt': '2024-01-02T00:00:00Z',
+        }
+        items = APIResponse(data=[], meta={'totalItems': 60, 'page': 2, 'totalPages': 3})
+        await self.async_client.aforce_login(self.superuser)
+        with patch('annotation_tool.utils.langfuse_service.aget_annotation_queue', new=AsyncMock(return_value=queue)), \
+             patch('annotation_tool.utils.langfuse_service.aget_queue_items', new=AsyncMock(return_value=items)):
+            url = reverse('annotation_tool:queue_detail', kwargs={'queue_id': 'queue-1'})
+            live = await self.async_client.get(url, {'refresh': '1', 'page': 2})
+            local = await self.async_client.get(url, {'page': 2})
+
+        self.assertContains(live, 'href="?refresh=1&page=3"')
+        self.assertContains(live, 'href="?refresh=1&status=PENDING"')
+        self.assertContains(live, 'href="?refresh=1"')
+        self.assertNotContains(local, 'refresh=1')
+
+
+class QueueCrawlerTests(TestCase):
+    """Test cases for crawling every item of an annotation queue."""
+
+    def make_service(self, total_items=45, page_size=10, failures=None):
+        """Build an AnnotationService whose client serves fake item pages."""
+        import asyncio
+        from unittest.mock import AsyncMock
+        from core.langfuse.exceptions import LangfuseAPIError
+        from core.langfuse.services import AnnotationService
+
+        failures = dict(failures or {})
+        self.in_flight = 0
+        self.max_in_flight = 0
+        total_pages = -(-total_items // page_size)
+
+        async def fake_get(endpoint, params=None):
+            page = params['page']
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep(0.01)
+                if failures.get(page):
+                    failures[page] -= 1
+                    raise LangfuseAPIError('throttled', status_code=429)
+                start = (page - 1) * page_size
+                return {
+                    'data': [{'id': f'item-{i}'} for i in range(start, min(start + page_size, total_items))],
+                    'meta': {'page': page, 'totalItems': total_items, 'totalPages': total_pages},
+                }
+            finally:
+                self.in_flight -= 1
+
+        service = AnnotationService()
+        service.client.get = AsyncMock(side_effect=fake_get)
+        return service
+
+    def collect(self, service, **options):
+        import asyncio
+
+        async def scenario():
+            items = []
+            async for page in service.iter_queue_item_pages('queue-1', page_size=10, **options):
+                items.extend(page)
+            return items
+
+        return asyncio.run(scenario())
+
+    def test_crawler_fetches_every_page(self):
+        """Test that all items are returned exactly once."""
+        totals = []
+        items = self.collect(self.make_service(), concurrency=3, totals=totals)
+
+        self.assertEqual(sorted(item['id'] for item in items), sorted(f'item-{i}' for i in range(45)))
+        # Every page reported its totalItems
+        self.assertEqual(totals, [45] * 5)
+
+    def test_crawler_bounds_concurrency(self):
+        """Test that no more than `concurrency` pages are requested at once."""
+        self.collect(self.make_service(total_items=200), concurrency=3)
+
+        self.assertLessEqual(self.max_in_flight, 3)
+        self.assertGreater(self.max_in_flight, 1)
+
+    def test_crawler_leaves_retries_to_the_client(self):
+        """Test that a page error from the client ends the crawl without crawler-level retries."""
+        from core.langfuse.exceptions import LangfuseAPIError
+
+        service = self.make_service(failures={3: 1})
+        with self.assertRaises(LangfuseAPIError):
+            self.collect(service)
+
+        pages = [call.args[1]['page'] for call in service.client.get.call_args_list]
+        self.assertEqual(pages.count(3), 1)
+
+    def test_sync_iterator_and_command(self):
+        """Test the blocking iterator used by the crawl management command."""
+        import io
+        import json
+        from django.core.management import call_command
+        from core.langfuse.service import langfuse_service
+
+        service = self.make_service(total_items=25)
+        stdout = io.StringIO()
+        with self.settings(LANGFUSE_CRAWL_PAGE_SIZE=10):
+            original = langfuse_service._annotation
+            langfuse_service._annotation = service
+            try:
+                call_command('crawl_annotation_queue', 'queue-1', '--output', '-', stdout=stdout, stderr=io.StringIO())
+            finally:
+                langfuse_service._annotation = original
+
+        lines = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual(len(lines), 25)
+
+
+class AnnotationQueueSyncTests(TestCase):
+    """Test cases for mirroring queues and items into the local database."""
+
+    QUEUE = {
+        'id': 'queue-1',
+        'name': 'Synced Queue',
+        'description': None,
+        'createdAt': '2024-01-01T00:00:00Z',
+        'updatedAt': '2024-01-02T00:00:00Z',
+    }
+
+    def make_item(self, index, status='PENDING', updated_at='2024-01-02T00:00:00Z'):
+        """Build API data for one queue item."""
+        return {
+            'id': f'item-{index}',
+            'queueId': 'queue-1',
+            'objectId': f'session-{index}',
+            'objectType': 'SESSION',
+            'status': status,
+            'createdAt': f'2024-01-01T00:00:{index:02d}Z',
+            'updatedAt': updated_at,
+        }
+
+    def sync(self, items, page_totals=None, **kwargs):
+        """
+        Run an item sync against a mocked Langfuse service.
+
+        page_totals are the totalItems reported by each crawled page and
+        default to one page reporting len(items).
+        """
+        from unittest.mock import patch
+        from annotation_tool.sync import sync_queue_items
+
+        def iter_queue_items(queue_id, totals=None, **options):
+            totals.extend([len(items)] if page_totals is None else page_totals)
+            return iter(items)
+
+        with patch('annotation_tool.sync.langfuse_service.get_annotation_queue', return_value=self.QUEUE), \
+             patch('annotation_tool.sync.langfuse_service.iter_queue_items', side_effect=iter_queue_items):
+            return sync_queue_items('queue-1', **kwargs)
+
+    def test_sync_upserts_only_changed_items(self):
+        """Test that a re-sync writes changed items and deletes removed ones."""
+        from annotation_tool.models import AnnotationQueue, AnnotationQueueItem
+
+        first = self.sync([self.make_item(i) for i in range(3)])
+        self.assertEqual((first.created, first.updated, first.unchanged), (3, 0, 0))
+        self.assertIsNotNone(AnnotationQueue.objects.get(queue_id='queue-1').items_synced_at)
+
+        second = self.sync([
+            self.make_item(0),
+            self.make_item(1, status='COMPLETED', updated_at='2024-01-03T00:00:00Z'),
+        ])
+        self.assertEqual((second.created, second.updated, second.unchanged, second.deleted), (0, 1, 1, 1))
+        self.assertEqual(AnnotationQueueItem.objects.get(item_id='item-1').status, 'COMPLETED')
+        self.assertFalse(AnnotationQueueItem.objects.filter(item_id='item-2').exists())
+
+    def test_sync_keeps_items_when_pages_shift_mid_crawl(self):
+        """Test that items missed because the queue changed during the crawl are not deleted."""
+        from annotation_tool.models import AnnotationQueueItem
+
+        self.sync([self.make_item(i) for i in range(4)])
+
+        # item-1 is removed upstream after page 1 (items 0-1) was read, so
+        # page 2 starts at item-3 and live item-2 is never seen
+        shifted = self.sync([self.make_item(0), self.make_item(1), self.make_item(3)], page_totals=[4, 3])
+        self.assertEqual(shifted.deleted, 0)
+        self.assertTrue(AnnotationQueueItem.objects.filter(item_id='item-2').exists())
+
+        # Pages agree but fewer items were seen than the queue holds
+        short = self.sync([self.make_item(0), self.make_item(3)], page_totals=[3, 3])
+        self.assertEqual(short.deleted, 0)
+
+        # A consistent crawl removes the item that is really gone
+        complete = self.sync([self.make_item(0), self.make_item(2), self.make_item(3)], page_totals=[3, 3])
+        self.assertEqual(complete.deleted, 1)
+        self.assertFalse(AnnotationQueueItem.objects.filter(item_id='item-1').exists())
+
+    def test_sync_queues_marks_missing_queues_inactive(self):
+        """Test that queues no longer returned by Langfuse are deactivated."""
+        from unittest.mock import patch
+        from core.langfuse.models import APIResponse
+        from annotation_tool.models import AnnotationQueue
+        from annotation_tool.sync import sync_queues
+
+        AnnotationQueue.from_api_data(dict(self.QUEUE, id='queue-old')).save()
+        response = APIResponse(data=[self.QUEUE], meta={'page': 1, 'totalPages': 1})
+        with patch('annotation_tool.sync.langfuse_service.get_annotation_queues', return_value=response):
+            sync_queues()
+
+        self.assertTrue(AnnotationQueue.objects.get(queue_id='queue-1').is_active)
+        self.assertFalse(AnnotationQueue.objects.get(queue_id='queue-old').is_active)
+
+    def test_queue_detail_served_from_database(self):
+        """Test that a synced queue is paginated and filtered locally without calling Langfuse."""
+        from asgiref.sync import async_to_sync
+        from unittest.mock import AsyncMock, patch
+
+        self.sync([self.make_item(i, status='COMPLETED' if i % 6 == 0 else 'PENDING') for i in range(30)])
+        superuser = User.objects.create_user(username='admin', password='testpass123', is_superuser=True)
+        superuser.must_change_password = False
+        superuser.save()
+
+        async def fetch():
+            await self.async_client.aforce_login(superuser)
+            return await self.async_client.get(
+                reverse('annotation_tool:queue_detail', kwargs={'queue_id': 'queue-1'}),
+                {'status': 'PENDING', 'page': 2}
+            )
+
+        unexpected = AsyncMock(side_effect=AssertionError('Langfuse should not be called'))
+        with patch('annotation_tool.utils.langfuse_service.aget_annotation_queue', new=unexpected), \
+             patch('annotation_tool.utils.langfuse_service.aget_queue_items', new=unexpected):
+            response = async_to_sync(fetch)()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Synced Queue')
+        self.assertEqual(response.context['total_items'], 25)
+        self.assertEqual(
+            [item.item_id for item in response.context['items']],
+            ['item-5', 'item-4', 'item-3', 'item-2', 'item-1']
+        )
+        counts = {f['value']: f['count'] for f in response.context['status_filters']}
+        self.assertEqual(counts, {'': 30, 'PENDING': 25, 'COMPLETED': 5})
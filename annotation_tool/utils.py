@@ -2,21 +2,23 @@
 Langfuse API integration utilities for annotation tool.
 
 This module provides helper functions to interact with the Langfuse API
-for fetching annotation queues and related data.
+for fetching annotation queues and related data. Each helper has an
+awaitable `a`-prefixed variant for async views and a synchronous wrapper
+for code that doesn't support async.
 """
 
 import logging
 from typing import Dict, Any, Optional
 from core.langfuse.service import langfuse_service
 from core.langfuse.exceptions import LangfuseAPIError
+from core.langfuse.runner import run_sync
 
 logger = logging.getLogger(__name__)
 
 
-def get_annotation_queues(page: int = 1, limit: Optional[int] = None) -> Dict[str, Any]:
+async def aget_annotation_queues(page: int = 1, limit: Optional[int] = None) -> Dict[str, Any]:
     """
-    Synchronous wrapper for fetching annotation queues.
-    Used in Django views that don't support async.
+    Fetch annotation queues from async views.
     
     Args:
         page (int): Page number, starts at 1
@@ -26,7 +28,7 @@ def get_annotation_queues(page: int = 1, limit: Optional[int] = None) -> Dict[st
         Dict[str, Any]: API response or error dict
     """
     try:
-        response = langfuse_service.get_annotation_queues(page, limit)
+        response = await langfuse_service.aget_annotation_queues(page, limit)
         return {
             'data': response.data,
             'meta': response.meta or {'page': page, 'limit': limit or 50, 'totalItems': 0, 'totalPages': 0}
@@ -41,9 +43,24 @@ def get_annotation_queues(page: int = 1, limit: Optional[int] = None) -> Dict[st
         }
 
 
-def get_annotation_queue(queue_id: str) -> Dict[str, Any]:
+def get_annotation_queues(page: int = 1, limit: Optional[int] = None) -> Dict[str, Any]:
     """
-    Synchronous wrapper for fetching a specific annotation queue.
+    Synchronous wrapper for fetching annotation queues.
+    Used in Django views that don't support async.
+    
+    Args:
+        page (int): Page number, starts at 1
+        limit (Optional[int]): Number of items per page
+        
+    Returns:
+        Dict[str, Any]: API response or error dict
+    """
+    return run_sync(aget_annotation_queues(page, limit))
+
+
+async def aget_annotation_queue(queue_id: str) -> Dict[str, Any]:
+    """
+    Fetch a specific annotation queue from async views.
     
     Args:
         queue_id (str): Queue identifier
@@ -52,7 +69,7 @@ def get_annotation_queue(queue_id: str) -> Dict[str, Any]:
         Dict[str, Any]: Queue data or error dict
     """
     try:
-        return langfuse_service.get_annotation_queue(queue_id)
+        return await langfuse_service.aget_annotation_queue(queue_id)
     except LangfuseAPIError as e:
         logger.error(f"Error getting annotation queue {queue_id}: {str(e)}")
         return {
@@ -64,14 +81,27 @@ def get_annotation_queue(queue_id: str) -> Dict[str, Any]:
         }
 
 
-def get_queue_items(
+def get_annotation_queue(queue_id: str) -> Dict[str, Any]:
+    """
+    Synchronous wrapper for fetching a specific annotation queue.
+    
+    Args:
+        queue_id (str): Queue identifier
+        
+    Returns:
+        Dict[str, Any]: Queue data or error dict
+    """
+    return run_sync(aget_annotation_queue(queue_id))
+
+
+async def aget_queue_items(
     queue_id: str, 
     status: Optional[str] = None, 
     page: int = 1, 
     limit: Optional[int] = None
 ) -> Dict[str, Any]:
     """
-    Synchronous wrapper for fetching queue items.
+    Fetch queue items from async views.
     
     Args:
         queue_id (str): Queue identifier
@@ -83,7 +113,7 @@ def get_queue_items(
         Dict[str, Any]: Queue items or error dict
     """
     try:
-        response = langfuse_service.get_queue_items(queue_id, status, page, limit)
+        response = await langfuse_service.aget_queue_items(queue_id, status, page, limit)
         return {
             'data': response.data,
             'meta': response.meta or {'page': page, 'limit': limit or 50, 'totalItems': 0, 'totalPages': 0}
@@ -98,6 +128,27 @@ def get_queue_items(
         }
 
 
+def get_queue_items(
+    queue_id: str, 
+    status: Optional[str] = None, 
+    page: int = 1, 
+    limit: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Synchronous wrapper for fetching queue items.
+    
+    Args:
+        queue_id (str): Queue identifier
+        status (Optional[str]): Status filter
+        page (int): Page number
+        limit (Optional[int]): Items per page
+        
+    Returns:
+        Dict[str, Any]: Queue items or error dict
+    """
+    return run_sync(aget_queue_items(queue_id, status, page, limit))
+
+
 def test_api_connection() -> Dict[str, Any]:
     """
     Test the connection to Langfuse API.
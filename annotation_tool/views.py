@@ -1,8 +1,15 @@
 """
 Views for the annotation tool app.
 Provides data annotation and labeling functionality.
+
+Views that talk to Langfuse are async so a single ASGI worker can serve many
+annotators while their Langfuse calls are in flight. Template rendering and
+CPU-heavy parsing are pushed off the event loop with sync_to_async.
 """
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Count
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.urls import reverse
@@ -12,13 +19,16 @@ from django.views.decorators.csrf import csrf_protect
 from core.permissions import require_tool_permission
 from core.langfuse.service import langfuse_service
 from core.langfuse.exceptions import LangfuseAPIError
-from core.session_parser import get_session_chat_data
-from .utils import get_annotation_queues, get_annotation_queue, get_queue_items
+from core.session_parser import get_chat_window, get_session_chat_data
+from .utils import aget_annotation_queues, aget_annotation_queue, aget_queue_items
 from .models import AnnotationQueue, AnnotationQueueItem
+from .sync import get_synced_queue
 import logging
 
 logger = logging.getLogger(__name__)
 
+QUEUE_ITEM_STATUSES = ('PENDING', 'COMPLETED')
+
 
 @login_required
 @require_tool_permission('annotation')
@@ -33,7 +43,7 @@ def index(request):
 
 @login_required
 @require_tool_permission('annotation')
-def queue_list(request):
+async def queue_list(request):
     """
     Display list of all annotation queues from Langfuse API.
     
@@ -41,7 +51,7 @@ def queue_list(request):
     in a card-based layout for easy navigation.
     """
     # Fetch queues from Langfuse API
-    api_response = get_annotation_queues(page=1, limit=50)
+    api_response = await aget_annotation_queues(page=1, limit=50)
     
     # Handle API errors gracefully
     if api_response.get('error'):
@@ -70,12 +80,12 @@ def queue_list(request):
             'page_info': api_response.get('meta', {})
         }
     
-    return render(request, 'annotation_tool/queue_list.html', context)
+    return await sync_to_async(render)(request, 'annotation_tool/queue_list.html', context)
 
 
 @login_required
 @require_tool_permission('annotation')
-def queue_detail(request, queue_id):
+async def queue_detail(request, queue_id):
     """
     Display detailed view of a specific annotation queue with paginated items.
     
@@ -85,11 +95,30 @@ def queue_detail(request, queue_id):
     This view shows queue information and a paginated table of queue items.
     """
     # Get current page from request, default to 1
-    page_number = request.GET.get('page', 1)
+    try:
+        page_number = int(request.GET.get('page', 1))
+    except (ValueError, TypeError):
+        page_number = 1
     items_per_page = 20  # Fixed at 50 items per page as per MVP requirements
+    status = request.GET.get('status')
+    if status not in QUEUE_ITEM_STATUSES:
+        status = None
+    
+    # Serve from the local tables when the queue has been synced recently
+    if request.GET.get('refresh') != '1':
+        context = await _local_queue_detail_context(queue_id, page_number, items_per_page, status)
+        if context is not None:
+            return await sync_to_async(render)(request, 'annotation_tool/queue_detail.html', context)
     
-    # Fetch queue details from Langfuse API
-    queue_data = get_annotation_queue(queue_id)
+    # Fetch queue details and the requested page of items concurrently
+    queue_data, items_response = await langfuse_service.agather(
+        aget_annotation_queue(queue_id),
+        aget_queue_items(queue_id, status=status, page=page_number, limit=items_per_page),
+    )
+    if isinstance(queue_data, Exception):
+        queue_data = {'error': True, 'message': str(queue_data)}
+    if isinstance(items_response, Exception):
+        items_response = {'error': True, 'message': str(items_response)}
     
     # Handle API errors or missing queue
     if queue_data.get('error'):
@@ -108,14 +137,6 @@ def queue_detail(request, queue_id):
             # Convert API data to model instance
             queue = AnnotationQueue.from_api_data(queue_data)
             
-            # Fetch paginated queue items from API
-            try:
-                page_number = int(page_number)
-            except (ValueError, TypeError):
-                page_number = 1
-            
-            items_response = get_queue_items(queue_id, page=page_number, limit=items_per_page)
-            
             items = []
             page_obj = None
             total_items = 0
@@ -160,7 +181,12 @@ def queue_detail(request, queue_id):
                 'page_obj': page_obj,
                 'total_items': total_items,
                 'items_per_page': items_per_page,
-                'current_page': page_number
+                'current_page': page_number,
+                'status': status,
+                'status_filters': _status_filters(),
+                'synced_at': None,
+                # Keep "Load live" in effect across pagination and filter links
+                'refresh': request.GET.get('refresh') == '1',
             }
             
         except Exception as e:
@@ -175,12 +201,59 @@ def queue_detail(request, queue_id):
                 'total_items': 0
             }
     
-    return render(request, 'annotation_tool/queue_detail.html', context)
+    return await sync_to_async(render)(request, 'annotation_tool/queue_detail.html', context)
+
+
+@sync_to_async
+def _local_queue_detail_context(queue_id, page_number, items_per_page, status):
+    """
+    Build the queue detail context from the synced local tables.
+    
+    Returns None when the queue has not been synced within
+    ANNOTATION_QUEUE_SYNC_MAX_AGE seconds, so the caller falls back to Langfuse.
+    """
+    queue = get_synced_queue(queue_id, getattr(settings, 'ANNOTATION_QUEUE_SYNC_MAX_AGE', 900))
+    if queue is None:
+        return None
+    
+    items = AnnotationQueueItem.objects.filter(queue_id=queue_id)
+    status_counts = dict(
+        items.order_by().values_list('status').annotate(count=Count('id'))
+    )
+    if status:
+        items = items.filter(status=status)
+    page_obj = Paginator(items.order_by('-created_at'), items_per_page).get_page(page_number)
+    
+    return {
+        'tool_name': f'Annotation Tool - {queue.name}',
+        'queue': queue,
+        'queue_id': queue_id,
+        'items': list(page_obj.object_list),
+        'page_obj': page_obj,
+        'total_items': page_obj.paginator.count,
+        'items_per_page': items_per_page,
+        'current_page': page_obj.number,
+        'status': status,
+        'status_filters': _status_filters(status_counts),
+        'synced_at': queue.items_synced_at,
+    }
+
+
+def _status_filters(counts=None):
+    """Status filter options for the queue detail template, with counts when known."""
+    filters = [{'value': '', 'label': 'All', 'count': sum(counts.values()) if counts is not None else None}]
+    for value in QUEUE_ITEM_STATUSES:
+        filters.append({
+            'value': value,
+            'label': value.title(),
+            'count': counts.get(value, 0) if counts is not None else None,
+        })
+    return filters
 
 
 @login_required
 @require_tool_permission('annotation')
-def annotate_object(request, queue_id, object_type, object_id):
+async def annotate_object(request, queue_id, object_type, object_id):
     """
     Display annotation interface for a specific queue item.
     
@@ -191,6 +264,7 @@ def annotate_object(request, queue_id, object_type, object_id):
         
     For SESSION objects, displays the session chat data.
     For TRACE objects, shows placeholder content.
+    Pass ?refresh=1 to bypass the session cache and refetch from Langfuse.
     """
     context = {
         'tool_name': f'Annotate {object_type.title()} - Admin Tools',
@@ -205,21 +279,12 @@ def annotate_object(request, queue_id, object_type, object_id):
     if object_type.lower() == 'session':
         try:
             # Fetch session data using service layer
-            session_data = langfuse_service.get_session(object_id)
-            # Convert to Session object for parser compatibility
-            from core.langfuse.models import Session
-            session = Session(
-                id=session_data['id'],
-                created_at=session_data['createdAt'],
-                updated_at=session_data.get('updatedAt', ''),
-                project_id=session_data['projectId'],
-                public=session_data.get('public', False),
-                bookmarked=session_data.get('bookmarked', False),
-                traces=session_data.get('traces', [])
-            )
+            refresh = request.GET.get('refresh') == '1'
+            session = await langfuse_service.aget_session(object_id, refresh=refresh)
             
             # Parse session data into chat format
-            context['chat_data'] = get_session_chat_data(session)
+            context['chat_data'] = await sync_to_async(get_session_chat_data, thread_sensitive=False)(session)
+            context['chat_window'] = get_chat_window(context['chat_data'])
             
         except LangfuseAPIError as e:
             logger.error(f"Failed to fetch session {object_id}: {str(e)}")
@@ -228,13 +293,13 @@ def annotate_object(request, queue_id, object_type, object_id):
             logger.error(f"Unexpected error fetching session {object_id}: {str(e)}")
             context['error'] = f"Unexpected error: {str(e)}"
     
-    return render(request, 'annotation_tool/annotate_object.html', context)
+    return await sync_to_async(render)(request, 'annotation_tool/annotate_object.html', context)
 
 
 @login_required
 @require_tool_permission('annotation')
 @csrf_protect
-def submit_comment(request):
+async def submit_comment(request):
     if request.method == 'POST':
         trace_id = request.POST.get('trace_id')
         comment_text = request.POST.get('comment_text')
@@ -243,7 +308,7 @@ def submit_comment(request):
             return JsonResponse({'success': False, 'error': 'Missing data'})
             
         try:
-            langfuse_service.create_trace_comment(trace_id, comment_text)
+            await langfuse_service.acreate_trace_comment(trace_id, comment_text)
             return JsonResponse({'success': True})
         except Exception as e:
             logger.error(f"Failed to submit comment: {str(e)}")
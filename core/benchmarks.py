@@ -0,0 +1,164 @@
+"""
+Synthetic Langfuse payloads and timing helpers for performance benchmarks.
+
+Sessions are shaped like the LangGraph sessions the tools render: every
+trace's output carries the whole conversation so far (human and AI messages,
+tool calls and tool results), so payload size grows quadratically with the
+number of turns, just like real sessions.
+"""
+
+import random
+import string
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+
+def _text(rng: random.Random, size: int) -> str:
+    """Return roughly `size` characters of word-like text."""
+    words = []
+    length = 0
+    while length < size:
+        word = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10)))
+        words.append(word)
+        length += len(word) + 1
+    return ' '.join(words)[:size]
+
+
+def build_turn_messages(
+    turn: int,
+    rng: random.Random,
+    tool_calls_per_turn: int = 2,
+    tool_output_bytes: int = 2000,
+) -> List[Dict[str, Any]]:
+    """Build the messages of one conversation turn: human, AI tool calls, tool results, AI answer."""
+    human_id = f"human-{turn}"
+    tool_calls = [
+        {
+            'id': f"toolu_{turn:03d}_{index}",
+            'name': rng.choice(['search_listings', 'get_property', 'lookup_policy']),
+            'args': {'query': _text(rng, 60), 'limit': rng.randint(1, 20), 'filters': {'city': 'Paris'}},
+            'type': 'tool_call',
+        }
+        for index in range(tool_calls_per_turn)
+    ]
+    messages = [
+        {'type': 'human', 'id': human_id, 'content': _text(rng, 200), 'additional_kwargs': {}},
+        {
+            'type': 'ai',
+            'id': f"ai-{turn}-calls",
+            'content': [{'type': 'text', 'text': _text(rng, 150)}],
+            'tool_calls': tool_calls,
+            'response_metadata': {'model': 'model-x', 'usage': {'input_tokens': 1200, 'output_tokens': 80}},
+        },
+    ]
+    for call in tool_calls:
+        messages.append({
+            'type': 'tool',
+            'id': f"tool-{call['id']}",
+            'tool_call_id': call['id'],
+            'name': call['name'],
+            'content': _text(rng, tool_output_bytes),
+        })
+    messages.append({
+        'type': 'ai',
+        'id': f"ai-{turn}-answer",
+        'content': [{'type': 'text', 'text': _text(rng, 600)}],
+        'tool_calls': [],
+        'response_metadata': {'model': 'model-x', 'usage': {'input_tokens': 2400, 'output_tokens': 300}},
+    })
+    return messages
+
+
+def build_session_payload(
+    traces: int = 30,
+    tool_calls_per_turn: int = 2,
+    tool_output_bytes: int = 2000,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Build a /sessions/{id} response with `traces` conversation turns.
+
+    Traces are returned newest first, as Langfuse does not guarantee order.
+    """
+    rng = random.Random(seed)
+    started = datetime(2024, 1, 1, 9, 0, tzinfo=timezone.utc)
+    history: List[Dict[str, Any]] = []
+    trace_list = []
+
+    for turn in range(traces):
+        turn_messages = build_turn_messages(turn, rng, tool_calls_per_turn, tool_output_bytes)
+        history.extend(turn_messages)
+        timestamp = (started + timedelta(minutes=turn)).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+        trace_list.append({
+            'id': f"trace-{turn:04d}",
+            'timestamp': timestamp,
+            'name': 'agent',
+            'input': {'messages': [turn_messages[0]]},
+            'output': {'messages': list(history)},
+            'sessionId': 'session-bench',
+            'userId': 'user-bench',
+            'metadata': {
+                'langgraph_step': turn,
+                'checkpoint': _text(rng, 500),
+                'tags': ['bench'],
+            },
+            'createdAt': timestamp,
+            'updatedAt': timestamp,
+        })
+
+    return {
+        'id': 'session-bench',
+        'createdAt': trace_list[0]['timestamp'],
+        'updatedAt': trace_list[-1]['timestamp'],
+        'projectId': 'project-bench',
+        'environment': 'default',
+        'public': False,
+        'bookmarked': False,
+        'traces': list(reversed(trace_list)),
+    }
+
+
+def build_queue_items_page(items: int = 500, seed: int = 0) -> List[Dict[str, Any]]:
+    """Build the `data` of an /annotation-queues/{id}/items page with `items` items."""
+    rng = random.Random(seed)
+    started = datetime(2024, 1, 1, 9, 0, tzinfo=timezone.utc)
+    page = []
+    for index in range(items):
+        created = started + timedelta(seconds=rng.randint(0, 30 * 24 * 3600))
+        completed = rng.random() < 0.5
+        page.append({
+            'id': f"item-{index:05d}",
+            'queueId': 'queue-bench',
+            'objectId': f"session-{index:05d}",
+            'objectType': 'SESSION',
+            'status': 'COMPLETED' if completed else 'PENDING',
+            'createdAt': created.isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+            'updatedAt': (created + timedelta(hours=1)).isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+            'completedAt': (
+                (created + timedelta(hours=2)).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+                if completed else None
+            ),
+        })
+    return page
+
+
+def best_time(func: Callable[[], Any], repeat: int = 5) -> float:
+    """Return the fastest of `repeat` runs of `func()`, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def peak_memory(func: Callable[[], Any]) -> int:
+    """Return the peak traced allocation in bytes while running `func()`."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
@@ -1,6 +1,11 @@
 from .client import LangfuseClient
 from .config import LangfuseConfig
-from .exceptions import LangfuseAPIError
+from .exceptions import (
+    LangfuseAPIError, LangfuseTimeoutError, LangfuseRateLimitError, LangfuseCircuitOpenError
+)
 from .service import langfuse_service
 
-__all__ = ['LangfuseClient', 'LangfuseConfig', 'LangfuseAPIError', 'langfuse_service']
\ No newline at end of file
+__all__ = [
+    'LangfuseClient', 'LangfuseConfig', 'LangfuseAPIError', 'LangfuseTimeoutError',
+    'LangfuseRateLimitError', 'LangfuseCircuitOpenError', 'langfuse_service',
+]
\ No newline at end of file
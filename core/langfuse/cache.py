@@ -0,0 +1,174 @@
+"""
+Caching primitives for Langfuse payloads.
+
+TTLCache is a small thread-safe LRU with per-entry expiry used for in-process
+caching. PayloadCache layers it with an optional Django cache backend
+(LANGFUSE_CACHE_ALIAS) so cached payloads can be shared across gunicorn workers.
+StaleWhileRevalidateCache serves the last known value immediately and refreshes
+it in the background for data that rarely changes.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from django.core.cache import caches
+from .config import config
+from .exceptions import LangfuseAPIError
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Size-bounded, thread-safe LRU cache whose entries expire after a TTL."""
+
+    def __init__(self, max_entries: int = 128, default_ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live entry and mark it as recently used."""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store an entry, evicting the least recently used ones beyond max_entries."""
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class PayloadCache:
+    """
+    Read-through cache for decoded API payloads.
+
+    Entries live in an in-process TTLCache. When LANGFUSE_CACHE_ALIAS names a
+    Django cache, that shared backend is used instead so every worker sees the
+    same entries and invalidations.
+    """
+
+    def __init__(self, namespace: str, max_entries: int = 128):
+        self.namespace = namespace
+        self.local = TTLCache(max_entries=max_entries)
+
+    @property
+    def shared(self):
+        alias = config.cache_alias
+        return caches[alias] if alias else None
+
+    def _key(self, key: str) -> str:
+        return f"langfuse:{self.namespace}:{key}"
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """Return the cached payload for `key`, or None on a miss."""
+        shared = self.shared
+        if shared is not None:
+            return await shared.aget(self._key(key))
+        return self.local.get(key)
+
+    async def aset(self, key: str, value: Any, ttl: float):
+        """Cache `value` for `ttl` seconds; a non-positive TTL disables caching."""
+        if ttl <= 0:
+            return
+        shared = self.shared
+        if shared is not None:
+            await shared.aset(self._key(key), value, timeout=ttl)
+        else:
+            self.local.set(key, value, ttl)
+
+    async def adelete(self, key: str):
+        """Drop `key` from the cache."""
+        shared = self.shared
+        if shared is not None:
+            await shared.adelete(self._key(key))
+        self.local.delete(key)
+
+
+class StaleWhileRevalidateCache:
+    """
+    In-process cache that prefers answering instantly over answering fresh.
+    
+    - Younger than the soft TTL: served as is.
+    - Between soft and hard TTL: served as is while a background task refetches it.
+    - Older than the hard TTL: refetched before answering, but if Langfuse
+      errors the stale value is served instead (up to the stale-if-error age).
+    
+    Must be used from a long-lived event loop (the background loop), since
+    refreshes run as tasks on the loop that requested them.
+    """
+    
+    def __init__(self, namespace: str, max_entries: int = 256):
+        self.namespace = namespace
+        self.entries = TTLCache(max_entries=max_entries)
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+    
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the value for `key`, calling `fetch()` when it must be (re)loaded."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            fetched_at, value = entry
+            age = time.monotonic() - fetched_at
+            if age < config.queue_cache_hard_ttl:
+                if age >= config.queue_cache_soft_ttl:
+                    self._schedule_refresh(key, fetch)
+                return value
+        
+        try:
+            return await self._load(key, fetch)
+        except LangfuseAPIError as e:
+            if entry is None:
+                raise
+            logger.warning(f"Serving stale {self.namespace} data for {key}: {e}")
+            return entry[1]
+    
+    def invalidate(self, key: Hashable):
+        self.entries.delete(key)
+    
+    async def _load(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        value = await fetch()
+        self.entries.set(key, (time.monotonic(), value), ttl=config.queue_cache_stale_if_error)
+        return value
+    
+    def _schedule_refresh(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]):
+        if key in self._refreshing:
+            return
+        task = asyncio.get_running_loop().create_task(self._refresh(key, fetch))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+    
+    async def _refresh(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]):
+        try:
+            await self._load(key, fetch)
+        except Exception as e:
+            logger.warning(f"Background refresh of {self.namespace} {key} failed: {e}")
@@ -1,7 +1,185 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+import weakref
 import httpx
-from typing import Optional, Dict, Any
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+from .codec import loads
 from .config import config
-from .exceptions import LangfuseAPIError
+from .exceptions import (
+    LangfuseAPIError, LangfuseCircuitOpenError, LangfuseRateLimitError, LangfuseTimeoutError
+)
+from .ratelimit import ENDPOINT_FAMILIES, endpoint_family, rate_limiter
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Transport errors worth another attempt. Anything else (bad URL, protocol
+# misuse) will fail the same way again.
+RETRYABLE_TRANSPORT_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+
+# One pooled httpx client per event loop. httpx connection pools are bound to
+# the loop they were created on, so the pool is keyed by loop and dropped
+# together with it. Sync callers all share the background loop in runner.py,
+# which leaves a single pool per process.
+_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared, keep-alive httpx client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(config.timeout, connect=config.connect_timeout),
+        )
+        _http_clients[loop] = client
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the shared httpx client of the running event loop, if any."""
+    client = _http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+class CircuitBreaker:
+    """
+    Fail fast while an endpoint family of Langfuse is down.
+    
+    - closed: calls go through; LANGFUSE_CIRCUIT_FAILURE_THRESHOLD consecutive
+      failed calls (timeouts, network errors, 5xx) open the circuit.
+    - open: calls raise LangfuseCircuitOpenError immediately for
+      LANGFUSE_CIRCUIT_RESET_TIMEOUT seconds.
+    - half-open: a single probe call is let through; its success closes the
+      circuit, its failure opens it again.
+    
+    State is per process.
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.last_error = None
+        self.last_failure_at = None
+        self._lock = threading.Lock()
+    
+    def before_call(self):
+        """Raise LangfuseCircuitOpenError unless a call may go through now."""
+        if not config.circuit_enabled:
+            return
+        with self._lock:
+            if self.state == self.OPEN:
+                remaining = self.opened_at + config.circuit_reset_timeout - time.monotonic()
+                if remaining > 0:
+                    raise LangfuseCircuitOpenError(
+                        f"Langfuse {self.name} circuit is open after {self.failures} failures, "
+                        f"retrying in {remaining:.0f}s (last error: {self.last_error})"
+                    )
+                self.state = self.HALF_OPEN
+                self.probing = False
+            if self.state == self.HALF_OPEN:
+                if self.probing:
+                    raise LangfuseCircuitOpenError(
+                        f"Langfuse {self.name} circuit is half-open and already probing"
+                    )
+                self.probing = True
+    
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Langfuse {self.name} circuit closed")
+            self.state = self.CLOSED
+            self.failures = 0
+            self.probing = False
+    
+    def record_failure(self, error: Exception):
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error)
+            self.last_failure_at = time.time()
+            self.probing = False
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.failures >= config.circuit_failure_threshold
+            ):
+                logger.error(f"Langfuse {self.name} circuit opened after {self.failures} failures: {error}")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+    
+    def release(self):
+        """End a call that neither proved nor disproved Langfuse health."""
+        with self._lock:
+            self.probing = False
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Current state for status reporting."""
+        with self._lock:
+            retry_in = None
+            if self.state == self.OPEN:
+                retry_in = max(0.0, self.opened_at + config.circuit_reset_timeout - time.monotonic())
+            return {
+                'state': self.state,
+                'failures': self.failures,
+                'retry_in': retry_in,
+                'last_error': self.last_error,
+                'last_failure_at': self.last_failure_at,
+            }
+
+
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(family: str) -> CircuitBreaker:
+    """Return the process-wide circuit breaker of an endpoint family."""
+    with _circuit_breakers_lock:
+        breaker = _circuit_breakers.get(family)
+        if breaker is None:
+            breaker = _circuit_breakers[family] = CircuitBreaker(family)
+        return breaker
+
+
+def circuit_breaker_status() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of every endpoint family's circuit breaker."""
+    families = dict.fromkeys([family for _, family in ENDPOINT_FAMILIES] + ['default'])
+    return {family: get_circuit_breaker(family).snapshot() for family in families}
+
+
+# Shared by every LangfuseClient so identical GETs coalesce across services
+_get_flights = SingleFlight('get')
+
+
+def is_outage(error: LangfuseAPIError) -> bool:
+    """
+    Whether an error means Langfuse is failing, as opposed to rejecting the request.
+    
+    Only timeouts, network failures (RETRYABLE_TRANSPORT_ERRORS) and 5xx
+    count. Other request errors, such as an invalid LANGFUSE_HOST, are
+    configuration problems and must fail loudly rather than trip the breaker.
+    """
+    if isinstance(error, (LangfuseCircuitOpenError, LangfuseRateLimitError)):
+        return False
+    if isinstance(error, LangfuseTimeoutError):
+        return True
+    return error.is_transport or (error.status_code is not None and error.status_code >= 500)
 
 
 class LangfuseClient:
@@ -9,31 +187,130 @@ class LangfuseClient:
         self.base_url = config.base_url
         self.auth_header = config.auth_header
     
-    async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/api/public{endpoint}",
-                headers={"Authorization": self.auth_header},
-                params=params or {}
-            )
-            return self._handle_response(response)
-    
-    async def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/api/public{endpoint}",
-                headers={
-                    "Authorization": self.auth_header,
-                    "Content-Type": "application/json"
-                },
-                json=data or {}
-            )
-            return self._handle_response(response)
+    async def get(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        decoder: Optional[Callable[[bytes], Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        GET from the public API.
+        
+        Concurrent identical GETs share one upstream request, so the
+        returned payload may be shared with other callers and must not be
+        mutated. `decoder` replaces JSON decoding of a successful response
+        body and runs in a worker thread.
+        """
+        params = params or {}
+        key = (self.base_url, endpoint, tuple(sorted(params.items())), getattr(decoder, '__qualname__', None))
+        return await _get_flights.do(
+            key, lambda: self._request("GET", endpoint, params=params, idempotent=True, decoder=decoder)
+        )
+    
+    async def post(
+        self,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        idempotent: bool = False
+    ) -> Dict[str, Any]:
+        """
+        POST to the public API.
+        
+        Only retried when the caller marks it idempotent, i.e. the payload
+        carries a key (such as a score id) that makes a replay an upsert.
+        """
+        return await self._request("POST", endpoint, json=data or {}, idempotent=idempotent)
+    
+    async def _request(self, method: str, endpoint: str, idempotent: bool, **kwargs) -> Any:
+        """Send a request through the endpoint family's circuit breaker."""
+        breaker = get_circuit_breaker(endpoint_family(endpoint))
+        breaker.before_call()
+        try:
+            result = await self._send(method, endpoint, idempotent, **kwargs)
+        except LangfuseAPIError as e:
+            if is_outage(e):
+                breaker.record_failure(e)
+            elif isinstance(e, LangfuseRateLimitError):
+                breaker.release()
+            else:
+                breaker.record_success()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        breaker.record_success()
+        return result
+    
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        idempotent: bool,
+        decoder: Optional[Callable[[bytes], Any]] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Send a request, retrying transient failures of idempotent calls.
+        
+        Throttling and 5xx responses (LANGFUSE_RETRY_STATUSES) and network
+        errors are retried up to LANGFUSE_RETRY_MAX_ATTEMPTS times with full
+        jitter exponential backoff, or after the server's Retry-After delay.
+        The whole call, including waits, is bounded by LANGFUSE_RETRY_DEADLINE.
+        Every attempt first takes a slot from the endpoint's rate limiter.
+        """
+        url = f"{self.base_url}/api/public{endpoint}"
+        headers = {"Authorization": self.auth_header}
+        if method != "GET":
+            headers["Content-Type"] = "application/json"
+        
+        max_attempts = config.retry_max_attempts if idempotent else 1
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + config.retry_deadline
+        attempt = 0
+        try:
+            async with asyncio.timeout_at(deadline):
+                while True:
+                    attempt += 1
+                    await rate_limiter.acquire(endpoint)
+                    try:
+                        response = await get_http_client().request(method, url, headers=headers, **kwargs)
+                    except RETRYABLE_TRANSPORT_ERRORS as e:
+                        error = e
+                        retry_after = None
+                    except httpx.HTTPError as e:
+                        raise LangfuseAPIError(f"API request failed: {e}") from e
+                    else:
+                        if response.status_code not in config.retry_statuses:
+                            if decoder is not None and response.status_code < 400:
+                                # Custom decoders handle large payloads; keep them off the loop
+                                return await asyncio.to_thread(decoder, response.content)
+                            return self._handle_response(response)
+                        error = response
+                        retry_after = _retry_after(response)
+                    
+                    delay = retry_after if retry_after is not None else _backoff(attempt)
+                    if attempt >= max_attempts or loop.time() + delay >= deadline:
+                        break
+                    logger.warning(
+                        f"Langfuse {method} {endpoint} failed ({_describe(error)}), "
+                        f"retrying in {delay:.2f}s (attempt {attempt}/{max_attempts})"
+                    )
+                    await asyncio.sleep(delay)
+        except TimeoutError as e:
+            raise LangfuseTimeoutError(
+                f"API request timed out after {config.retry_deadline}s: {method} {endpoint}"
+            ) from e
+        
+        if isinstance(error, httpx.Response):
+            return self._handle_response(error)
+        if isinstance(error, httpx.TimeoutException):
+            raise LangfuseTimeoutError(f"API request timed out: {error}") from error
+        raise LangfuseAPIError(f"API request failed: {error}", is_transport=True) from error
     
     def _handle_response(self, response: httpx.Response) -> Dict[str, Any]:
         if response.status_code >= 400:
             try:
-                error_data = response.json()
+                error_data = loads(response.content)
             except:
                 error_data = None
             raise LangfuseAPIError(
@@ -41,4 +318,33 @@ class LangfuseClient:
                 status_code=response.status_code,
                 response_data=error_data
             )
-        return response.json()
\ No newline at end of file
+        return loads(response.content)
+
+
+def _backoff(attempt: int) -> float:
+    """Full jitter: a random delay up to the capped exponential backoff."""
+    return random.uniform(0, min(config.retry_backoff_max, config.retry_backoff_base * 2 ** (attempt - 1)))
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _describe(error) -> str:
+    if isinstance(error, httpx.Response):
+        return f"status {error.status_code}"
+    return type(error).__name__
@@ -0,0 +1,75 @@
+"""
+JSON decoding of Langfuse responses.
+
+Large session payloads spend most of their CPU time in JSON decoding, so the
+decoder is pluggable. LANGFUSE_JSON_BACKEND selects it: "auto" (the default)
+picks the fastest installed of orjson, msgspec and the stdlib json module;
+naming a backend that is not installed falls back to "auto".
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict, Tuple, Union
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+# Preference order for "auto"
+BACKEND_ORDER = ('orjson', 'msgspec', 'json')
+
+
+def _orjson_loads():
+    import orjson
+    return orjson.loads
+
+
+def _msgspec_loads():
+    import msgspec
+    return msgspec.json.Decoder().decode
+
+
+def _json_loads():
+    return json.loads
+
+
+_LOADERS: Dict[str, Callable[[], Callable[[Union[bytes, str]], Any]]] = {
+    'orjson': _orjson_loads,
+    'msgspec': _msgspec_loads,
+    'json': _json_loads,
+}
+
+
+def available_backends() -> Dict[str, Callable[[Union[bytes, str]], Any]]:
+    """Return the `loads` function of every installed backend, in preference order."""
+    backends = {}
+    for name in BACKEND_ORDER:
+        try:
+            backends[name] = _LOADERS[name]()
+        except ImportError:
+            continue
+    return backends
+
+
+_selected: Dict[str, Tuple[str, Callable]] = {}
+
+
+def get_backend() -> Tuple[str, Callable[[Union[bytes, str]], Any]]:
+    """Return (name, loads) of the configured backend."""
+    requested = config.json_backend
+    backend = _selected.get(requested)
+    if backend is None:
+        installed = available_backends()
+        if requested in installed:
+            backend = (requested, installed[requested])
+        else:
+            if requested != 'auto':
+                logger.warning(f"JSON backend {requested!r} is not installed, choosing automatically")
+            name = next(iter(installed))
+            backend = (name, installed[name])
+        _selected[requested] = backend
+    return backend
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode a JSON document with the configured backend."""
+    return get_backend()[1](data)
@@ -21,6 +21,170 @@ class LangfuseConfig:
         auth_bytes = auth_string.encode('ascii')
         auth_b64 = base64.b64encode(auth_bytes).decode('ascii')
         return f"Basic {auth_b64}"
+    
+    # HTTP connection pool
+    @property
+    def max_connections(self):
+        return getattr(settings, 'LANGFUSE_HTTP_MAX_CONNECTIONS', 20)
+    
+    @property
+    def max_keepalive_connections(self):
+        return getattr(settings, 'LANGFUSE_HTTP_MAX_KEEPALIVE_CONNECTIONS', 10)
+    
+    @property
+    def keepalive_expiry(self):
+        return getattr(settings, 'LANGFUSE_HTTP_KEEPALIVE_EXPIRY', 30.0)
+    
+    @property
+    def timeout(self):
+        return getattr(settings, 'LANGFUSE_HTTP_TIMEOUT', 10.0)
+    
+    @property
+    def connect_timeout(self):
+        return getattr(settings, 'LANGFUSE_HTTP_CONNECT_TIMEOUT', 5.0)
+    
+    @property
+    def sync_timeout(self):
+        return getattr(settings, 'LANGFUSE_SYNC_TIMEOUT', 30.0)
+    
+    @property
+    def json_backend(self):
+        return getattr(settings, 'LANGFUSE_JSON_BACKEND', 'auto')
+    
+    # Retries
+    @property
+    def retry_max_attempts(self):
+        return getattr(settings, 'LANGFUSE_RETRY_MAX_ATTEMPTS', 4)
+    
+    @property
+    def retry_backoff_base(self):
+        return getattr(settings, 'LANGFUSE_RETRY_BACKOFF_BASE', 0.5)
+    
+    @property
+    def retry_backoff_max(self):
+        return getattr(settings, 'LANGFUSE_RETRY_BACKOFF_MAX', 8.0)
+    
+    @property
+    def retry_deadline(self):
+        return getattr(settings, 'LANGFUSE_RETRY_DEADLINE', 20.0)
+    
+    @property
+    def retry_statuses(self):
+        return getattr(settings, 'LANGFUSE_RETRY_STATUSES', (429, 500, 502, 503, 504))
+    
+    # Request coalescing
+    @property
+    def single_flight_enabled(self):
+        return getattr(settings, 'LANGFUSE_SINGLE_FLIGHT_ENABLED', True)
+    
+    @property
+    def single_flight_cache_alias(self):
+        return getattr(settings, 'LANGFUSE_SINGLE_FLIGHT_CACHE_ALIAS', None)
+    
+    @property
+    def single_flight_lock_timeout(self):
+        return getattr(settings, 'LANGFUSE_SINGLE_FLIGHT_LOCK_TIMEOUT', 10.0)
+    
+    @property
+    def single_flight_result_ttl(self):
+        return getattr(settings, 'LANGFUSE_SINGLE_FLIGHT_RESULT_TTL', 2.0)
+    
+    # Circuit breaker
+    @property
+    def circuit_enabled(self):
+        return getattr(settings, 'LANGFUSE_CIRCUIT_ENABLED', True)
+    
+    @property
+    def circuit_failure_threshold(self):
+        return getattr(settings, 'LANGFUSE_CIRCUIT_FAILURE_THRESHOLD', 5)
+    
+    @property
+    def circuit_reset_timeout(self):
+        return getattr(settings, 'LANGFUSE_CIRCUIT_RESET_TIMEOUT', 30.0)
+    
+    # Rate limiting
+    @property
+    def rate_limit_enabled(self):
+        return getattr(settings, 'LANGFUSE_RATE_LIMIT_ENABLED', True)
+    
+    @property
+    def rate_limits(self):
+        return getattr(settings, 'LANGFUSE_RATE_LIMITS', {})
+    
+    @property
+    def rate_limit_max_wait(self):
+        return getattr(settings, 'LANGFUSE_RATE_LIMIT_MAX_WAIT', 5.0)
+    
+    @property
+    def rate_limit_cache_alias(self):
+        return getattr(settings, 'LANGFUSE_RATE_LIMIT_CACHE_ALIAS', None)
+    
+    # Caching
+    @property
+    def cache_alias(self):
+        return getattr(settings, 'LANGFUSE_CACHE_ALIAS', None)
+    
+    @property
+    def session_cache_ttl(self):
+        return getattr(settings, 'LANGFUSE_SESSION_CACHE_TTL', 300.0)
+    
+    @property
+    def session_cache_active_ttl(self):
+        return getattr(settings, 'LANGFUSE_SESSION_CACHE_ACTIVE_TTL', 15.0)
+    
+    @property
+    def session_active_window(self):
+        return getattr(settings, 'LANGFUSE_SESSION_ACTIVE_WINDOW', 900.0)
+    
+    @property
+    def session_cache_stale_if_error(self):
+        return getattr(settings, 'LANGFUSE_SESSION_CACHE_STALE_IF_ERROR', 3600.0)
+    
+    @property
+    def session_projection(self):
+        return getattr(settings, 'LANGFUSE_SESSION_PROJECTION', True)
+    
+    @property
+    def session_streaming(self):
+        return getattr(settings, 'LANGFUSE_SESSION_STREAMING', False)
+    
+    @property
+    def session_cache_max_entries(self):
+        return getattr(settings, 'LANGFUSE_SESSION_CACHE_MAX_ENTRIES', 64)
+    
+    @property
+    def queue_cache_soft_ttl(self):
+        return getattr(settings, 'LANGFUSE_QUEUE_CACHE_SOFT_TTL', 30.0)
+    
+    @property
+    def queue_cache_hard_ttl(self):
+        return getattr(settings, 'LANGFUSE_QUEUE_CACHE_HARD_TTL', 600.0)
+    
+    @property
+    def queue_cache_stale_if_error(self):
+        return getattr(settings, 'LANGFUSE_QUEUE_CACHE_STALE_IF_ERROR', 86400.0)
+    
+    # Queue crawling
+    @property
+    def crawl_page_size(self):
+        return getattr(settings, 'LANGFUSE_CRAWL_PAGE_SIZE', 100)
+    
+    @property
+    def crawl_concurrency(self):
+        return getattr(settings, 'LANGFUSE_CRAWL_CONCURRENCY', 8)
+    
+    # Score configs
+    @property
+    def preload_score_configs(self):
+        return getattr(settings, 'LANGFUSE_PRELOAD_SCORE_CONFIGS', True)
+    
+    @property
+    def score_config_refresh_interval(self):
+        return getattr(settings, 'LANGFUSE_SCORE_CONFIG_REFRESH_INTERVAL', 300.0)
+    
+    @property
+    def score_config_max_age(self):
+        return getattr(settings, 'LANGFUSE_SCORE_CONFIG_MAX_AGE', 3600.0)
 
 
 config = LangfuseConfig()
\ No newline at end of file
@@ -1,5 +1,20 @@
 class LangfuseAPIError(Exception):
-    def __init__(self, message, status_code=None, response_data=None):
+    def __init__(self, message, status_code=None, response_data=None, is_transport=False):
         super().__init__(message)
         self.status_code = status_code
-        self.response_data = response_data
\ No newline at end of file
+        self.response_data = response_data
+        # Set when Langfuse could not be reached (network or protocol
+        # failure) rather than answering with an error
+        self.is_transport = is_transport
+
+
+class LangfuseTimeoutError(LangfuseAPIError):
+    """Raised when a Langfuse call does not finish within its deadline."""
+
+
+class LangfuseRateLimitError(LangfuseAPIError):
+    """Raised when the client-side rate limiter has no slot within its maximum wait."""
+
+
+class LangfuseCircuitOpenError(LangfuseAPIError):
+    """Raised without calling Langfuse while the endpoint's circuit breaker is open."""
@@ -1,4 +1,4 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from dataclasses import dataclass
 
 
@@ -23,20 +23,40 @@ class QueueItem:
     updated_at: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Trace:
-    """Data class representing a Langfuse trace."""
+    """
+    Data class representing a Langfuse trace.
+    
+    Immutable and slotted: decoded sessions are cached and shared between
+    requests, and large sessions hold many traces.
+    """
     id: str
     timestamp: str
-    name: Optional[str]
-    input: Optional[Dict[str, Any]]
-    output: Optional[Dict[str, Any]]
-    session_id: Optional[str]
-    user_id: Optional[str]
-    metadata: Optional[Dict[str, Any]]
+    name: Optional[str] = None
+    input: Optional[Dict[str, Any]] = None
+    output: Optional[Dict[str, Any]] = None
+    session_id: Optional[str] = None
+    user_id: Optional[str] = None
+    updated_at: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None  # Not decoded by from_api
+    
+    @classmethod
+    def from_api(cls, api_data: Dict[str, Any]) -> 'Trace':
+        """Build a trace from API data, skipping fields that are never rendered (metadata)."""
+        return cls(
+            id=api_data.get('id'),
+            timestamp=api_data.get('timestamp'),
+            name=api_data.get('name'),
+            input=api_data.get('input'),
+            output=api_data.get('output'),
+            session_id=api_data.get('sessionId'),
+            user_id=api_data.get('userId'),
+            updated_at=api_data.get('updatedAt'),
+        )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Session:
     id: str
     created_at: str
@@ -44,7 +64,22 @@ class Session:
     project_id: str
     public: bool
     bookmarked: bool
-    traces: List[Dict[str, Any]]  # Raw trace data from API
+    traces: Tuple[Trace, ...]
+    environment: Optional[str] = None
+    
+    @classmethod
+    def from_api(cls, api_data: Dict[str, Any]) -> 'Session':
+        """Build a session and its traces from a /sessions/{id} response."""
+        return cls(
+            id=api_data['id'],
+            created_at=api_data['createdAt'],
+            updated_at=api_data.get('updatedAt', ''),
+            project_id=api_data['projectId'],
+            public=api_data.get('public', False),
+            bookmarked=api_data.get('bookmarked', False),
+            traces=tuple(Trace.from_api(trace) for trace in api_data.get('traces', [])),
+            environment=api_data.get('environment'),
+        )
 
 
 @dataclass
@@ -58,6 +93,20 @@ class ScoreConfig:
     categories: Optional[List[Dict[str, Any]]] = None
     min_value: Optional[float] = None
     max_value: Optional[float] = None
+    
+    @classmethod
+    def from_api_data(cls, api_data: Dict[str, Any]) -> 'ScoreConfig':
+        return cls(
+            id=api_data['id'],
+            name=api_data['name'],
+            description=api_data.get('description'),
+            data_type=api_data.get('dataType'),
+            is_archived=api_data.get('isArchived', False),
+            project_id=api_data.get('projectId'),
+            categories=api_data.get('categories'),
+            min_value=api_data.get('minValue'),
+            max_value=api_data.get('maxValue'),
+        )
 
 
 @dataclass
@@ -0,0 +1,121 @@
+"""
+Decode /sessions/{id} responses keeping only what the chat views render.
+
+Every trace of a LangGraph session carries the whole conversation so far in
+its output messages, while the parser only uses the trace's first input
+message and the output messages from that human message on. Projection keeps
+exactly those (plus the trace fields Trace.from_api reads) and drops the rest
+while decoding.
+
+By default the payload is decoded in full with the configured JSON backend
+(orjson when installed) and then projected, which is the fastest path.
+stream_session parses the payload incrementally with ijson instead, one trace
+at a time, so the full decoded payload never exists in memory. It is several
+times slower and only worth it when memory matters more than CPU; it is
+opt-in via LANGFUSE_SESSION_STREAMING.
+"""
+
+from typing import Any, Dict, List, Optional
+from .codec import loads
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - depends on the environment
+    ijson = None
+
+SESSION_FIELDS = frozenset({'id', 'createdAt', 'updatedAt', 'projectId', 'public', 'bookmarked', 'environment'})
+TRACE_FIELDS = frozenset({'id', 'timestamp', 'name', 'input', 'output', 'sessionId', 'userId', 'updatedAt'})
+
+_SCALAR_EVENTS = frozenset({'string', 'number', 'boolean', 'null'})
+_TRACE_PREFIX = 'traces.item'
+_TRACE_FIELD_PREFIX = 'traces.item.'
+
+
+def project_messages(trace: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Trim a trace's messages to what the chat parser reads.
+
+    Input keeps its first message; output keeps the messages from the human
+    message matching that input onwards (none if it is missing).
+    """
+    input_data = trace.get('input')
+    output_data = trace.get('output')
+    if not isinstance(input_data, dict) or not input_data.get('messages'):
+        return trace
+
+    first = input_data['messages'][0]
+    trace['input'] = {'messages': [first]}
+
+    if isinstance(output_data, dict) and isinstance(output_data.get('messages'), list):
+        messages = output_data['messages']
+        target_id = first.get('id') if isinstance(first, dict) else None
+        start = next(
+            (i for i, msg in enumerate(messages)
+             if isinstance(msg, dict) and msg.get('type') == 'human' and msg.get('id') == target_id),
+            None,
+        )
+        trace['output'] = {'messages': messages[start:] if start is not None else []}
+    return trace
+
+
+def project_trace(trace: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the rendered fields of a decoded trace and trim its messages."""
+    return project_messages({key: value for key, value in trace.items() if key in TRACE_FIELDS})
+
+
+def project_session(session: Dict[str, Any]) -> Dict[str, Any]:
+    """Project an already decoded session payload."""
+    projected = {key: value for key, value in session.items() if key in SESSION_FIELDS}
+    projected['traces'] = [project_trace(trace) for trace in session.get('traces', [])]
+    return projected
+
+
+def decode_session(content: bytes) -> Dict[str, Any]:
+    """Decode a /sessions/{id} response body in full, then project it."""
+    return project_session(loads(content))
+
+
+def stream_session(content: bytes) -> Dict[str, Any]:
+    """
+    Decode and project a /sessions/{id} response body incrementally with
+    ijson, falling back to decode_session when ijson is not installed.
+    """
+    if ijson is None:
+        return decode_session(content)
+    return _stream_session(content)
+
+
+def _stream_session(content: bytes) -> Dict[str, Any]:
+    session: Dict[str, Any] = {}
+    traces: List[Dict[str, Any]] = []
+    builder: Optional[Any] = None
+    skipping: Optional[str] = None
+
+    for prefix, event, value in ijson.parse(content, use_float=True):
+        if builder is None:
+            if prefix == _TRACE_PREFIX and event == 'start_map':
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            elif prefix in SESSION_FIELDS and event in _SCALAR_EVENTS:
+                session[prefix] = value
+            continue
+
+        if prefix == _TRACE_PREFIX:
+            if event == 'end_map':
+                builder.event(event, value)
+                traces.append(project_messages(builder.value))
+                builder = None
+                skipping = None
+                continue
+            if event == 'map_key':
+                # Drop unrendered fields (metadata, observations, ...) with
+                # everything nested under them
+                skipping = None if value in TRACE_FIELDS else f"{_TRACE_FIELD_PREFIX}{value}"
+                if skipping:
+                    continue
+        elif skipping and (prefix == skipping or prefix.startswith(skipping + '.')):
+            continue
+        builder.event(event, value)
+
+    session['traces'] = traces
+    return session
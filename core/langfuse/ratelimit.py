@@ -0,0 +1,179 @@
+"""
+Client-side rate limiting for Langfuse API calls.
+
+Each endpoint family (annotation queues, sessions, scores, traces) has its
+own token bucket, configured in LANGFUSE_RATE_LIMITS as (requests per
+second, burst). A request that finds its bucket empty waits for a token, up
+to LANGFUSE_RATE_LIMIT_MAX_WAIT seconds, before LangfuseRateLimitError is
+raised.
+
+Buckets live in-process by default. Setting LANGFUSE_RATE_LIMIT_CACHE_ALIAS
+to a Django cache shared by every worker makes the limits global. The bucket
+is then approximated by fixed windows of `burst` requests per `burst / rate`
+seconds, counted with cache increments. Only backends whose increments are
+atomic (Redis, Memcached) can be used: the database and file-based caches
+increment with a separate read and write, so concurrent workers would lose
+counts, and ImproperlyConfigured is raised for them.
+"""
+
+import asyncio
+import math
+import random
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from .config import config
+from .exceptions import LangfuseRateLimitError
+
+# Endpoint prefix -> family, checked in order
+ENDPOINT_FAMILIES = (
+    ('/annotation-queues', 'annotation_queues'),
+    ('/sessions', 'sessions'),
+    ('/score-configs', 'scores'),
+    ('/scores', 'scores'),
+    ('/comments', 'scores'),
+    ('/traces', 'traces'),
+)
+
+
+def endpoint_family(endpoint: str) -> str:
+    """Return the rate limit family of an API endpoint path."""
+    for prefix, family in ENDPOINT_FAMILIES:
+        if endpoint.startswith(prefix):
+            return family
+    return 'default'
+
+
+# Cache backends whose incr() is a single atomic operation. LocMemCache is
+# atomic too, though only shared between the threads of one process.
+ATOMIC_INCR_BACKENDS = (
+    'django.core.cache.backends.redis.RedisCache',
+    'django.core.cache.backends.memcached.PyMemcacheCache',
+    'django.core.cache.backends.memcached.PyLibMCCache',
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+
+class TokenBucket:
+    """In-process token bucket refilled continuously at `rate` tokens per second."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """
+        Take a token, possibly one that has not been refilled yet.
+
+        Returns:
+            Optional[float]: Seconds to wait before the token is usable, or
+            None (and nothing taken) if that would exceed `max_wait`
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait = max(0.0, (1 - self.tokens) / self.rate)
+            if wait > max_wait:
+                return None
+            self.tokens -= 1
+            return wait
+
+    async def acquire(self, max_wait: float) -> bool:
+        """Wait for a token; returns False if none is available within `max_wait`."""
+        wait = self.reserve(max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+
+class SharedWindowBucket:
+    """Fixed-window approximation of a token bucket kept in a shared Django cache."""
+
+    def __init__(self, cache_alias: str, family: str, rate: float, capacity: int):
+        backend_class = type(caches[cache_alias])
+        backend = f"{backend_class.__module__}.{backend_class.__qualname__}"
+        if backend not in ATOMIC_INCR_BACKENDS:
+            raise ImproperlyConfigured(
+                f"LANGFUSE_RATE_LIMIT_CACHE_ALIAS '{cache_alias}' uses {backend}, whose increments "
+                f"are not atomic; use a Redis or Memcached cache"
+            )
+        self.cache_alias = cache_alias
+        self.key = f"langfuse:ratelimit:{family}"
+        self.capacity = capacity
+        self.window = capacity / rate
+
+    async def acquire(self, max_wait: float) -> bool:
+        """Wait for a slot in the current or a later window, up to `max_wait` seconds."""
+        cache = caches[self.cache_alias]
+        deadline = time.time() + max_wait
+        while True:
+            now = time.time()
+            index = int(now // self.window)
+            key = f"{self.key}:{index}"
+            await cache.aadd(key, 0, timeout=math.ceil(self.window) + 1)
+            try:
+                count = await cache.aincr(key)
+            except ValueError:
+                # Window key expired between add and incr; start over
+                continue
+            if count <= self.capacity:
+                return True
+
+            # Spread waiters over the start of the next window
+            retry_at = (index + 1) * self.window + random.uniform(0, self.window / 10)
+            if retry_at > deadline:
+                return False
+            await asyncio.sleep(retry_at - now)
+
+
+class RateLimiter:
+    """Per-family request limiter used by LangfuseClient before every request."""
+
+    def __init__(self):
+        self._buckets: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+
+    async def acquire(self, endpoint: str):
+        """
+        Wait until a request to `endpoint` may be sent.
+
+        Raises:
+            LangfuseRateLimitError: If no slot frees up within LANGFUSE_RATE_LIMIT_MAX_WAIT
+        """
+        if not config.rate_limit_enabled:
+            return
+        family = endpoint_family(endpoint)
+        limit = config.rate_limits.get(family)
+        if not limit:
+            return
+
+        max_wait = config.rate_limit_max_wait
+        if not await self._bucket(family, *limit).acquire(max_wait):
+            raise LangfuseRateLimitError(
+                f"Rate limit for {family} requests exceeded (waited up to {max_wait}s)"
+            )
+
+    def _bucket(self, family: str, rate: float, capacity: int):
+        # Keyed on the configuration too, so changed settings get a fresh bucket
+        alias = config.rate_limit_cache_alias
+        key = (family, rate, capacity, alias)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if alias:
+                    bucket = SharedWindowBucket(alias, family, rate, capacity)
+                else:
+                    bucket = TokenBucket(rate, capacity)
+                self._buckets[key] = bucket
+            return bucket
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,174 @@
+"""
+Persistent background event loop for running Langfuse coroutines from sync code.
+
+Django views run on WSGI worker threads that have no event loop of their own.
+Rather than creating (or reusing) a loop per request thread, every coroutine is
+submitted to a single loop per process that runs forever in a daemon thread.
+Pooled connections, in-flight state and concurrent fan-out therefore all live
+on one loop regardless of which thread issued the call.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import os
+import threading
+from typing import Any, AsyncIterator, Coroutine, Iterator, Optional
+from .config import config
+from .exceptions import LangfuseTimeoutError
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundLoop:
+    """An asyncio event loop running forever in a daemon thread."""
+
+    def __init__(self, name: str = 'langfuse-loop'):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _is_running(self) -> bool:
+        # A forked worker inherits the loop object but not the thread running it
+        return (
+            self._loop is not None
+            and self._pid == os.getpid()
+            and self._thread is not None
+            and self._thread.is_alive()
+        )
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Return the background loop, starting its thread on first use."""
+        if not self._is_running():
+            with self._lock:
+                if not self._is_running():
+                    self._start()
+        return self._loop
+
+    def _start(self):
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        thread = threading.Thread(target=run, name=self.name, daemon=True)
+        thread.start()
+        ready.wait()
+        self._loop, self._thread, self._pid = loop, thread, os.getpid()
+        logger.debug("Started Langfuse background loop in thread %s", thread.name)
+
+    def in_loop_thread(self) -> bool:
+        """Return True when called from the background loop's own thread."""
+        return self._is_running() and threading.get_ident() == self._thread.ident
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Schedule a coroutine on the background loop and return its future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the background loop and block until it finishes.
+
+        Args:
+            coro: Coroutine to execute
+            timeout: Seconds to wait before cancelling; defaults to LANGFUSE_SYNC_TIMEOUT
+
+        Raises:
+            LangfuseTimeoutError: If the coroutine does not finish in time
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("Cannot block on the Langfuse background loop from inside it")
+
+        timeout = config.sync_timeout if timeout is None else timeout
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            if not future.done():
+                future.cancel()
+                raise LangfuseTimeoutError(f"Langfuse call timed out after {timeout}s")
+            raise
+
+    def stop(self, timeout: float = 5.0):
+        """Close the pooled HTTP client and stop the loop thread."""
+        if not self._is_running():
+            return
+        from .client import close_http_client
+        try:
+            self.submit(close_http_client()).result(timeout)
+        except Exception as e:
+            logger.warning(f"Failed to close Langfuse HTTP client: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._loop = self._thread = self._pid = None
+
+
+# Process-wide background loop
+background_loop = BackgroundLoop()
+
+
+def run_sync(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on the shared background loop from synchronous code."""
+    return background_loop.run(coro, timeout=timeout)
+
+
+async def run_async(coro: Coroutine) -> Any:
+    """
+    Await a coroutine on the shared background loop from any event loop.
+
+    Async views running on the ASGI server loop (or on a throwaway loop under
+    WSGI) hand their Langfuse work to the background loop, so pooled
+    connections and loop-bound state are never split across loops. The caller
+    is suspended, not blocked, while the coroutine runs.
+    """
+    if background_loop.in_loop_thread():
+        return await coro
+    return await asyncio.wrap_future(background_loop.submit(coro))
+
+
+_EXHAUSTED = object()
+
+
+async def _anext(iterator: AsyncIterator) -> Any:
+    try:
+        return await iterator.__anext__()
+    except StopAsyncIteration:
+        return _EXHAUSTED
+
+
+def iterate_sync(iterator: AsyncIterator, timeout: Optional[float] = None) -> Iterator:
+    """
+    Drive an async iterator on the background loop from synchronous code.
+    
+    Each step runs on the background loop with its own `timeout`; closing the
+    returned generator early closes the async iterator as well.
+    """
+    try:
+        while True:
+            value = run_sync(_anext(iterator), timeout=timeout)
+            if value is _EXHAUSTED:
+                return
+            yield value
+    finally:
+        if hasattr(iterator, 'aclose'):
+            run_sync(iterator.aclose())
+
+
+async def iterate_async(iterator: AsyncIterator) -> AsyncIterator:
+    """Drive an async iterator on the background loop from any event loop."""
+    try:
+        while True:
+            value = await run_async(_anext(iterator))
+            if value is _EXHAUSTED:
+                return
+            yield value
+    finally:
+        if hasattr(iterator, 'aclose'):
+            await run_async(iterator.aclose())
@@ -1,24 +1,53 @@
 import asyncio
+import logging
 from functools import wraps
-from typing import Any, Callable
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, List, Optional
+from .exceptions import LangfuseTimeoutError
+from .runner import background_loop, run_sync, run_async, iterate_sync, iterate_async
 from .services import AnnotationService, SessionService, ScoringService, TraceService
 
+logger = logging.getLogger(__name__)
 
-def sync_wrapper(async_func: Callable) -> Callable:
-    """Wrapper to make async functions work in Django sync context"""
+
+def sync_wrapper(async_func: Optional[Callable] = None, *, timeout: Optional[float] = None) -> Callable:
+    """
+    Wrapper to make async functions work in Django sync context.
+    
+    The coroutine runs on the process-wide background event loop and the
+    calling thread blocks until it finishes or `timeout` seconds pass
+    (LANGFUSE_SYNC_TIMEOUT when not given).
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return run_sync(func(*args, **kwargs), timeout=timeout)
+        return wrapper
+    
+    if async_func is not None:
+        return decorator(async_func)
+    return decorator
+
+
+def async_wrapper(async_func: Callable) -> Callable:
+    """
+    Wrapper to make async functions awaitable from any event loop.
+    
+    The coroutine runs on the process-wide background event loop while the
+    awaiting view (ASGI or async-under-WSGI) is suspended.
+    """
     @wraps(async_func)
-    def wrapper(*args, **kwargs):
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        return loop.run_until_complete(async_func(*args, **kwargs))
+    async def wrapper(*args, **kwargs):
+        return await run_async(async_func(*args, **kwargs))
     return wrapper
 
 
 class LangfuseService:
-    """Main service class with sync wrappers for Django integration"""
+    """
+    Main service class with sync and async entry points for Django integration.
+    
+    Every call has an awaitable `a`-prefixed variant for async views and a
+    blocking variant for sync code; both execute on the background loop.
+    """
     
     def __init__(self):
         self._annotation = AnnotationService()
@@ -26,49 +55,133 @@ class LangfuseService:
         self._scoring = ScoringService()
         self._trace = TraceService()
     
+    # Batching
+    async def agather(self, *calls: Awaitable, timeout: Optional[float] = None) -> List[Any]:
+        """
+        Await several Langfuse calls concurrently as one batch.
+        
+        Results come back in call order. A call that raised yields its
+        exception in place of a result, so one failure neither cancels nor
+        discards the others; callers decide how to handle each slot.
+        
+        Usage:
+            queue, items = await langfuse_service.agather(
+                langfuse_service.aget_annotation_queue(queue_id),
+                langfuse_service.aget_queue_items(queue_id),
+            )
+        
+        Raises:
+            LangfuseTimeoutError: If the whole batch exceeds `timeout` seconds
+        """
+        batch = asyncio.gather(*calls, return_exceptions=True)
+        if timeout is None:
+            return await batch
+        try:
+            return await asyncio.wait_for(batch, timeout)
+        except asyncio.TimeoutError:
+            raise LangfuseTimeoutError(f"Langfuse batch timed out after {timeout}s")
+    
+    def gather(self, *calls: Awaitable, timeout: Optional[float] = None) -> List[Any]:
+        """Blocking variant of agather for sync code."""
+        return run_sync(self.agather(*calls), timeout=timeout)
+    
     # Annotation methods
-    @sync_wrapper
-    async def get_annotation_queues(self, page: int = 1, limit: int = None):
+    @async_wrapper
+    async def aget_annotation_queues(self, page: int = 1, limit: int = None):
         return await self._annotation.get_queues(page, limit)
     
-    @sync_wrapper
-    async def get_annotation_queue(self, queue_id: str):
+    @async_wrapper
+    async def aget_annotation_queue(self, queue_id: str):
         return await self._annotation.get_queue(queue_id)
     
-    @sync_wrapper
-    async def get_queue_items(self, queue_id: str, status: str = None, page: int = 1, limit: int = None):
+    @async_wrapper
+    async def aget_queue_items(self, queue_id: str, status: str = None, page: int = 1, limit: int = None):
         return await self._annotation.get_queue_items(queue_id, status, page, limit)
     
-    @sync_wrapper
-    async def get_queue_item(self, queue_id: str, item_id: str):
+    @async_wrapper
+    async def aget_queue_item(self, queue_id: str, item_id: str):
         return await self._annotation.get_queue_item(queue_id, item_id)
     
+    async def aiter_queue_items(self, queue_id: str, status: str = None, **options) -> AsyncIterator[dict]:
+        """
+        Stream every item of a queue, crawling pages concurrently.
+        
+        Options are passed to AnnotationService.iter_queue_item_pages
+        (page_size, concurrency, totals).
+        """
+        pages = self._annotation.iter_queue_item_pages(queue_id, status, **options)
+        async for page in iterate_async(pages):
+            for item in page:
+                yield item
+    
+    def iter_queue_items(self, queue_id: str, status: str = None, **options) -> Iterator[dict]:
+        """Blocking variant of aiter_queue_items for sync code."""
+        pages = self._annotation.iter_queue_item_pages(queue_id, status, **options)
+        for page in iterate_sync(pages):
+            yield from page
+    
+    get_annotation_queues = sync_wrapper(aget_annotation_queues)
+    get_annotation_queue = sync_wrapper(aget_annotation_queue)
+    get_queue_items = sync_wrapper(aget_queue_items)
+    get_queue_item = sync_wrapper(aget_queue_item)
+    
     # Session methods
-    @sync_wrapper
-    async def get_session(self, session_id: str):
-        return await self._session.get_session(session_id)
+    @async_wrapper
+    async def aget_session(self, session_id: str, refresh: bool = False):
+        return await self._session.get_session(session_id, refresh)
+    
+    @async_wrapper
+    async def ainvalidate_session(self, session_id: str):
+        return await self._session.invalidate_session(session_id)
+    
+    get_session = sync_wrapper(aget_session)
+    invalidate_session = sync_wrapper(ainvalidate_session)
     
     # Scoring methods
-    @sync_wrapper
-    async def get_score_configs(self, page: int = 1, limit: int = None):
+    @async_wrapper
+    async def aget_score_configs(self, page: int = 1, limit: int = None):
         return await self._scoring.get_score_configs(page, limit)
     
-    @sync_wrapper
-    async def create_score(self, trace_id: str, config_id: str, name: str, value: float, comment: str = None):
-        return await self._scoring.create_score(trace_id, config_id, name, value, comment)
+    @async_wrapper
+    async def aget_score_config(self, name: str):
+        return await self._scoring.configs.get_by_name(name)
+    
+    @async_wrapper
+    async def acreate_score(
+        self, trace_id: str, config_id: str, name: str, value: float, comment: str = None, score_id: str = None
+    ):
+        return await self._scoring.create_score(trace_id, config_id, name, value, comment, score_id)
     
-    @sync_wrapper
-    async def create_trace_comment(self, trace_id: str, comment_text: str):
+    @async_wrapper
+    async def acreate_trace_comment(self, trace_id: str, comment_text: str):
         return await self._scoring.create_trace_comment(trace_id, comment_text)
     
-    @sync_wrapper
-    async def create_session_comment(self, session_id: str, comment_text: str):
+    @async_wrapper
+    async def acreate_session_comment(self, session_id: str, comment_text: str):
         return await self._scoring.create_session_comment(session_id, comment_text)
     
+    get_score_configs = sync_wrapper(aget_score_configs)
+    get_score_config = sync_wrapper(aget_score_config)
+    create_score = sync_wrapper(acreate_score)
+    create_trace_comment = sync_wrapper(acreate_trace_comment)
+    create_session_comment = sync_wrapper(acreate_session_comment)
+    
+    def preload_score_configs(self):
+        """Start loading score configs on the background loop without waiting."""
+        def log_failure(future):
+            if not future.cancelled() and future.exception() is not None:
+                logger.warning(f"Failed to preload score configs: {future.exception()}")
+        
+        future = background_loop.submit(self._scoring.configs.load(force=False))
+        future.add_done_callback(log_failure)
+        return future
+    
     # Trace methods
-    @sync_wrapper
-    async def get_trace(self, trace_id: str):
+    @async_wrapper
+    async def aget_trace(self, trace_id: str):
         return await self._trace.get_trace(trace_id)
+    
+    get_trace = sync_wrapper(aget_trace)
 
 
 # Global service instance
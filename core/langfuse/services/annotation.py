@@ -1,22 +1,33 @@
-from typing import Optional
+import asyncio
+from typing import AsyncIterator, List, Optional
+from ..cache import StaleWhileRevalidateCache
 from ..client import LangfuseClient
+from ..config import config
 from ..models import AnnotationQueue, QueueItem, APIResponse
 
 
 class AnnotationService:
     def __init__(self):
         self.client = LangfuseClient()
+        # Queue list and metadata barely change, so serve them stale-while-revalidate
+        self.queue_cache = StaleWhileRevalidateCache('annotation-queues')
     
     async def get_queues(self, page: int = 1, limit: Optional[int] = None) -> APIResponse:
         params = {"page": page}
         if limit:
             params["limit"] = limit
         
-        response = await self.client.get("/annotation-queues", params)
+        response = await self.queue_cache.get(
+            ('queues', page, limit),
+            lambda: self.client.get("/annotation-queues", params)
+        )
         return APIResponse(data=response.get("data", []), meta=response.get("meta"))
     
     async def get_queue(self, queue_id: str) -> AnnotationQueue:
-        response = await self.client.get(f"/annotation-queues/{queue_id}")
+        response = await self.queue_cache.get(
+            ('queue', queue_id),
+            lambda: self.client.get(f"/annotation-queues/{queue_id}")
+        )
         return response
     
     async def get_queue_items(
@@ -37,4 +48,57 @@ class AnnotationService:
     
     async def get_queue_item(self, queue_id: str, item_id: str) -> QueueItem:
         response = await self.client.get(f"/annotation-queues/{queue_id}/items/{item_id}")
-        return response
\ No newline at end of file
+        return response
+    
+    async def iter_queue_item_pages(
+        self,
+        queue_id: str,
+        status: Optional[str] = None,
+        page_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        totals: Optional[List[int]] = None
+    ) -> AsyncIterator[List[dict]]:
+        """
+        Yield every page of items in a queue, fetching pages concurrently.
+        
+        Page 1 is read first to learn `totalPages`; the remaining pages are
+        fetched by at most `concurrency` requests at a time and yielded as
+        they complete, so pages may arrive out of order. Transient failures
+        are retried by the client; an error that reaches the crawler ends it.
+        
+        Offset pages shift when items are added or removed mid-crawl, so a
+        crawl may miss or repeat items. Pass a list as `totals` to collect the
+        `totalItems` each page reported and detect that.
+        """
+        page_size = page_size or config.crawl_page_size
+        concurrency = concurrency or config.crawl_concurrency
+        
+        def record(response: APIResponse):
+            if totals is not None and (response.meta or {}).get("totalItems") is not None:
+                totals.append(response.meta["totalItems"])
+        
+        first = await self.get_queue_items(queue_id, status, 1, page_size)
+        record(first)
+        yield first.data
+        
+        total_pages = (first.meta or {}).get("totalPages", 1)
+        if total_pages <= 1:
+            return
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch(page: int) -> APIResponse:
+            async with semaphore:
+                return await self.get_queue_items(queue_id, status, page, page_size)
+        
+        tasks = [asyncio.ensure_future(fetch(page)) for page in range(2, total_pages + 1)]
+        try:
+            for next_page in asyncio.as_completed(tasks):
+                response = await next_page
+                record(response)
+                yield response.data
+        finally:
+            # Stop outstanding requests if the consumer bails out or a page failed
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
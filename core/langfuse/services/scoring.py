@@ -1,19 +1,160 @@
-from typing import Optional
+import asyncio
+import logging
+import math
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
 from ..client import LangfuseClient
-from ..models import APIResponse
+from ..config import config
+from ..exceptions import LangfuseAPIError
+from ..models import APIResponse, ScoreConfig
+
+logger = logging.getLogger(__name__)
+
+TRACE_COMMENT_CONFIG_NAME = "COMMENT-trace"
+SESSION_COMMENT_CONFIG_NAME = "COMMENT-session"
+# Used when the comment config cannot be resolved by name
+FALLBACK_COMMENT_CONFIG_ID = "cmfgu6usw000cad0740htzljh"
+
+
+class ScoreConfigRegistry:
+    """
+    In-memory index of the project's score configs by id and name.
+    
+    Configs are loaded once and then kept fresh off the request path: once
+    LANGFUSE_SCORE_CONFIG_REFRESH_INTERVAL has passed, a lookup schedules a
+    background change check that fetches a single config (page 1, limit 1)
+    and only reloads everything when the total count or newest config
+    changed. A full reload is forced every LANGFUSE_SCORE_CONFIG_MAX_AGE
+    seconds to pick up edits to older configs.
+    """
+    
+    page_size = 100
+    
+    def __init__(self, client: LangfuseClient):
+        self.client = client
+        self.configs: List[dict] = []
+        self.by_id: Dict[str, ScoreConfig] = {}
+        self.by_name: Dict[str, ScoreConfig] = {}
+        self.fingerprint: Optional[Tuple] = None
+        self.loaded_at: Optional[float] = None
+        self.checked_at: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+    
+    @property
+    def is_loaded(self) -> bool:
+        return self.loaded_at is not None
+    
+    async def load(self, force: bool = True):
+        """
+        Fetch every score config and rebuild the indexes.
+        
+        With force=False this is a no-op once another caller has loaded them.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not force and self.is_loaded:
+                return
+            first = await self.client.get("/score-configs", {"page": 1, "limit": self.page_size})
+            configs = list(first.get("data", []))
+            total_pages = (first.get("meta") or {}).get("totalPages", 1)
+            if total_pages > 1:
+                pages = await asyncio.gather(*(
+                    self.client.get("/score-configs", {"page": page, "limit": self.page_size})
+                    for page in range(2, total_pages + 1)
+                ))
+                for page in pages:
+                    configs.extend(page.get("data", []))
+            self._index(configs)
+            self.fingerprint = self._fingerprint_of(first)
+            self.loaded_at = self.checked_at = time.monotonic()
+            logger.info(f"Loaded {len(configs)} Langfuse score configs")
+    
+    async def check_for_changes(self):
+        """Reload only when the cheap fingerprint request reports a change."""
+        probe = await self.client.get("/score-configs", {"page": 1, "limit": 1})
+        self.checked_at = time.monotonic()
+        expired = self.checked_at - self.loaded_at >= config.score_config_max_age
+        if expired or self._fingerprint_of(probe) != self.fingerprint:
+            await self.load()
+    
+    async def get_by_id(self, config_id: str) -> Optional[ScoreConfig]:
+        await self._ensure_fresh()
+        return self.by_id.get(config_id)
+    
+    async def get_by_name(self, name: str) -> Optional[ScoreConfig]:
+        await self._ensure_fresh()
+        return self.by_name.get(name)
+    
+    async def all(self) -> List[dict]:
+        await self._ensure_fresh()
+        return self.configs
+    
+    def _index(self, configs: List[dict]):
+        by_id, by_name = {}, {}
+        for data in configs:
+            score_config = ScoreConfig.from_api_data(data)
+            by_id[score_config.id] = score_config
+            # Prefer active configs when an archived one shares the name
+            existing = by_name.get(score_config.name)
+            if existing is None or (existing.is_archived and not score_config.is_archived):
+                by_name[score_config.name] = score_config
+        self.configs, self.by_id, self.by_name = configs, by_id, by_name
+    
+    @staticmethod
+    def _fingerprint_of(response: dict) -> Tuple:
+        meta = response.get("meta") or {}
+        newest = (response.get("data") or [{}])[0]
+        return meta.get("totalItems"), newest.get("id"), newest.get("updatedAt")
+    
+    async def _ensure_fresh(self):
+        if not self.is_loaded:
+            await self.load(force=False)
+        elif time.monotonic() - self.checked_at >= config.score_config_refresh_interval:
+            self._schedule_check()
+    
+    def _schedule_check(self):
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.get_running_loop().create_task(self._background_check())
+    
+    async def _background_check(self):
+        try:
+            await self.check_for_changes()
+        except Exception as e:
+            logger.warning(f"Score config refresh failed: {e}")
 
 
 class ScoringService:
     def __init__(self):
         self.client = LangfuseClient()
+        self.configs = ScoreConfigRegistry(self.client)
     
     async def get_score_configs(self, page: int = 1, limit: Optional[int] = None) -> APIResponse:
-        params = {"page": page}
-        if limit:
-            params["limit"] = limit
-        
-        response = await self.client.get("/score-configs", params)
-        return APIResponse(data=response.get("data", []), meta=response.get("meta"))
+        """Return a page of score configs from the in-memory registry."""
+        configs = await self.configs.all()
+        limit = limit or 50
+        start = (page - 1) * limit
+        return APIResponse(
+            data=configs[start:start + limit],
+            meta={
+                "page": page,
+                "limit": limit,
+                "totalItems": len(configs),
+                "totalPages": math.ceil(len(configs) / limit),
+            }
+        )
+    
+    async def resolve_config_id(self, name: str, default: str) -> str:
+        """Look up a score config id by name, falling back to `default`."""
+        try:
+            score_config = await self.configs.get_by_name(name)
+        except LangfuseAPIError as e:
+            logger.warning(f"Could not load score configs to resolve {name}: {e}")
+            return default
+        return score_config.id if score_config else default
     
     async def create_score(
         self,
@@ -21,9 +162,13 @@ class ScoringService:
         config_id: str,
         name: str,
         value: float,
-        comment: Optional[str] = None
+        comment: Optional[str] = None,
+        score_id: Optional[str] = None
     ) -> dict:
+        # Langfuse upserts scores by id, so a client-generated id makes the
+        # POST safe to retry without creating duplicate scores
         data = {
+            "id": score_id or str(uuid.uuid4()),
             "traceId": trace_id,
             "configId": config_id,
             "name": name,
@@ -32,25 +177,29 @@ class ScoringService:
         if comment:
             data["comment"] = comment
         
-        response = await self.client.post("/scores", data)
+        response = await self.client.post("/scores", data, idempotent=True)
         return response
     
     async def create_trace_comment(self, trace_id: str, comment_text: str) -> dict:
         """Create a comment for a trace using the COMMENT-trace config."""
+        config_id = await self.resolve_config_id(TRACE_COMMENT_CONFIG_NAME, FALLBACK_COMMENT_CONFIG_ID)
         return await self.create_score(
             trace_id=trace_id,
-            config_id="cmfgu6usw000cad0740htzljh",
-            name="COMMENT-trace",
+            config_id=config_id,
+            name=TRACE_COMMENT_CONFIG_NAME,
             value=1,
             comment=comment_text
         )
     
     async def create_session_comment(self, session_id: str, comment_text: str) -> dict:
         """Create a comment for a session using the COMMENT-session config."""
+        # Until a COMMENT-session config exists, sessions reuse the trace comment config
+        default_id = await self.resolve_config_id(TRACE_COMMENT_CONFIG_NAME, FALLBACK_COMMENT_CONFIG_ID)
+        config_id = await self.resolve_config_id(SESSION_COMMENT_CONFIG_NAME, default_id)
         return await self.create_score(
             trace_id=session_id,
-            config_id="cmfgu6usw000cad0740htzljh",  # Change it later with new config created for sessions.
-            name="COMMENT-session",
+            config_id=config_id,
+            name=SESSION_COMMENT_CONFIG_NAME,
             value=1,
             comment=comment_text
         )
\ No newline at end of file
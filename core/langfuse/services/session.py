@@ -1,11 +1,74 @@
-from ..client import LangfuseClient
+import logging
+from datetime import datetime, timezone
+from ..cache import PayloadCache
+from ..client import LangfuseClient, is_outage
+from ..config import config
+from ..exceptions import LangfuseAPIError, LangfuseCircuitOpenError, LangfuseRateLimitError
 from ..models import Session
+from ..timestamps import parse_timestamp
+from ..projection import decode_session, stream_session
+
+logger = logging.getLogger(__name__)
 
 
 class SessionService:
     def __init__(self):
         self.client = LangfuseClient()
+        self.cache = PayloadCache('session', max_entries=config.session_cache_max_entries)
+        # Last good copy of each session, served when Langfuse is unavailable
+        self.stale_cache = PayloadCache('session-stale', max_entries=config.session_cache_max_entries)
+    
+    async def get_session(self, session_id: str, refresh: bool = False) -> Session:
+        """
+        Fetch a session decoded into an immutable Session, served from the
+        cache while it is fresh. Cached sessions are shared between requests.
+        
+        Args:
+            session_id: Langfuse session identifier
+            refresh: Bypass the cache and refetch from Langfuse
+        
+        If Langfuse is down, throttled or its circuit is open, the last good
+        copy (up to LANGFUSE_SESSION_CACHE_STALE_IF_ERROR seconds old) is
+        served instead of failing.
+        """
+        if not refresh:
+            cached = await self.cache.aget(session_id)
+            if cached is not None:
+                return cached
+        
+        try:
+            # Projection drops message history and fields the views never render
+            decoder = None
+            if config.session_projection:
+                decoder = stream_session if config.session_streaming else decode_session
+            response = await self.client.get(f"/sessions/{session_id}", decoder=decoder)
+        except LangfuseAPIError as e:
+            if not (is_outage(e) or isinstance(e, (LangfuseCircuitOpenError, LangfuseRateLimitError))):
+                raise
+            stale = await self.stale_cache.aget(session_id)
+            if stale is None:
+                raise
+            logger.warning(f"Serving stale session {session_id}: {e}")
+            return stale
+        
+        session = Session.from_api(response)
+        await self.cache.aset(session_id, session, self._cache_ttl(session))
+        await self.stale_cache.aset(session_id, session, config.session_cache_stale_if_error)
+        return session
+    
+    async def invalidate_session(self, session_id: str):
+        """Drop a cached session so the next read refetches it."""
+        await self.cache.adelete(session_id)
+        await self.stale_cache.adelete(session_id)
     
-    async def get_session(self, session_id: str) -> Session:
-        response = await self.client.get(f"/sessions/{session_id}")
-        return response
\ No newline at end of file
+    def _cache_ttl(self, session: Session) -> float:
+        """Use a short TTL for sessions that are still receiving traces."""
+        timestamps = [t.timestamp for t in session.traces if t.timestamp]
+        if not timestamps:
+            return config.session_cache_ttl
+        
+        last_trace_at = max(parse_timestamp(ts) for ts in timestamps)
+        age = (datetime.now(timezone.utc) - last_trace_at).total_seconds()
+        if age < config.session_active_window:
+            return config.session_cache_active_ttl
+        return config.session_cache_ttl
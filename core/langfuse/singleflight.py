@@ -0,0 +1,98 @@
+"""
+Single-flight deduplication of identical Langfuse GETs.
+
+Concurrent callers asking for the same endpoint and params share one upstream
+request and receive the same decoded payload, which must be treated as
+read-only.
+
+Within a process, followers await the leader's task. When
+LANGFUSE_SINGLE_FLIGHT_CACHE_ALIAS names a Django cache shared by all
+workers, the leader of each process also takes a short-lived lock there:
+the worker holding it fetches and publishes the payload for
+LANGFUSE_SINGLE_FLIGHT_RESULT_TTL seconds, and the other workers wait for
+that result instead of calling Langfuse themselves.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable
+from django.core.cache import caches
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+# How often workers without the lock check for the leader's result
+POLL_INTERVAL = 0.05
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one call."""
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        # In-flight tasks per event loop, since tasks belong to one loop
+        self._in_flight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def do(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return `await fetch()`, shared with every concurrent caller using `key`."""
+        if not config.single_flight_enabled:
+            return await fetch()
+
+        loop = asyncio.get_running_loop()
+        calls = self._in_flight.setdefault(loop, {})
+        task = calls.get(key)
+        if task is None:
+            task = loop.create_task(self._fetch(key, fetch))
+            calls[key] = task
+            task.add_done_callback(lambda _: calls.pop(key, None))
+        # Shielded so a caller that gives up does not cancel the shared request
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        alias = config.single_flight_cache_alias
+        if not alias:
+            return await fetch()
+        return await self._fetch_shared(caches[alias], self._cache_key(key), fetch)
+
+    async def _fetch_shared(self, cache, cache_key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        lock_key = f"{cache_key}:lock"
+        result_key = f"{cache_key}:result"
+        lock_timeout = config.single_flight_lock_timeout
+        deadline = time.monotonic() + lock_timeout
+
+        while True:
+            cached = await cache.aget(result_key)
+            if cached is not None:
+                return cached
+
+            token = uuid.uuid4().hex
+            if await cache.aadd(lock_key, token, timeout=lock_timeout):
+                try:
+                    result = await fetch()
+                    await cache.aset(result_key, result, timeout=config.single_flight_result_ttl)
+                    return result
+                finally:
+                    if await cache.aget(lock_key) == token:
+                        await cache.adelete(lock_key)
+
+            # Another worker is fetching; wait for its result or for the
+            # lock to go away (it failed), then look again
+            while await cache.aget(lock_key) is not None:
+                if time.monotonic() >= deadline:
+                    logger.warning(f"Gave up waiting on another worker for {cache_key}")
+                    return await fetch()
+                await asyncio.sleep(POLL_INTERVAL)
+                cached = await cache.aget(result_key)
+                if cached is not None:
+                    return cached
+
+    def _cache_key(self, key: Hashable) -> str:
+        digest = hashlib.sha1(json.dumps(key, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        return f"langfuse:singleflight:{self.namespace}:{digest}"
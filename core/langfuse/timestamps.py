@@ -0,0 +1,33 @@
+"""
+Parsing of Langfuse ISO-8601 timestamps.
+
+The same timestamps are parsed over and over (sorting session traces, queue
+item pages, cache TTLs), so parsed values are memoized. datetime objects are
+immutable, which makes sharing them safe.
+"""
+
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Optional
+
+# Distinct timestamp strings kept parsed
+CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_timestamp(value: str) -> datetime:
+    """
+    Parse a Langfuse timestamp such as "2024-01-01T12:00:00.000Z".
+    
+    Naive timestamps are taken to be UTC, so results always compare.
+    """
+    # fromisoformat accepts the "Z" suffix natively since Python 3.11
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def parse_optional_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a timestamp that may be missing or empty."""
+    return parse_timestamp(value) if value else None
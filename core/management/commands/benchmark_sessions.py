@@ -0,0 +1,127 @@
+"""
+Management command to benchmark session payload processing on synthetic
+sessions shaped like real LangGraph sessions.
+"""
+
+import json
+from datetime import datetime
+from django.core.management.base import BaseCommand
+from annotation_tool.models import AnnotationQueueItem
+from core.benchmarks import best_time, build_queue_items_page, build_session_payload, peak_memory
+from core.langfuse.codec import available_backends, get_backend, loads
+from core.langfuse.models import Session
+from core.langfuse.projection import decode_session, ijson, stream_session
+from core.langfuse.timestamps import parse_timestamp
+from core.session_parser import _sorted_entries
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark processing of large Langfuse session payloads (JSON backends, projection, '
+        'timestamp parsing and trace ordering) and of queue item pages'
+    )
+
+    def add_arguments(self, parser):
+        """Add command line arguments"""
+        parser.add_argument(
+            '--traces',
+            type=int,
+            nargs='+',
+            default=[10, 30, 60],
+            help='Session sizes (number of traces) to benchmark'
+        )
+        parser.add_argument(
+            '--tool-output-bytes',
+            type=int,
+            default=2000,
+            help='Size of each tool result in the synthetic sessions'
+        )
+        parser.add_argument(
+            '--queue-items',
+            type=int,
+            default=500,
+            help='Number of items in the synthetic queue item page'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Runs per measurement (the fastest is reported)'
+        )
+
+    def handle(self, *args, **options):
+        """Main command handler"""
+        backends = available_backends()
+        configured, _ = get_backend()
+        self.stdout.write(f"Installed JSON backends: {', '.join(backends)} (configured: {configured})")
+
+        for traces in options['traces']:
+            payload = json.dumps(
+                build_session_payload(traces=traces, tool_output_bytes=options['tool_output_bytes'])
+            ).encode('utf-8')
+            self.stdout.write('')
+            self.stdout.write(self.style.HTTP_INFO(
+                f"Session with {traces} traces ({len(payload) / 1_000_000:.1f} MB)"
+            ))
+
+            timings = {
+                name: best_time(lambda: loads(payload), options['repeat'])
+                for name, loads in backends.items()
+            }
+            for name, seconds in timings.items():
+                self.stdout.write(
+                    f"  {name:<8} {seconds * 1000:9.2f} ms  {timings['json'] / seconds:5.1f}x vs json"
+                )
+
+            # Full decode vs both projection paths on the same payload
+            decoders = [('full decode', loads), ('projection (decode + project)', decode_session)]
+            if ijson is not None:
+                decoders.append(('projection (ijson streaming)', stream_session))
+            for label, decode in decoders:
+                seconds = best_time(lambda: decode(payload), options['repeat'])
+                peak = peak_memory(lambda: decode(payload))
+                self.stdout.write(
+                    f"  {label:<38} {seconds * 1000:9.2f} ms  peak {peak / 1_000_000:7.1f} MB"
+                )
+
+            # Ordering traces: parsing every timestamp in the sort key vs
+            # parse_timestamp with the pre-sorted fast path
+            session = Session.from_api(build_session_payload(traces=traces, tool_output_bytes=0))
+            baseline = best_time(lambda: sorted(
+                session.traces, key=lambda t: datetime.fromisoformat(t.timestamp.replace('Z', '+00:00'))
+            ), options['repeat'])
+            uncached = best_time(lambda: _order_traces(session, parse_timestamp.__wrapped__), options['repeat'])
+            cached = best_time(lambda: _order_traces(session, parse_timestamp), options['repeat'])
+            self.stdout.write(
+                f"  {'trace ordering (fromisoformat + sort)':<38} {baseline * 1000:9.2f} ms"
+            )
+            self.stdout.write(
+                f"  {'trace ordering (fast path)':<38} {uncached * 1000:9.2f} ms uncached  {cached * 1000:9.2f} ms cached"
+            )
+
+        page = build_queue_items_page(options['queue_items'])
+        self.stdout.write('')
+        self.stdout.write(self.style.HTTP_INFO(f"Queue item page with {len(page)} items"))
+        baseline = best_time(lambda: [
+            datetime.fromisoformat(item[field].replace('Z', '+00:00'))
+            for item in page for field in ('createdAt', 'updatedAt', 'completedAt') if item[field]
+        ], options['repeat'])
+        uncached = best_time(lambda: _parse_page(page, parse_timestamp.__wrapped__), options['repeat'])
+        cached = best_time(lambda: _parse_page(page, parse_timestamp), options['repeat'])
+        self.stdout.write(f"  {'timestamps (fromisoformat)':<38} {baseline * 1000:9.2f} ms")
+        self.stdout.write(
+            f"  {'timestamps (parse_timestamp)':<38} {uncached * 1000:9.2f} ms uncached  {cached * 1000:9.2f} ms cached"
+        )
+        models = best_time(lambda: [AnnotationQueueItem.from_api_data(item) for item in page], options['repeat'])
+        self.stdout.write(f"  {'AnnotationQueueItem.from_api_data':<38} {models * 1000:9.2f} ms")
+
+
+def _order_traces(session, parse):
+    return _sorted_entries([(parse(t.timestamp), (t.id, t.timestamp)) for t in session.traces])
+
+
+def _parse_page(page, parse):
+    return [
+        parse(item[field])
+        for item in page for field in ('createdAt', 'updatedAt', 'completedAt') if item[field]
+    ]
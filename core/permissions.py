@@ -5,6 +5,8 @@ Provides helper functions for checking user permissions for different tools.
 
 from django.contrib.auth.models import Group
 from functools import wraps
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.http import JsonResponse
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.urls import reverse
@@ -59,6 +61,7 @@ def get_user_available_tools(user):
 def require_tool_permission(tool_name):
     """
     Decorator to require specific tool permission for a view.
+    Works with both sync and async views.
     
     Usage:
         @require_tool_permission('annotation')
@@ -69,18 +72,32 @@ def require_tool_permission(tool_name):
         tool_name: String name of the tool to check permission for
     """
     def decorator(view_func):
+        def deny(request):
+            # Add error message
+            messages.error(
+                request, 
+                f"You don't have permission to access the {tool_name.replace('_', ' ').title()} tool. "
+                "Please contact your administrator for access."
+            )
+            # Redirect to dashboard
+            return redirect('core:dashboard')
+        
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                # Group lookups hit the database, so run them off the event loop
+                user = await request.auser()
+                if not await sync_to_async(user_has_tool_permission)(user, tool_name):
+                    return deny(request)
+                return await view_func(request, *args, **kwargs)
+            
+            return async_wrapper
+        
         @wraps(view_func)
         def wrapper(request, *args, **kwargs):
             # Check if user has permission
             if not user_has_tool_permission(request.user, tool_name):
-                # Add error message
-                messages.error(
-                    request, 
-                    f"You don't have permission to access the {tool_name.replace('_', ' ').title()} tool. "
-                    "Please contact your administrator for access."
-                )
-                # Redirect to dashboard
-                return redirect('core:dashboard')
+                return deny(request)
             
             # User has permission, proceed to view
             return view_func(request, *args, **kwargs)
@@ -89,6 +106,37 @@ def require_tool_permission(tool_name):
     return decorator
 
 
+def require_any_tool_permission(*tool_names):
+    """
+    Decorator for async endpoints shared by several tools, such as the chat
+    display's JSON and fragment views. Lets the request through if the user
+    may access any of `tool_names`, and answers 403 otherwise instead of
+    redirecting, since these are fetched by scripts.
+    
+    Usage:
+        @require_any_tool_permission('annotation', 'session_viewer')
+        async def my_view(request):
+            ...
+    
+    Args:
+        tool_names: String names of the tools that grant access
+    """
+    def has_any_permission(user):
+        return any(user_has_tool_permission(user, tool_name) for tool_name in tool_names)
+    
+    def decorator(view_func):
+        @wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            # Group lookups hit the database, so run them off the event loop
+            user = await request.auser()
+            if not await sync_to_async(has_any_permission)(user):
+                return JsonResponse({'error': 'Permission denied'}, status=403)
+            return await view_func(request, *args, **kwargs)
+        
+        return wrapper
+    return decorator
+
+
 def assign_user_to_tool(user, tool_name):
     """
     Helper function to assign a user to a tool group.
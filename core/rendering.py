@@ -0,0 +1,66 @@
+"""
+Server-side markdown rendering for chat messages.
+
+Messages are rendered to HTML with Python-Markdown (line breaks kept, fenced
+code and tables, like the GitHub-flavoured rendering of the chat display)
+and sanitized with nh3, so model output can never inject markup. Rendered
+HTML is memoized by the SHA-256 of the source text: identical responses and
+repeat views are rendered once.
+
+Without markdown or nh3 installed, messages are shown as escaped text with
+line breaks.
+"""
+
+import hashlib
+import threading
+from django.conf import settings
+from django.utils.html import escape, linebreaks
+from django.utils.safestring import SafeString, mark_safe
+from .langfuse.cache import TTLCache
+
+try:
+    import markdown
+    import nh3
+except ImportError:  # pragma: no cover - depends on the environment
+    markdown = nh3 = None
+
+MARKDOWN_EXTENSIONS = ['nl2br', 'fenced_code', 'tables', 'sane_lists']
+
+_html_cache = TTLCache(
+    max_entries=getattr(settings, 'MARKDOWN_CACHE_MAX_ENTRIES', 4096),
+    default_ttl=getattr(settings, 'MARKDOWN_CACHE_TTL', 86400.0),
+)
+
+# Markdown instances keep state between conversions, so one per thread
+_local = threading.local()
+
+
+def _converter():
+    converter = getattr(_local, 'converter', None)
+    if converter is None:
+        converter = _local.converter = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+    return converter
+
+
+def _render(text: str) -> str:
+    if markdown is None:
+        return linebreaks(escape(text))
+    converter = _converter()
+    try:
+        return nh3.clean(converter.convert(text))
+    finally:
+        converter.reset()
+
+
+def render_markdown(text) -> SafeString:
+    """Render a message's markdown to sanitized HTML, memoized by content hash."""
+    if text is None:
+        return mark_safe('')
+    if not isinstance(text, str):
+        text = str(text)
+    key = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    html = _html_cache.get(key)
+    if html is None:
+        html = _render(text.strip())
+        _html_cache.set(key, html)
+    return mark_safe(html)
@@ -3,12 +3,32 @@ Session data parser for converting Langfuse session data into chat-like format.
 This module provides independent parsing functions that can be shared across Django apps.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Optional, Tuple
+from django.conf import settings
+from .langfuse.cache import TTLCache
 from .langfuse.models import Session, Trace
-from datetime import datetime
+from .langfuse.timestamps import parse_timestamp
+from .rendering import render_markdown
+import hashlib
+import heapq
 import json
 
 
+# Parsed chat structures, keyed by session id and a digest of its traces so a
+# session that gained or updated traces is parsed again
+_chat_data_cache = TTLCache(
+    max_entries=getattr(settings, 'SESSION_CHAT_CACHE_MAX_ENTRIES', 64),
+    default_ttl=getattr(settings, 'SESSION_CHAT_CACHE_TTL', 3600.0),
+)
+
+# Per session, the parsed turns of every trace seen so far and their order,
+# so a session that gained traces only parses the new ones
+_parsed_history_cache = TTLCache(
+    max_entries=getattr(settings, 'SESSION_CHAT_CACHE_MAX_ENTRIES', 64),
+    default_ttl=getattr(settings, 'SESSION_CHAT_CACHE_TTL', 3600.0),
+)
+
+
 def get_input_message(trace):
     """Return the first input message content from a trace."""
     return trace.input["messages"][0]["content"]
@@ -19,19 +39,54 @@ def get_trace_id(trace):
     return trace.id
 
 
-def filter_output_messages(trace):
+def _is_human_message(msg, target_id):
+    return msg.get("type") == "human" and msg.get("id") == target_id
+
+
+def index_human_messages(traces):
+    """
+    Map every human message id to its offset in the session's message history.
+    
+    LangGraph traces carry the whole conversation so far in their output, so
+    every trace's history is a prefix of the latest one and a human message
+    sits at the same offset in each trace that contains it. Indexing the
+    longest history once lets filter_output_messages locate each trace's
+    input message without scanning.
+    """
+    histories = (
+        trace.output["messages"] for trace in traces
+        if isinstance(trace.output, dict) and isinstance(trace.output.get("messages"), list)
+    )
+    longest = max(histories, key=len, default=[])
+    return {
+        msg.get("id"): i for i, msg in enumerate(longest)
+        if isinstance(msg, dict) and msg.get("type") == "human"
+    }
+
+
+def filter_output_messages(trace, message_index=None):
     """
     Return all output messages after the human input message.
+    
+    The human message is looked up at the offset message_index (from
+    index_human_messages) gives, then at the start of the list (where
+    projected sessions put it); only if neither matches is the list scanned.
     """
     messages = trace.output["messages"]
     target_id = trace.input["messages"][0]["id"]
 
     # Find index of the target human message
+    hint = message_index.get(target_id) if message_index else None
     index = next(
-        (i for i, msg in enumerate(messages)
-         if msg.get("type") == "human" and msg.get("id") == target_id),
+        (i for i in (hint, 0)
+         if i is not None and i < len(messages) and _is_human_message(messages[i], target_id)),
         None,
     )
+    if index is None:
+        index = next(
+            (i for i, msg in enumerate(messages) if _is_human_message(msg, target_id)),
+            None,
+        )
 
     if index is None:
         return []
@@ -51,17 +106,22 @@ def format_tool_input(tool_args):
         return str(tool_args)
 
 
+def format_tool_output(content):
+    """Format a tool's result for display: text as-is, structured content as JSON."""
+    if content is None or isinstance(content, str):
+        return content
+    return format_tool_input(content)
+
+
 def simplify_output_messages(messages):
     """
     Simplify output messages into a structured list of:
-    - AI text responses
-    - Tool calls (with input + output)
+    - AI text responses (with their markdown rendered to sanitized HTML)
+    - Tool calls (id and name only; see get_tool_call for input + output)
+    
+    Tool details are collapsed in the chat display, so their payloads are
+    only formatted when a tool panel is expanded.
     """
-    tool_out = {
-        m.get("tool_call_id"): m.get("content")
-        for m in messages if m.get("type") == "tool"
-    }
-
     simplified = []
     for m in messages:
         if m.get("type") == "ai":
@@ -72,7 +132,8 @@ def simplify_output_messages(messages):
                 if isinstance(c, dict) and c.get("type") == "text"
             ]
             if texts:
-                simplified.append({"ai": " ".join(texts)})
+                text = " ".join(texts)
+                simplified.append({"ai": text, "ai_html": render_markdown(text)})
 
             # Capture tool uses
             for tc in m.get("tool_calls", []):
@@ -80,75 +141,272 @@ def simplify_output_messages(messages):
                     "tool": {
                         "id": tc.get("id"),
                         "name": tc.get("name"),
-                        "input": format_tool_input(tc.get("args")),
-                        "output": tool_out.get(tc.get("id")),
                     }
                 })
 
     return simplified
 
 
+def truncate_tool_output(content, max_bytes):
+    """
+    Cut formatted tool output down to at most max_bytes of UTF-8.
+    
+    Returns:
+        Tuple: (preview, total size in bytes, whether it was truncated)
+    """
+    if content is None:
+        return None, 0, False
+    encoded = content.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return content, len(encoded), False
+    # Drop a multi-byte character split by the cut
+    return encoded[:max_bytes].decode("utf-8", errors="ignore"), len(encoded), True
+
+
+def _find_tool_call(session, trace_id, tool_call_id):
+    """Return (tool call, raw tool output) from a session trace, or None."""
+    for trace in session.traces:
+        if isinstance(trace, dict):
+            trace = Trace.from_api(trace)
+        if trace.id != trace_id:
+            continue
+        
+        tool_call = None
+        tool_output = None
+        for m in filter_output_messages(trace):
+            if m.get("type") == "ai" and tool_call is None:
+                tool_call = next(
+                    (tc for tc in m.get("tool_calls", []) if tc.get("id") == tool_call_id),
+                    None,
+                )
+            elif m.get("type") == "tool" and m.get("tool_call_id") == tool_call_id:
+                tool_output = m.get("content")
+        
+        return None if tool_call is None else (tool_call, tool_output)
+    return None
+
+
+def get_tool_call(session, trace_id, tool_call_id):
+    """
+    Return one tool call of a session trace with its formatted input and
+    output, or None if the trace has no such tool call.
+    
+    Outputs larger than SESSION_TOOL_OUTPUT_MAX_BYTES are cut to a preview
+    of that size; get_tool_output returns them in full.
+    
+    Returns:
+        Dict: {id, name, input, output, output_bytes, output_truncated}
+    """
+    found = _find_tool_call(session, trace_id, tool_call_id)
+    if found is None:
+        return None
+    
+    tool_call, tool_output = found
+    max_bytes = getattr(settings, 'SESSION_TOOL_OUTPUT_MAX_BYTES', 16384)
+    output, output_bytes, truncated = truncate_tool_output(format_tool_output(tool_output), max_bytes)
+    return {
+        "id": tool_call_id,
+        "name": tool_call.get("name"),
+        "input": format_tool_input(tool_call.get("args")),
+        "output": output,
+        "output_bytes": output_bytes,
+        "output_truncated": truncated,
+    }
+
+
+def get_tool_output(session, trace_id, tool_call_id):
+    """Return the full formatted output of one tool call, or None if there is no such call."""
+    found = _find_tool_call(session, trace_id, tool_call_id)
+    if found is None:
+        return None
+    return format_tool_output(found[1]) or ""
+
+
+def parse_trace(trace, message_index=None):
+    """Parse one trace into a chat turn: {trace_id, input, input_html, output}."""
+    input_content = get_input_message(trace)
+    filtered_output_messages = filter_output_messages(trace, message_index)
+    output_content = simplify_output_messages(filtered_output_messages)
+
+    return {
+        "trace_id": get_trace_id(trace),
+        "input": input_content,
+        "input_html": render_markdown(input_content),
+        "output": output_content,
+    }
+
+
+def _sorted_entries(entries):
+    """
+    Sort (timestamp, key) entries, skipping the sort when they already are in
+    order or in reverse order (Langfuse usually returns one or the other).
+    """
+    if all(a <= b for a, b in zip(entries, entries[1:])):
+        return entries
+    if all(a >= b for a, b in zip(entries, entries[1:])):
+        return entries[::-1]
+    return sorted(entries)
+
+
+def iter_chat_history(session):
+    """
+    Given a session object, yield its chat turns one at a time, in
+    timestamp order.
+    
+    Ordering only needs the timestamps, so each trace's messages are parsed
+    as its turn is requested and callers can emit early turns before later
+    ones are parsed.
+    
+    Parsed turns are kept per session, keyed by trace id and timestamp, once
+    a history has been fully consumed. The next call for that session reuses
+    them and only parses traces it has not seen (or whose updatedAt changed),
+    merging them into the already sorted order.
+    """
+    # Sessions from SessionService already hold Trace objects; raw trace
+    # dicts are still accepted
+    traces = {}
+    for trace in session.traces:
+        if isinstance(trace, dict):
+            trace = Trace.from_api(trace)
+        traces[(trace.id, trace.timestamp)] = trace
+    
+    previous_order, previous_turns = _parsed_history_cache.get(session.id, ((), {}))
+    new_keys = _sorted_entries([
+        (parse_timestamp(timestamp), (trace_id, timestamp))
+        for trace_id, timestamp in traces if (trace_id, timestamp) not in previous_turns
+    ])
+
+    order = []
+    turns = {}
+    message_index = None
+    for entry in heapq.merge(previous_order, new_keys):
+        key = entry[1]
+        trace = traces.get(key)
+        if trace is None:
+            # No longer part of the session
+            continue
+        
+        updated_at = getattr(trace, 'updated_at', None)
+        cached = previous_turns.get(key)
+        if cached is not None and cached[0] == updated_at:
+            turn = cached[1]
+        else:
+            if message_index is None:
+                # Built once per session, and only if something needs parsing
+                message_index = index_human_messages(traces.values())
+            turn = parse_trace(trace, message_index)
+        order.append(entry)
+        turns[key] = (updated_at, turn)
+        yield turn
+
+    _parsed_history_cache.set(session.id, (order, turns))
+
+
 def build_chat_history(session):
     """
     Given a session object, return the full chat history as
     a list of dicts: [{trace_id, input, output}, ...]
     """
-    chat_history = []
-    
-    # Convert raw trace data to Trace objects
-    traces_objects = []
-    for trace_data in session.traces:
-        trace = Trace(
-            id=trace_data.get('id'),
-            timestamp=trace_data.get('timestamp'),
-            name=trace_data.get('name'),
-            input=trace_data.get('input'),
-            output=trace_data.get('output'),
-            session_id=trace_data.get('sessionId'),
-            user_id=trace_data.get('userId'),
-            metadata=trace_data.get('metadata')
-        )
-        traces_objects.append(trace)
+    return list(iter_chat_history(session))
+
+
+
+
+def chat_data_cache_key(session: Session) -> Tuple[str, str]:
+    """
+    Return the memoization key for a session's parsed chat data.
     
-    traces_sorted = sorted(
-        traces_objects,
-        key=lambda t: datetime.fromisoformat(t.timestamp.replace("Z", "+00:00"))
-    )
+    The key combines the session id with a digest of every trace's id,
+    timestamp and update time, so any new or changed trace yields a new key.
+    """
+    digest = hashlib.sha1()
+    for trace in session.traces:
+        if isinstance(trace, dict):
+            fields = (trace.get('id'), trace.get('timestamp'), trace.get('updatedAt'))
+        else:
+            fields = (trace.id, trace.timestamp, getattr(trace, 'updated_at', None))
+        digest.update("\x1f".join(str(f) for f in fields).encode('utf-8'))
+        digest.update(b"\x1e")
+    return session.id, digest.hexdigest()
 
-    for trace in traces_sorted:
-        input_content = get_input_message(trace)
-        filtered_output_messages = filter_output_messages(trace)
-        output_content = simplify_output_messages(filtered_output_messages)
 
-        chat_history.append({
-            "trace_id": get_trace_id(trace),
-            "input": input_content,
-            "output": output_content,
-        })
-    return chat_history
+def _chat_data(session: Session, chat_traces) -> Dict[str, Any]:
+    return {
+        'session_id': session.id,
+        'created_at': session.created_at,
+        'project_id': session.project_id,
+        'environment': getattr(session, 'environment', None),
+        'traces': chat_traces,
+        'total_traces': len(chat_traces),
+    }
 
 
+def get_cached_chat_data(session: Session) -> Optional[Dict[str, Any]]:
+    """Return the memoized chat data of an unchanged session, or None."""
+    return _chat_data_cache.get(chat_data_cache_key(session))
 
 
 def get_session_chat_data(session: Session) -> Dict[str, Any]:
     """
     Main function to convert session data into chat format for frontend display.
     
+    Parsed results are memoized per session and trace set, so repeat views of
+    an unchanged session skip parsing entirely. Treat the result as read-only.
+    
     Args:
         session: Session object from Langfuse API
         
     Returns:
         Dict containing parsed chat data and session metadata
     """
-    chat_traces = build_chat_history(session)
+    cache_key = chat_data_cache_key(session)
+    chat_data = _chat_data_cache.get(cache_key)
+    if chat_data is not None:
+        return chat_data
     
+    chat_data = _chat_data(session, build_chat_history(session))
+    _chat_data_cache.set(cache_key, chat_data)
+    return chat_data
+
+
+def iter_session_chat_data(session: Session) -> Iterator[Dict[str, Any]]:
+    """
+    Yield a session's chat turns as they are parsed.
+    
+    Once every turn has been yielded the complete chat data is memoized, as
+    get_session_chat_data would, so the next view of the unchanged session
+    skips parsing. A consumer that stops early leaves the cache untouched.
+    """
+    cache_key = chat_data_cache_key(session)
+    chat_traces = []
+    for turn in iter_chat_history(session):
+        chat_traces.append(turn)
+        yield turn
+    _chat_data_cache.set(cache_key, _chat_data(session, chat_traces))
+
+
+def get_chat_window(chat_data: Dict[str, Any], start: int = 0, size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Return one window of a session's chat turns, for rendering long
+    sessions a page at a time.
+    
+    Args:
+        chat_data: Parsed chat data from get_session_chat_data
+        start: Index of the first turn of the window
+        size: Turns per window (defaults to SESSION_CHAT_WINDOW_SIZE)
+        
+    Returns:
+        Dict: {turns, start, next_start (None on the last window), total}
+    """
+    size = size or getattr(settings, 'SESSION_CHAT_WINDOW_SIZE', 50)
+    traces = chat_data['traces']
+    start = max(start, 0)
+    end = start + size
     return {
-        'session_id': session.id,
-        'created_at': session.created_at,
-        'project_id': session.project_id,
-        'environment': getattr(session, 'environment', None),
-        'traces': chat_traces,
-        'total_traces': len(chat_traces),
+        'turns': traces[start:end],
+        'start': start,
+        'next_start': end if end < len(traces) else None,
+        'total': len(traces),
     }
 
 
@@ -157,14 +415,16 @@ def get_session_chat_data(session: Session) -> Dict[str, Any]:
 #     {
 #         "trace_id": str,              # Unique ID of the trace
 #         "input": str,                 # The first human input message
+#         "input_html": str,            # The input rendered from markdown (sanitized)
 #         "output": [                   # List of AI messages and tool interactions (in order)
-#             {"ai": str},              # Plain AI text response
+#             {"ai": str,               # Plain AI text response
+#              "ai_html": str},         # The response rendered from markdown (sanitized)
 #             {"tool": {                # Tool usage entry
 #                 "id": str,            # Tool call ID
-#                 "input": dict,        # Arguments passed to the tool
-#                 "output": Any         # Tool’s response (depends on the tool)
+#                 "name": str,          # Tool name (input and output are
+#                                       # fetched on demand, see get_tool_call)
 #             }},
-#             {"ai": str},              # Another AI text message (if present)
+#             {"ai": str, "ai_html": str},  # Another AI text message (if present)
 #             # ... more items in sequence
 #         ]
 #     },
@@ -177,13 +437,13 @@ def get_session_chat_data(session: Session) -> Dict[str, Any]:
 # {
 #     "trace_id": "abc123",
 #     "input": "What’s the weather in Paris?",
+#     "input_html": "<p>What’s the weather in Paris?</p>",
 #     "output": [
-#         {"ai": "Let me check that for you."},
+#         {"ai": "Let me check that for you.", "ai_html": "<p>Let me check that for you.</p>"},
 #         {"tool": {
 #             "id": "toolu_01LHvQvJcDwkSMJc6pnb49h4",
-#             "input": {"search_query": "weather in Paris"},
-#             "output": "Sunny, 25°C"
+#             "name": "web_search"
 #         }},
-#         {"ai": "The weather in Paris is sunny, around 25°C."}
+#         {"ai": "It is **sunny**, around 25°C.", "ai_html": "<p>It is <strong>sunny</strong>, around 25°C.</p>"}
 #     ]
 # }
\ No newline at end of file
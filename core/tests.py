@@ -149,6 +149,21 @@ class PermissionUtilityTests(TestCase):
         """Test permission checking with invalid tool name."""
         self.assertFalse(user_has_tool_permission(self.regular_user, 'invalid_tool'))
 
+    def test_require_any_tool_permission(self):
+        """Test that shared session endpoints accept users of either tool and 403 others."""
+        url = reverse('core:session_turns', args=['session_1']) + '?start=oops'
+        self.regular_user.must_change_password = False
+        self.regular_user.save()
+        self.client.force_login(self.regular_user)
+        
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json(), {'error': 'Permission denied'})
+        
+        # Past the permission check the view rejects the bad start
+        self.regular_user.groups.add(self.annotation_group)
+        self.assertEqual(self.client.get(url).status_code, 400)
+
 
 class SessionParserTests(TestCase):
     """Test cases for session parsing functionality."""
@@ -339,11 +354,94 @@ class SessionParserTests(TestCase):
         self.assertIn('ai', result[0])
         self.assertEqual(result[0]['ai'], 'I will help you')
         self.assertIn('tool', result[1])
-        self.assertEqual(result[1]['tool']['name'], 'get_weather')
-        self.assertEqual(result[1]['tool']['output'], 'Weather data')
+        # Tool payloads are left to get_tool_call
+        self.assertEqual(result[1]['tool'], {'id': 'tool_001', 'name': 'get_weather'})
         self.assertIn('ai', result[2])
         self.assertEqual(result[2]['ai'], 'The weather is nice')
 
+    def test_get_tool_call(self):
+        """Test formatting one tool call's input and output on demand."""
+        from core.session_parser import get_tool_call
+        
+        session = self.create_mock_session(self.mock_session_data)
+        tool_call = get_tool_call(session, 'trace_123', 'tool_001')
+        
+        self.assertEqual(tool_call['name'], 'get_weather')
+        self.assertIn('"city": "Paris"', tool_call['input'])
+        self.assertEqual(tool_call['output'], 'Weather in Paris: 22°C, sunny')
+        self.assertIsNone(get_tool_call(session, 'trace_123', 'tool_999'))
+        self.assertIsNone(get_tool_call(session, 'trace_999', 'tool_001'))
+
+    def test_large_tool_output_is_truncated_to_a_preview(self):
+        """Test that tool outputs over the byte cap are cut and served in full separately."""
+        from core.session_parser import get_tool_call, get_tool_output, truncate_tool_output
+        
+        trace_data = dict(self.mock_trace_data)
+        trace_data['output'] = {'messages': [
+            dict(msg, content='é' * 100) if msg['type'] == 'tool' else msg
+            for msg in self.mock_trace_data['output']['messages']
+        ]}
+        session = self.create_mock_session(dict(self.mock_session_data, traces=[trace_data]))
+        
+        with self.settings(SESSION_TOOL_OUTPUT_MAX_BYTES=51):
+            tool_call = get_tool_call(session, 'trace_123', 'tool_001')
+        
+        # 'é' is two bytes, so the split character is dropped
+        self.assertEqual(tool_call['output'], 'é' * 25)
+        self.assertEqual(tool_call['output_bytes'], 200)
+        self.assertTrue(tool_call['output_truncated'])
+        self.assertEqual(get_tool_output(session, 'trace_123', 'tool_001'), 'é' * 100)
+        self.assertEqual(truncate_tool_output('short', 51), ('short', 5, False))
+
+    def test_session_tool_call_endpoint(self):
+        """Test the JSON endpoint used when a tool panel is expanded."""
+        from unittest.mock import AsyncMock, patch
+        
+        viewer = User.objects.create_user(username='viewer', password='testpass123')
+        viewer.must_change_password = False
+        viewer.save()
+        outsider = User.objects.create_user(username='outsider', password='testpass123')
+        outsider.must_change_password = False
+        outsider.save()
+        viewer.groups.add(Group.objects.get_or_create(name='session_viewers')[0])
+        
+        session = self.create_mock_session(self.mock_session_data)
+        url = reverse('core:session_tool_call', args=['session_456', 'trace_123', 'tool_001'])
+        with patch('core.views.langfuse_service.aget_session', new=AsyncMock(return_value=session)):
+            self.client.force_login(outsider)
+            self.assertEqual(self.client.get(url).status_code, 403)
+            
+            self.client.force_login(viewer)
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['output'], 'Weather in Paris: 22°C, sunny')
+            self.assertNotIn('full_output_url', response.json())
+            
+            with self.settings(SESSION_TOOL_OUTPUT_MAX_BYTES=10):
+                data = self.client.get(url).json()
+            self.assertTrue(data['output_truncated'])
+            response = self.client.get(data['full_output_url'])
+            self.assertEqual(response['Content-Type'], 'text/plain; charset=utf-8')
+            self.assertEqual(response.content.decode(), 'Weather in Paris: 22°C, sunny')
+            self.assertEqual(int(response['Content-Length']), len(response.content))
+            
+            missing = reverse('core:session_tool_call', args=['session_456', 'trace_123', 'tool_999'])
+            self.assertEqual(self.client.get(missing).status_code, 404)
+
+    def test_get_chat_window(self):
+        """Test slicing parsed chat data into windows of turns."""
+        from core.session_parser import get_chat_window
+        
+        chat_data = {'traces': [{'trace_id': f"t{i}"} for i in range(5)]}
+        first = get_chat_window(chat_data, size=2)
+        last = get_chat_window(chat_data, start=4, size=2)
+        
+        self.assertEqual([turn['trace_id'] for turn in first['turns']], ['t0', 't1'])
+        self.assertEqual(first['next_start'], 2)
+        self.assertEqual([turn['trace_id'] for turn in last['turns']], ['t4'])
+        self.assertIsNone(last['next_start'])
+        self.assertEqual(last['total'], 5)
+
     def test_build_chat_history(self):
         """Test building chat history from session."""
         from core.session_parser import build_chat_history
@@ -416,3 +514,1197 @@ class SessionParserTests(TestCase):
         self.assertEqual(len(result), 2)
         self.assertEqual(result[0]['trace_id'], 'trace_2')  # Earlier timestamp
         self.assertEqual(result[1]['trace_id'], 'trace_1')  # Later timestamp
+
+    def test_filter_output_messages_uses_session_index(self):
+        """Test that indexed offsets are used and wrong ones fall back to a scan."""
+        from core.session_parser import filter_output_messages, index_human_messages
+        
+        trace = self.create_mock_trace(self.mock_trace_data)
+        index = index_human_messages([trace])
+        self.assertEqual(index, {'msg_001': 0})
+        self.assertEqual(len(filter_output_messages(trace, index)), 3)
+        
+        # An index from a history this trace does not share
+        shifted = self.create_mock_trace(dict(self.mock_trace_data, output={'messages': [
+            {'id': 'other', 'type': 'human', 'content': 'Earlier'},
+        ] + self.mock_trace_data['output']['messages']}))
+        self.assertEqual(len(filter_output_messages(shifted, {'msg_001': 3})), 3)
+        self.assertEqual(len(filter_output_messages(shifted, index_human_messages([shifted]))), 3)
+
+    def test_iter_chat_history_parses_lazily(self):
+        """Test that turns are yielded in order, each parsed only when requested."""
+        from unittest.mock import patch
+        from core import session_parser
+        
+        trace1_data = dict(self.mock_trace_data, id='trace_1', timestamp='2024-01-01T12:00:00Z')
+        trace2_data = dict(self.mock_trace_data, id='trace_2', timestamp='2024-01-01T11:00:00Z')
+        session = self.create_mock_session(dict(self.mock_session_data, traces=[trace1_data, trace2_data]))
+        
+        with patch.object(session_parser, 'simplify_output_messages',
+                          wraps=session_parser.simplify_output_messages) as simplify:
+            turns = session_parser.iter_chat_history(session)
+            self.assertEqual(simplify.call_count, 0)
+            self.assertEqual(next(turns)['trace_id'], 'trace_2')
+            self.assertEqual(simplify.call_count, 1)
+            self.assertEqual([turn['trace_id'] for turn in turns], ['trace_1'])
+            self.assertEqual(simplify.call_count, 2)
+
+
+class LangfuseClientTests(TestCase):
+    """Test cases for the pooled Langfuse HTTP client."""
+
+    def test_http_client_is_shared_within_event_loop(self):
+        """Test that repeated calls on one loop reuse the same pooled client."""
+        import asyncio
+        from core.langfuse.client import get_http_client, close_http_client
+
+        async def fetch_clients():
+            first = get_http_client()
+            second = get_http_client()
+            await close_http_client()
+            return first, second
+
+        first, second = asyncio.run(fetch_clients())
+        self.assertIs(first, second)
+        self.assertTrue(first.is_closed)
+
+    def test_http_client_uses_pool_settings(self):
+        """Test that pool limits and timeouts come from settings."""
+        import asyncio
+        from core.langfuse.client import get_http_client, close_http_client
+
+        async def fetch_client():
+            client = get_http_client()
+            pool = client._transport._pool
+            timeout = client.timeout
+            await close_http_client()
+            return pool, timeout
+
+        with self.settings(LANGFUSE_HTTP_MAX_CONNECTIONS=7, LANGFUSE_HTTP_TIMEOUT=3.0):
+            pool, timeout = asyncio.run(fetch_client())
+
+        self.assertEqual(pool._max_connections, 7)
+        self.assertEqual(timeout.read, 3.0)
+
+
+class LangfuseRetryTests(TestCase):
+    """Test cases for retrying transient Langfuse failures."""
+
+    def setUp(self):
+        """Keep failures in these tests from opening shared circuit breakers."""
+        from core.langfuse import client
+
+        client._circuit_breakers.clear()
+        self.addCleanup(client._circuit_breakers.clear)
+
+    def run_request(self, handler, call):
+        """Run `call(client)` against an httpx mock transport."""
+        import asyncio
+        import httpx
+        from unittest.mock import patch
+        from core.langfuse.client import LangfuseClient
+
+        self.requests = []
+
+        async def record(request):
+            self.requests.append(request)
+            response = handler(len(self.requests))
+            if asyncio.iscoroutine(response):
+                response = await response
+            return response
+
+        async def scenario():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(record)) as http_client:
+                with patch('core.langfuse.client.get_http_client', return_value=http_client):
+                    return await call(LangfuseClient())
+
+        with self.settings(LANGFUSE_API_BASE_URL='https://langfuse.test', LANGFUSE_RETRY_BACKOFF_BASE=0.001):
+            return asyncio.run(scenario())
+
+    def test_get_retries_transient_status(self):
+        """Test that a 503 followed by a 200 succeeds."""
+        import httpx
+
+        def handler(count):
+            return httpx.Response(503) if count == 1 else httpx.Response(200, json={'ok': True})
+
+        result = self.run_request(handler, lambda client: client.get('/sessions/s1'))
+
+        self.assertEqual(result, {'ok': True})
+        self.assertEqual(len(self.requests), 2)
+
+    def test_retry_after_header_is_honoured(self):
+        """Test that the wait before a retry follows Retry-After."""
+        import httpx
+        from unittest.mock import AsyncMock, patch
+
+        def handler(count):
+            if count == 1:
+                return httpx.Response(429, headers={'Retry-After': '2'})
+            return httpx.Response(200, json={})
+
+        with patch('core.langfuse.client.asyncio.sleep', new=AsyncMock()) as sleep:
+            self.run_request(handler, lambda client: client.get('/sessions/s1'))
+
+        sleep.assert_awaited_once_with(2.0)
+
+    def test_gives_up_after_max_attempts(self):
+        """Test that the final error response is raised once attempts run out."""
+        import httpx
+        from core.langfuse.exceptions import LangfuseAPIError
+
+        with self.settings(LANGFUSE_RETRY_MAX_ATTEMPTS=3):
+            with self.assertRaises(LangfuseAPIError) as ctx:
+                self.run_request(lambda count: httpx.Response(502), lambda client: client.get('/traces/t1'))
+
+        self.assertEqual(ctx.exception.status_code, 502)
+        self.assertEqual(len(self.requests), 3)
+
+    def test_deadline_bounds_the_whole_call(self):
+        """Test that a call exceeding LANGFUSE_RETRY_DEADLINE raises a timeout error."""
+        import asyncio
+        import httpx
+        from core.langfuse.exceptions import LangfuseTimeoutError
+
+        async def slow(count):
+            await asyncio.sleep(1)
+            return httpx.Response(200, json={})
+
+        with self.settings(LANGFUSE_RETRY_DEADLINE=0.05):
+            with self.assertRaises(LangfuseTimeoutError):
+                self.run_request(slow, lambda client: client.get('/traces/t1'))
+
+    def test_post_is_not_retried_unless_idempotent(self):
+        """Test that plain POSTs fail on the first transient error."""
+        import httpx
+        from core.langfuse.exceptions import LangfuseAPIError
+
+        with self.assertRaises(LangfuseAPIError):
+            self.run_request(lambda count: httpx.Response(503), lambda client: client.post('/comments', {}))
+
+        self.assertEqual(len(self.requests), 1)
+
+    def test_create_score_retries_with_stable_id(self):
+        """Test that score creation replays the same client-generated id."""
+        import json
+        import httpx
+        from core.langfuse.services import ScoringService
+
+        def handler(count):
+            return httpx.Response(503) if count == 1 else httpx.Response(200, json={'id': 'ok'})
+
+        async def create(client):
+            service = ScoringService()
+            service.client = client
+            return await service.create_score('trace-1', 'config-1', 'COMMENT-trace', 1, 'Nice')
+
+        self.run_request(handler, create)
+
+        ids = [json.loads(request.content)['id'] for request in self.requests]
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(ids[0], ids[1])
+
+    def test_transport_errors_become_api_errors(self):
+        """Test that non-retryable httpx errors surface as LangfuseAPIError."""
+        from core.langfuse.client import LangfuseClient
+        from core.langfuse.exceptions import LangfuseAPIError
+        import asyncio
+
+        with self.settings(LANGFUSE_API_BASE_URL='not-a-url'):
+            with self.assertRaises(LangfuseAPIError):
+                asyncio.run(LangfuseClient().get('/traces/t1'))
+
+
+class LangfuseRateLimiterTests(TestCase):
+    """Test cases for the per-family client-side rate limiter."""
+
+    def test_endpoints_map_to_families(self):
+        """Test that endpoint paths are grouped into limit families."""
+        from core.langfuse.ratelimit import endpoint_family
+
+        self.assertEqual(endpoint_family('/annotation-queues/q1/items'), 'annotation_queues')
+        self.assertEqual(endpoint_family('/sessions/s1'), 'sessions')
+        self.assertEqual(endpoint_family('/score-configs'), 'scores')
+        self.assertEqual(endpoint_family('/scores'), 'scores')
+        self.assertEqual(endpoint_family('/traces/t1'), 'traces')
+        self.assertEqual(endpoint_family('/projects'), 'default')
+
+    def test_local_bucket_queues_then_fails(self):
+        """Test that an empty bucket delays requests and fails past the maximum wait."""
+        import asyncio
+        import time
+        from core.langfuse.exceptions import LangfuseRateLimitError
+        from core.langfuse.ratelimit import RateLimiter
+
+        limiter = RateLimiter()
+
+        async def scenario():
+            started = time.monotonic()
+            for _ in range(3):
+                await limiter.acquire('/sessions/s1')
+            return time.monotonic() - started
+
+        with self.settings(LANGFUSE_RATE_LIMITS={'sessions': (20, 2)}, LANGFUSE_RATE_LIMIT_MAX_WAIT=1):
+            elapsed = asyncio.run(scenario())
+        self.assertGreaterEqual(elapsed, 0.04)
+
+        with self.settings(LANGFUSE_RATE_LIMITS={'sessions': (1, 1)}, LANGFUSE_RATE_LIMIT_MAX_WAIT=0.1):
+            asyncio.run(limiter.acquire('/sessions/s1'))
+            with self.assertRaises(LangfuseRateLimitError):
+                asyncio.run(limiter.acquire('/sessions/s1'))
+            # Other families are not affected
+            asyncio.run(limiter.acquire('/traces/t1'))
+
+    def test_shared_bucket_counts_across_limiters(self):
+        """Test that limiters backed by the same cache share one budget."""
+        import asyncio
+        from core.langfuse.exceptions import LangfuseRateLimitError
+        from core.langfuse.ratelimit import RateLimiter
+
+        caches_setting = {
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'ratelimit': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'ratelimit'},
+        }
+        with self.settings(
+            CACHES=caches_setting,
+            LANGFUSE_RATE_LIMIT_CACHE_ALIAS='ratelimit',
+            LANGFUSE_RATE_LIMITS={'scores': (0.1, 2)},
+            LANGFUSE_RATE_LIMIT_MAX_WAIT=0,
+        ):
+            first, second = RateLimiter(), RateLimiter()
+            asyncio.run(first.acquire('/scores'))
+            asyncio.run(second.acquire('/scores'))
+            with self.assertRaises(LangfuseRateLimitError):
+                asyncio.run(first.acquire('/scores'))
+
+    def test_shared_bucket_rejects_non_atomic_caches(self):
+        """Test that caches without atomic increments can't back the shared limiter."""
+        import asyncio
+        from django.core.exceptions import ImproperlyConfigured
+        from core.langfuse.ratelimit import RateLimiter
+
+        caches_setting = {
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'ratelimit': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'ratelimit'},
+        }
+        with self.settings(
+            CACHES=caches_setting,
+            LANGFUSE_RATE_LIMIT_CACHE_ALIAS='ratelimit',
+            LANGFUSE_RATE_LIMITS={'scores': (1, 2)},
+        ):
+            with self.assertRaises(ImproperlyConfigured):
+                asyncio.run(RateLimiter().acquire('/scores'))
+
+
+class LangfuseCircuitBreakerTests(TestCase):
+    """Test cases for the per-family Langfuse circuit breaker."""
+
+    def setUp(self):
+        """Start every test with fresh breakers."""
+        from core.langfuse import client
+
+        client._circuit_breakers.clear()
+        self.addCleanup(client._circuit_breakers.clear)
+
+    def call(self, status, endpoint='/traces/t1'):
+        """Make one GET that Langfuse answers with `status`; returns the number of requests sent."""
+        import asyncio
+        import httpx
+        from unittest.mock import patch
+        from core.langfuse.client import LangfuseClient
+
+        sent = []
+
+        def handler(request):
+            sent.append(request)
+            return httpx.Response(status, json={})
+
+        async def scenario():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+                with patch('core.langfuse.client.get_http_client', return_value=http_client):
+                    await LangfuseClient().get(endpoint)
+
+        asyncio.run(scenario())
+        return len(sent)
+
+    def test_circuit_opens_fails_fast_and_recovers(self):
+        """Test closed -> open -> half-open -> closed transitions."""
+        import time
+        from core.langfuse.client import get_circuit_breaker
+        from core.langfuse.exceptions import LangfuseAPIError, LangfuseCircuitOpenError
+
+        with self.settings(
+            LANGFUSE_API_BASE_URL='https://langfuse.test',
+            LANGFUSE_RETRY_MAX_ATTEMPTS=1,
+            LANGFUSE_CIRCUIT_FAILURE_THRESHOLD=2,
+            LANGFUSE_CIRCUIT_RESET_TIMEOUT=0.05,
+        ):
+            for _ in range(2):
+                with self.assertRaises(LangfuseAPIError):
+                    self.call(503)
+            self.assertEqual(get_circuit_breaker('traces').state, 'open')
+
+            # Open: no request reaches Langfuse, other families are unaffected
+            sent = []
+            with self.assertRaises(LangfuseCircuitOpenError):
+                sent.append(self.call(200))
+            self.assertEqual(sent, [])
+            self.assertEqual(self.call(200, endpoint='/sessions/s1'), 1)
+
+            # Half-open probe fails and reopens, then a later probe closes it
+            time.sleep(0.06)
+            with self.assertRaises(LangfuseAPIError):
+                self.call(503)
+            self.assertEqual(get_circuit_breaker('traces').state, 'open')
+            time.sleep(0.06)
+            self.assertEqual(self.call(200), 1)
+            self.assertEqual(get_circuit_breaker('traces').snapshot()['state'], 'closed')
+
+    def test_client_errors_do_not_trip_the_circuit(self):
+        """Test that 4xx answers count as Langfuse being reachable."""
+        from core.langfuse.client import get_circuit_breaker
+        from core.langfuse.exceptions import LangfuseAPIError
+
+        with self.settings(LANGFUSE_API_BASE_URL='https://langfuse.test', LANGFUSE_CIRCUIT_FAILURE_THRESHOLD=2):
+            for _ in range(3):
+                with self.assertRaises(LangfuseAPIError):
+                    self.call(404)
+
+        self.assertEqual(get_circuit_breaker('traces').state, 'closed')
+
+    def test_only_transport_failures_trip_the_circuit(self):
+        """Test that malformed requests don't count as outages but unreachable hosts do."""
+        import asyncio
+        import httpx
+        from unittest.mock import patch
+        from core.langfuse.client import LangfuseClient, get_circuit_breaker, is_outage
+        from core.langfuse.exceptions import LangfuseAPIError
+
+        self.assertFalse(is_outage(LangfuseAPIError('bad url')))
+        self.assertTrue(is_outage(LangfuseAPIError('unreachable', is_transport=True)))
+
+        def fail_with(error_class):
+            def handler(request):
+                raise error_class('boom', request=request)
+
+            async def scenario():
+                async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+                    with patch('core.langfuse.client.get_http_client', return_value=http_client):
+                        await LangfuseClient().get('/traces/t1')
+
+            asyncio.run(scenario())
+
+        with self.settings(
+            LANGFUSE_API_BASE_URL='https://langfuse.test',
+            LANGFUSE_RETRY_MAX_ATTEMPTS=1,
+            LANGFUSE_CIRCUIT_FAILURE_THRESHOLD=2,
+        ):
+            for _ in range(3):
+                with self.assertRaises(LangfuseAPIError) as ctx:
+                    fail_with(httpx.UnsupportedProtocol)
+                self.assertFalse(ctx.exception.is_transport)
+            self.assertEqual(get_circuit_breaker('traces').state, 'closed')
+
+            for _ in range(2):
+                with self.assertRaises(LangfuseAPIError) as ctx:
+                    fail_with(httpx.ConnectError)
+                self.assertTrue(ctx.exception.is_transport)
+            self.assertEqual(get_circuit_breaker('traces').state, 'open')
+
+    def test_session_served_stale_while_langfuse_is_down(self):
+        """Test that the last good copy of a session is served on outages but not on 404s."""
+        import asyncio
+        from unittest.mock import AsyncMock
+        from core.langfuse.exceptions import LangfuseAPIError, LangfuseCircuitOpenError
+        from core.langfuse.services import SessionService
+
+        session = {
+            'id': 'session_1',
+            'createdAt': '2024-01-01T11:00:00Z',
+            'projectId': 'project_1',
+            'traces': [{'id': 'trace_1', 'timestamp': '2024-01-01T12:00:00Z'}],
+        }
+        service = SessionService()
+        service.client.get = AsyncMock(return_value=session)
+
+        with self.settings(LANGFUSE_SESSION_CACHE_TTL=0):
+            asyncio.run(service.get_session('session_1'))
+            service.client.get.side_effect = LangfuseCircuitOpenError('open')
+            self.assertEqual(asyncio.run(service.get_session('session_1')).id, 'session_1')
+
+            service.client.get.side_effect = LangfuseAPIError('gone', status_code=404)
+            with self.assertRaises(LangfuseAPIError):
+                asyncio.run(service.get_session('session_1'))
+
+    def test_status_endpoint_is_staff_only(self):
+        """Test that circuit state is reported to staff as JSON."""
+        staff = User.objects.create_user(username='staff', password='testpass123', is_staff=True)
+        staff.must_change_password = False
+        staff.save()
+        user = User.objects.create_user(username='plain', password='testpass123')
+        user.must_change_password = False
+        user.save()
+
+        self.client.force_login(user)
+        response = self.client.get(reverse('core:langfuse_status'))
+        self.assertEqual(response.status_code, 302)
+
+        self.client.force_login(staff)
+        response = self.client.get(reverse('core:langfuse_status'))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertTrue(data['healthy'])
+        self.assertEqual(data['circuits']['sessions']['state'], 'closed')
+
+
+class SingleFlightTests(TestCase):
+    """Test cases for coalescing identical concurrent Langfuse GETs."""
+
+    def test_concurrent_identical_gets_share_one_request(self):
+        """Test that identical GETs coalesce while different params do not."""
+        import asyncio
+        import httpx
+        from unittest.mock import patch
+        from core.langfuse.client import LangfuseClient
+
+        sent = []
+
+        async def handler(request):
+            sent.append(str(request.url))
+            await asyncio.sleep(0.02)
+            return httpx.Response(200, json={'url': str(request.url)})
+
+        async def scenario():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+                with patch('core.langfuse.client.get_http_client', return_value=http_client):
+                    client = LangfuseClient()
+                    return await asyncio.gather(
+                        *[client.get('/sessions/s1') for _ in range(5)],
+                        client.get('/annotation-queues', {'page': 1}),
+                        client.get('/annotation-queues', {'page': 2}),
+                    )
+
+        with self.settings(LANGFUSE_API_BASE_URL='https://langfuse.test'):
+            results = asyncio.run(scenario())
+
+        self.assertEqual(len(sent), 3)
+        self.assertEqual(len({id(result) for result in results[:5]}), 1)
+
+    def test_cancelled_follower_does_not_cancel_shared_request(self):
+        """Test that a caller giving up leaves the shared request running for others."""
+        import asyncio
+        from core.langfuse.singleflight import SingleFlight
+
+        flight = SingleFlight('test')
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'payload'
+
+        async def scenario():
+            impatient = asyncio.ensure_future(flight.do('key', fetch))
+            patient = asyncio.ensure_future(flight.do('key', fetch))
+            await asyncio.sleep(0.01)
+            impatient.cancel()
+            return await patient
+
+        self.assertEqual(asyncio.run(scenario()), 'payload')
+        self.assertEqual(len(calls), 1)
+
+    def test_workers_coalesce_through_shared_cache(self):
+        """Test that separate processes (SingleFlight instances) share one fetch via the cache lock."""
+        import asyncio
+        from core.langfuse.singleflight import SingleFlight
+
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            return {'id': 'session_1'}
+
+        async def scenario():
+            workers = [SingleFlight('test'), SingleFlight('test')]
+            return await asyncio.gather(*[worker.do(('sessions', 's1'), fetch) for worker in workers])
+
+        caches_setting = {
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'flights': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'flights'},
+        }
+        with self.settings(CACHES=caches_setting, LANGFUSE_SINGLE_FLIGHT_CACHE_ALIAS='flights'):
+            results = asyncio.run(scenario())
+
+        self.assertEqual(results, [{'id': 'session_1'}, {'id': 'session_1'}])
+        self.assertEqual(len(calls), 1)
+
+
+class MarkdownRenderingTests(TestCase):
+    """Test cases for server-side markdown rendering of chat messages."""
+
+    def test_renders_markdown_to_sanitized_html(self):
+        """Test that markdown is rendered and unsafe markup is stripped."""
+        from core.rendering import render_markdown
+
+        html = render_markdown('**Bold** line\nnext <script>alert(1)</script> [x](javascript:alert(1))')
+
+        self.assertIn('<strong>Bold</strong>', html)
+        self.assertIn('<br', html)
+        self.assertNotIn('<script', html)
+        self.assertNotIn('javascript:', html)
+        self.assertEqual(render_markdown(None), '')
+
+    def test_identical_text_is_rendered_once(self):
+        """Test that rendered HTML is memoized by content hash."""
+        from unittest.mock import patch
+        from core import rendering
+
+        with patch.object(rendering, '_render', wraps=rendering._render) as render:
+            first = rendering.render_markdown('A *unique* response for the cache test')
+            second = rendering.render_markdown('A *unique* response for the cache test')
+
+        self.assertEqual(first, second)
+        self.assertEqual(render.call_count, 1)
+
+    def test_parsed_turns_carry_rendered_html(self):
+        """Test that the parser renders inputs and AI responses."""
+        from core.session_parser import simplify_output_messages
+
+        result = simplify_output_messages([{'type': 'ai', 'content': [{'type': 'text', 'text': '# Title'}]}])
+
+        self.assertEqual(result[0]['ai'], '# Title')
+        self.assertEqual(result[0]['ai_html'], '<h1>Title</h1>')
+
+
+class TimestampParsingTests(TestCase):
+    """Test cases for the shared Langfuse timestamp parser."""
+
+    def test_parses_utc_and_naive_timestamps_as_aware(self):
+        """Test that "Z", offset and naive timestamps all parse to aware datetimes."""
+        from datetime import datetime, timezone
+        from core.langfuse.timestamps import parse_optional_timestamp, parse_timestamp
+
+        expected = datetime(2024, 1, 1, 12, 0, 0, 500000, tzinfo=timezone.utc)
+        self.assertEqual(parse_timestamp('2024-01-01T12:00:00.500Z'), expected)
+        self.assertEqual(parse_timestamp('2024-01-01T14:00:00.500+02:00'), expected)
+        self.assertEqual(parse_timestamp('2024-01-01T12:00:00.500'), expected)
+        self.assertIsNone(parse_optional_timestamp(None))
+        self.assertIsNone(parse_optional_timestamp(''))
+
+    def test_repeat_timestamps_are_parsed_once(self):
+        """Test that parsed timestamps are memoized."""
+        from core.langfuse.timestamps import parse_timestamp
+
+        first = parse_timestamp('2024-02-03T04:05:06.789Z')
+        self.assertIs(parse_timestamp('2024-02-03T04:05:06.789Z'), first)
+
+    def test_sorted_entries_skips_sorting_ordered_input(self):
+        """Test the in-order and reverse-order fast paths of trace ordering."""
+        from unittest.mock import patch
+        from core import session_parser
+
+        entries = [(1, 'a'), (2, 'b'), (3, 'c')]
+        with patch('builtins.sorted', side_effect=AssertionError('sorted')):
+            self.assertIs(session_parser._sorted_entries(entries), entries)
+            self.assertEqual(session_parser._sorted_entries(entries[::-1]), entries)
+        self.assertEqual(session_parser._sorted_entries([(2, 'b'), (3, 'c'), (1, 'a')]), entries)
+
+
+class JSONCodecTests(TestCase):
+    """Test cases for the pluggable JSON decoding backend."""
+
+    def setUp(self):
+        from core.langfuse import codec
+
+        codec._selected.clear()
+        self.addCleanup(codec._selected.clear)
+
+    def test_every_installed_backend_decodes_the_same(self):
+        """Test that all backends agree on a realistic session payload."""
+        import json
+        from core.benchmarks import build_session_payload
+        from core.langfuse.codec import available_backends
+
+        payload = build_session_payload(traces=3, tool_output_bytes=100)
+        raw = json.dumps(payload).encode('utf-8')
+        backends = available_backends()
+
+        self.assertIn('json', backends)
+        for name, loads in backends.items():
+            self.assertEqual(loads(raw), payload, name)
+
+    def test_backend_selection(self):
+        """Test that auto prefers a fast backend and unknown names fall back."""
+        from core.langfuse import codec
+
+        with self.settings(LANGFUSE_JSON_BACKEND='json'):
+            self.assertEqual(codec.get_backend()[0], 'json')
+        with self.settings(LANGFUSE_JSON_BACKEND='simdjson'):
+            self.assertEqual(codec.get_backend()[0], next(iter(codec.available_backends())))
+        self.assertEqual(codec.loads(b'{"a": [1, 2]}'), {'a': [1, 2]})
+
+    def test_benchmark_command_runs(self):
+        """Test that the benchmark reports every installed backend."""
+        import io
+        from django.core.management import call_command
+        from core.langfuse.codec import available_backends
+
+        stdout = io.StringIO()
+        call_command('benchmark_sessions', '--traces', '2', '--repeat', '1', stdout=stdout)
+
+        for name in available_backends():
+            self.assertIn(name, stdout.getvalue())
+        self.assertIn('projection (decode + project)', stdout.getvalue())
+
+
+class SessionProjectionTests(TestCase):
+    """Test cases for decoding sessions with field projection."""
+
+    def setUp(self):
+        import json
+        from core.benchmarks import build_session_payload
+
+        self.payload = build_session_payload(traces=4, tool_output_bytes=50)
+        self.content = json.dumps(self.payload).encode('utf-8')
+
+    def test_projection_keeps_rendered_data_only(self):
+        """Test that metadata and earlier conversation turns are dropped."""
+        from core.langfuse.projection import decode_session
+
+        session = decode_session(self.content)
+        trace = next(t for t in session['traces'] if t['id'] == 'trace-0002')
+
+        self.assertEqual(session['projectId'], 'project-bench')
+        self.assertNotIn('metadata', trace)
+        self.assertNotIn('createdAt', trace)
+        self.assertEqual(len(trace['input']['messages']), 1)
+        self.assertEqual(trace['output']['messages'][0]['id'], 'human-2')
+        self.assertEqual(len(trace['output']['messages']), 5)
+
+    def test_streaming_and_full_decode_agree(self):
+        """Test that incremental parsing and full decode + projection give the same result."""
+        from unittest.mock import patch
+        from core.langfuse import projection
+
+        decoded = projection.decode_session(self.content)
+        self.assertEqual(projection.stream_session(self.content), decoded)
+        with patch.object(projection, 'ijson', None):
+            self.assertEqual(projection.stream_session(self.content), decoded)
+
+    def test_streaming_is_opt_in(self):
+        """Test that sessions are fully decoded unless streaming is enabled."""
+        import asyncio
+        from unittest.mock import AsyncMock
+        from core.langfuse.projection import decode_session, stream_session
+        from core.langfuse.services import SessionService
+
+        service = SessionService()
+        service.client.get = AsyncMock(return_value=self.payload)
+
+        asyncio.run(service.get_session('session-bench', refresh=True))
+        self.assertIs(service.client.get.call_args.kwargs['decoder'], decode_session)
+
+        with self.settings(LANGFUSE_SESSION_STREAMING=True):
+            asyncio.run(service.get_session('session-bench', refresh=True))
+        self.assertIs(service.client.get.call_args.kwargs['decoder'], stream_session)
+
+    def test_projected_session_parses_like_the_full_one(self):
+        """Test that the chat history is unchanged by projection."""
+        from core.langfuse.models import Session
+        from core.langfuse.projection import decode_session
+        from core.session_parser import build_chat_history
+
+        full = build_chat_history(Session.from_api(self.payload))
+        projected = build_chat_history(Session.from_api(decode_session(self.content)))
+
+        self.assertEqual(projected, full)
+
+    def test_client_applies_custom_decoder(self):
+        """Test that LangfuseClient.get hands the raw body to a custom decoder."""
+        import asyncio
+        import httpx
+        from unittest.mock import patch
+        from core.langfuse.client import LangfuseClient
+        from core.langfuse.projection import decode_session
+
+        def handler(request):
+            return httpx.Response(200, content=self.content)
+
+        async def scenario():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+                with patch('core.langfuse.client.get_http_client', return_value=http_client):
+                    return await LangfuseClient().get('/sessions/session-bench', decoder=decode_session)
+
+        with self.settings(LANGFUSE_API_BASE_URL='https://langfuse.test'):
+            session = asyncio.run(scenario())
+
+        self.assertTrue(all('metadata' not in trace for trace in session['traces']))
+
+
+class BackgroundLoopTests(TestCase):
+    """Test cases for the background event loop used by sync wrappers."""
+
+    def test_coroutines_share_one_persistent_loop(self):
+        """Test that sync calls run on the same loop in a separate thread."""
+        import asyncio
+        import threading
+        from core.langfuse.runner import run_sync
+
+        async def current_loop():
+            return asyncio.get_running_loop(), threading.get_ident()
+
+        first_loop, first_thread = run_sync(current_loop())
+        second_loop, second_thread = run_sync(current_loop())
+
+        self.assertIs(first_loop, second_loop)
+        self.assertEqual(first_thread, second_thread)
+        self.assertNotEqual(first_thread, threading.get_ident())
+
+    def test_timeout_raises_langfuse_timeout_error(self):
+        """Test that slow coroutines are cancelled after the per-call timeout."""
+        import asyncio
+        from core.langfuse.runner import run_sync
+        from core.langfuse.exceptions import LangfuseTimeoutError, LangfuseAPIError
+
+        async def slow():
+            await asyncio.sleep(5)
+
+        with self.assertRaises(LangfuseTimeoutError) as ctx:
+            run_sync(slow(), timeout=0.05)
+        self.assertIsInstance(ctx.exception, LangfuseAPIError)
+
+    def test_sync_wrapper_propagates_exceptions(self):
+        """Test that errors raised by the coroutine reach the sync caller."""
+        from core.langfuse.service import sync_wrapper
+
+        @sync_wrapper(timeout=1)
+        async def failing():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            failing()
+
+
+class SessionCacheTests(TestCase):
+    """Test cases for the Langfuse session read-through cache."""
+
+    def make_session(self, timestamp='2024-01-01T12:00:00Z'):
+        return {
+            'id': 'session_1',
+            'createdAt': '2024-01-01T11:00:00Z',
+            'projectId': 'project_1',
+            'traces': [{'id': 'trace_1', 'timestamp': timestamp, 'metadata': {'large': 'blob'}}],
+        }
+
+    def test_ttl_cache_evicts_least_recently_used(self):
+        """Test that the LRU drops the oldest entry beyond max_entries."""
+        from core.langfuse.cache import TTLCache
+
+        cache = TTLCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_ttl_cache_expires_entries(self):
+        """Test that expired entries are treated as misses."""
+        from core.langfuse.cache import TTLCache
+
+        cache = TTLCache()
+        cache.set('a', 1, ttl=-1)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
+
+    def test_get_session_is_read_through(self):
+        """Test that repeated reads hit Langfuse once until refreshed or invalidated."""
+        import asyncio
+        from unittest.mock import AsyncMock
+        from core.langfuse.services import SessionService
+
+        service = SessionService()
+        service.client.get = AsyncMock(return_value=self.make_session())
+
+        async def scenario():
+            await service.get_session('session_1')
+            await service.get_session('session_1')
+            await service.get_session('session_1', refresh=True)
+            await service.invalidate_session('session_1')
+            await service.get_session('session_1')
+
+        asyncio.run(scenario())
+        self.assertEqual(service.client.get.await_count, 3)
+
+    def test_sessions_are_decoded_into_immutable_traces(self):
+        """Test that sessions come back as frozen Session/Trace objects without metadata."""
+        import asyncio
+        import dataclasses
+        from unittest.mock import AsyncMock
+        from core.langfuse.models import Trace
+        from core.langfuse.services import SessionService
+
+        service = SessionService()
+        service.client.get = AsyncMock(return_value=self.make_session())
+        session = asyncio.run(service.get_session('session_1'))
+
+        self.assertIsInstance(session.traces[0], Trace)
+        self.assertIsNone(session.traces[0].metadata)
+        self.assertFalse(hasattr(session.traces[0], '__dict__'))
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            session.traces[0].id = 'other'
+
+    def test_active_sessions_use_short_ttl(self):
+        """Test that sessions with recent traces get the active TTL."""
+        from datetime import datetime, timezone
+        from core.langfuse.models import Session
+        from core.langfuse.services import SessionService
+
+        service = SessionService()
+        recent = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+        with self.settings(LANGFUSE_SESSION_CACHE_TTL=300, LANGFUSE_SESSION_CACHE_ACTIVE_TTL=5):
+            self.assertEqual(service._cache_ttl(Session.from_api(self.make_session(recent))), 5)
+            self.assertEqual(service._cache_ttl(Session.from_api(self.make_session())), 300)
+
+    def test_shared_backend_is_used_when_alias_configured(self):
+        """Test that payloads go to the Django cache when an alias is set."""
+        import asyncio
+        from django.core.cache import caches
+        from unittest.mock import AsyncMock
+        from core.langfuse.models import Session
+        from core.langfuse.services import SessionService
+
+        service = SessionService()
+        service.client.get = AsyncMock(return_value=self.make_session())
+
+        with self.settings(LANGFUSE_CACHE_ALIAS='default'):
+            asyncio.run(service.get_session('session_1'))
+            self.assertEqual(caches['default'].get('langfuse:session:session_1'), Session.from_api(self.make_session()))
+            self.assertEqual(len(service.cache.local), 0)
+            caches['default'].clear()
+
+
+class ChatDataCacheTests(TestCase):
+    """Test cases for memoization of parsed session chat data."""
+
+    def make_session(self, session_id, timestamp='2024-01-01T12:00:00Z'):
+        from core.langfuse.models import Session
+
+        trace = {
+            'id': 'trace_1',
+            'timestamp': timestamp,
+            'input': {'messages': [{'id': 'h1', 'type': 'human', 'content': 'Hi'}]},
+            'output': {'messages': [
+                {'id': 'h1', 'type': 'human', 'content': 'Hi'},
+                {'id': 'a1', 'type': 'ai', 'content': [{'type': 'text', 'text': 'Hello'}]},
+            ]},
+        }
+        return Session(
+            id=session_id, created_at='2024-01-01T12:00:00Z', updated_at='',
+            project_id='project_1', public=False, bookmarked=False, traces=[trace]
+        )
+
+    def test_unchanged_session_is_parsed_once(self):
+        """Test that repeat views reuse the parsed structure."""
+        from unittest.mock import patch
+        from core import session_parser
+
+        with patch.object(session_parser, 'build_chat_history', wraps=session_parser.build_chat_history) as build:
+            first = session_parser.get_session_chat_data(self.make_session('cache_session_a'))
+            second = session_parser.get_session_chat_data(self.make_session('cache_session_a'))
+
+        self.assertIs(first, second)
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(first['traces'][0]['output'][0]['ai'], 'Hello')
+
+    def test_changed_traces_invalidate_parsed_structure(self):
+        """Test that a new trace timestamp produces a fresh parse."""
+        from core.session_parser import get_session_chat_data, chat_data_cache_key
+
+        old = self.make_session('cache_session_b')
+        new = self.make_session('cache_session_b', timestamp='2024-01-01T13:00:00Z')
+
+        self.assertNotEqual(chat_data_cache_key(old), chat_data_cache_key(new))
+        self.assertIsNot(get_session_chat_data(old), get_session_chat_data(new))
+
+    def make_grown_session(self, session_id, turns):
+        from core.langfuse.models import Session
+
+        traces = [
+            {
+                'id': f"trace_{turn}",
+                'timestamp': f"2024-01-01T12:{turn:02d}:00Z",
+                'updatedAt': f"2024-01-01T12:{turn:02d}:30Z",
+                'input': {'messages': [{'id': f"h{turn}", 'type': 'human', 'content': f"Hi {turn}"}]},
+                'output': {'messages': [
+                    {'id': f"h{turn}", 'type': 'human', 'content': f"Hi {turn}"},
+                    {'id': f"a{turn}", 'type': 'ai', 'content': [{'type': 'text', 'text': f"Hello {turn}"}]},
+                ]},
+            }
+            for turn in turns
+        ]
+        return Session(
+            id=session_id, created_at='2024-01-01T12:00:00Z', updated_at='',
+            project_id='project_1', public=False, bookmarked=False, traces=traces[::-1]
+        )
+
+    def test_grown_session_parses_only_new_traces(self):
+        """Test that a session that gained traces reuses the turns parsed before."""
+        from unittest.mock import patch
+        from core import session_parser
+
+        with patch.object(session_parser, 'parse_trace', wraps=session_parser.parse_trace) as parse:
+            first = session_parser.get_session_chat_data(self.make_grown_session('cache_session_c', [0, 2]))
+            self.assertEqual(parse.call_count, 2)
+            grown = session_parser.get_session_chat_data(self.make_grown_session('cache_session_c', [0, 1, 2, 3]))
+
+        self.assertEqual(parse.call_count, 4)
+        self.assertEqual(
+            [call.args[0].id for call in parse.call_args_list[2:]], ['trace_1', 'trace_3']
+        )
+        self.assertEqual([turn['trace_id'] for turn in grown['traces']], ['trace_0', 'trace_1', 'trace_2', 'trace_3'])
+        self.assertIs(grown['traces'][0], first['traces'][0])
+
+    def test_removed_and_updated_traces_are_reflected(self):
+        """Test that dropped traces disappear and updated traces are parsed again."""
+        from core.session_parser import build_chat_history
+
+        build_chat_history(self.make_grown_session('cache_session_d', [0, 1, 2]))
+        session = self.make_grown_session('cache_session_d', [0, 2])
+        session.traces[0].update(updatedAt='2024-01-01T13:00:00Z', output={'messages': [
+            {'id': 'h2', 'type': 'human', 'content': 'Hi 2'},
+            {'id': 'a2', 'type': 'ai', 'content': [{'type': 'text', 'text': 'Edited'}]},
+        ]})
+        history = build_chat_history(session)
+
+        self.assertEqual([turn['trace_id'] for turn in history], ['trace_0', 'trace_2'])
+        self.assertEqual(history[1]['output'][0]['ai'], 'Edited')
+
+
+class StaleWhileRevalidateCacheTests(TestCase):
+    """Test cases for the stale-while-revalidate queue cache."""
+
+    def run_scenario(self, scenario):
+        import asyncio
+        return asyncio.run(scenario())
+
+    def test_fresh_values_are_served_without_fetching(self):
+        """Test that values younger than the soft TTL are not refetched."""
+        from unittest.mock import AsyncMock
+        from core.langfuse.cache import StaleWhileRevalidateCache
+
+        cache = StaleWhileRevalidateCache('test')
+        fetch = AsyncMock(return_value={'name': 'Queue'})
+
+        async def scenario():
+            await cache.get('q', fetch)
+            return await cache.get('q', fetch)
+
+        self.assertEqual(self.run_scenario(scenario), {'name': 'Queue'})
+        self.assertEqual(fetch.await_count, 1)
+
+    def test_soft_expired_values_refresh_in_background(self):
+        """Test that stale values are served immediately and refreshed afterwards."""
+        import asyncio
+        from unittest.mock import AsyncMock
+        from core.langfuse.cache import StaleWhileRevalidateCache
+
+        cache = StaleWhileRevalidateCache('test')
+        fetch = AsyncMock(side_effect=[{'v': 1}, {'v': 2}])
+
+        async def scenario():
+            await cache.get('q', fetch)
+            served = await cache.get('q', fetch)
+            await asyncio.sleep(0.01)
+            refreshed = await cache.get('q', fetch)
+            return served, refreshed
+
+        with self.settings(LANGFUSE_QUEUE_CACHE_SOFT_TTL=0):
+            served, refreshed = self.run_scenario(scenario)
+
+        self.assertEqual(served, {'v': 1})
+        self.assertEqual(refreshed, {'v': 2})
+
+    def test_errors_fall_back_to_stale_value(self):
+        """Test that a failing refetch past the hard TTL serves the stale value."""
+        from unittest.mock import AsyncMock
+        from core.langfuse.cache import StaleWhileRevalidateCache
+        from core.langfuse.exceptions import LangfuseAPIError
+
+        cache = StaleWhileRevalidateCache('test')
+        fetch = AsyncMock(side_effect=[{'v': 1}, LangfuseAPIError('down', status_code=503)])
+
+        async def scenario():
+            await cache.get('q', fetch)
+            return await cache.get('q', fetch)
+
+        with self.settings(LANGFUSE_QUEUE_CACHE_SOFT_TTL=0, LANGFUSE_QUEUE_CACHE_HARD_TTL=0):
+            self.assertEqual(self.run_scenario(scenario), {'v': 1})
+
+    def test_errors_without_stale_value_propagate(self):
+        """Test that the first failing fetch still raises."""
+        from unittest.mock import AsyncMock
+        from core.langfuse.cache import StaleWhileRevalidateCache
+        from core.langfuse.exceptions import LangfuseAPIError
+
+        cache = StaleWhileRevalidateCache('test')
+        fetch = AsyncMock(side_effect=LangfuseAPIError('down', status_code=503))
+
+        with self.assertRaises(LangfuseAPIError):
+            self.run_scenario(lambda: cache.get('q', fetch))
+
+
+class ScoreConfigRegistryTests(TestCase):
+    """Test cases for the in-memory score config registry."""
+
+    configs = [
+        {'id': 'cfg_trace', 'name': 'COMMENT-trace', 'dataType': 'NUMERIC', 'isArchived': False,
+         'updatedAt': '2025-01-02T00:00:00Z'},
+        {'id': 'cfg_old', 'name': 'COMMENT-trace', 'dataType': 'NUMERIC', 'isArchived': True,
+         'updatedAt': '2025-01-01T00:00:00Z'},
+    ]
+
+    def make_service(self):
+        from unittest.mock import AsyncMock
+        from core.langfuse.services import ScoringService
+
+        async def fake_get(endpoint, params=None):
+            limit = (params or {}).get('limit', 100)
+            return {
+                'data': self.configs[:limit],
+                'meta': {'totalItems': len(self.configs), 'totalPages': 1},
+            }
+
+        service = ScoringService()
+        service.client.get = AsyncMock(side_effect=fake_get)
+        service.client.post = AsyncMock(return_value={'id': 'score_1'})
+        return service
+
+    def test_preload_runs_in_gunicorn_workers_only(self):
+        """Test that app startup never preloads and the gunicorn worker hook does."""
+        import importlib.util
+        from pathlib import Path
+        from unittest.mock import patch
+        from django.apps import apps
+        from django.conf import settings
+
+        with patch('core.langfuse.service.langfuse_service.preload_score_configs') as preload, \
+                self.settings(LANGFUSE_PUBLIC_KEY='pk-test', LANGFUSE_PRELOAD_SCORE_CONFIGS=True):
+            apps.get_app_config('core').ready()
+            preload.assert_not_called()
+
+            path = Path(settings.BASE_DIR) / 'admin' / 'gunicorn.conf.py'
+            spec = importlib.util.spec_from_file_location('gunicorn_conf', path)
+            gunicorn_conf = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(gunicorn_conf)
+            gunicorn_conf.post_worker_init(worker=None)
+            preload.assert_called_once()
+
+    def test_configs_are_indexed_by_name_and_id(self):
+        """Test lookups by name prefer active configs and lookups by id work."""
+        import asyncio
+        service = self.make_service()
+
+        async def scenario():
+            return (
+                await service.configs.get_by_name('COMMENT-trace'),
+                await service.configs.get_by_id('cfg_old'),
+            )
+
+        by_name, by_id = asyncio.run(scenario())
+        self.assertEqual(by_name.id, 'cfg_trace')
+        self.assertTrue(by_id.is_archived)
+        self.assertEqual(service.client.get.await_count, 1)
+
+    def test_unchanged_fingerprint_skips_reload(self):
+        """Test that the change check fetches one config and does not reload."""
+        import asyncio
+        service = self.make_service()
+
+        async def scenario():
+            await service.configs.load()
+            await service.configs.check_for_changes()
+
+        asyncio.run(scenario())
+        self.assertEqual(service.client.get.await_count, 2)
+        self.assertEqual(service.client.get.await_args.args[1], {'page': 1, 'limit': 1})
+
+    def test_trace_comment_resolves_config_by_name(self):
+        """Test that trace comments use the config id resolved by name."""
+        import asyncio
+        service = self.make_service()
+
+        asyncio.run(service.create_trace_comment('trace_1', 'Nice'))
+
+        payload = service.client.post.await_args.args[1]
+        self.assertEqual(payload['configId'], 'cfg_trace')
+        self.assertEqual(payload['name'], 'COMMENT-trace')
+
+    def test_comment_falls_back_when_configs_unavailable(self):
+        """Test that comments still use the fallback id if configs fail to load."""
+        import asyncio
+        from unittest.mock import AsyncMock
+        from core.langfuse.exceptions import LangfuseAPIError
+        from core.langfuse.services.scoring import FALLBACK_COMMENT_CONFIG_ID
+
+        service = self.make_service()
+        service.client.get = AsyncMock(side_effect=LangfuseAPIError('down', status_code=503))
+
+        asyncio.run(service.create_session_comment('session_1', 'Nice'))
+
+        payload = service.client.post.await_args.args[1]
+        self.assertEqual(payload['configId'], FALLBACK_COMMENT_CONFIG_ID)
+
+
+class LangfuseBatchTests(TestCase):
+    """Test cases for concurrent batches of Langfuse calls."""
+
+    def test_gather_runs_calls_concurrently(self):
+        """Test that batched calls overlap instead of running one after another."""
+        import asyncio
+        from core.langfuse.service import langfuse_service
+
+        async def scenario():
+            first_started, second_started = asyncio.Event(), asyncio.Event()
+
+            async def first():
+                first_started.set()
+                await second_started.wait()
+                return 'queue'
+
+            async def second():
+                second_started.set()
+                await first_started.wait()
+                return 'items'
+
+            return await langfuse_service.agather(first(), second(), timeout=1)
+
+        self.assertEqual(asyncio.run(scenario()), ['queue', 'items'])
+
+    def test_gather_returns_failures_in_place(self):
+        """Test that one failing call does not discard the other results."""
+        from core.langfuse.service import langfuse_service
+        from core.langfuse.exceptions import LangfuseAPIError
+
+        async def ok():
+            return 'items'
+
+        async def failing():
+            raise LangfuseAPIError('not found', status_code=404)
+
+        queue, items = langfuse_service.gather(failing(), ok())
+
+        self.assertIsInstance(queue, LangfuseAPIError)
+        self.assertEqual(items, 'items')
+
+    def test_gather_timeout_raises(self):
+        """Test that a batch exceeding its timeout raises LangfuseTimeoutError."""
+        import asyncio
+        from core.langfuse.service import langfuse_service
+        from core.langfuse.exceptions import LangfuseTimeoutError
+
+        with self.assertRaises(LangfuseTimeoutError):
+            asyncio.run(langfuse_service.agather(asyncio.sleep(5), timeout=0.05))
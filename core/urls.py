@@ -9,4 +9,16 @@ app_name = 'core'
 
 urlpatterns = [
     path('dashboard/', views.dashboard, name='dashboard'),
+    path('langfuse/status/', views.langfuse_status, name='langfuse_status'),
+    path('sessions/<str:session_id>/turns/', views.session_turns, name='session_turns'),
+    path(
+        'sessions/<str:session_id>/traces/<str:trace_id>/tools/<str:tool_call_id>/',
+        views.session_tool_call,
+        name='session_tool_call',
+    ),
+    path(
+        'sessions/<str:session_id>/traces/<str:trace_id>/tools/<str:tool_call_id>/output/',
+        views.session_tool_output,
+        name='session_tool_output',
+    ),
 ]
\ No newline at end of file
@@ -3,9 +3,18 @@ Views for the core app.
 Handles the main dashboard and shared functionality.
 """
 
+from asgiref.sync import sync_to_async
 from django.shortcuts import render
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
-from .permissions import user_has_tool_permission
+from django.http import HttpResponse, JsonResponse
+from django.template.loader import render_to_string
+from django.urls import reverse
+from .langfuse.client import circuit_breaker_status
+from .langfuse.exceptions import LangfuseAPIError
+from .langfuse.service import langfuse_service
+from .permissions import require_any_tool_permission, user_has_tool_permission
+from .session_parser import get_chat_window, get_session_chat_data, get_tool_call, get_tool_output
 
 @login_required
 def dashboard(request):
@@ -51,3 +60,88 @@ def dashboard(request):
     }
     
     return render(request, 'core/dashboard.html', context)
+
+
+@staff_member_required
+def langfuse_status(request):
+    """
+    Staff-only JSON view of the Langfuse circuit breakers of this worker process.
+    """
+    circuits = circuit_breaker_status()
+    return JsonResponse({
+        'healthy': all(circuit['state'] == 'closed' for circuit in circuits.values()),
+        'circuits': circuits,
+    })
+
+
+@login_required
+@require_any_tool_permission('annotation', 'session_viewer')
+async def session_tool_call(request, session_id, trace_id, tool_call_id):
+    """
+    JSON view of one tool call of a session trace, with its formatted input
+    and output.
+    
+    The shared chat display only renders tool summaries and fetches this
+    when a tool panel is expanded.
+    """
+    try:
+        session = await langfuse_service.aget_session(session_id)
+    except LangfuseAPIError as e:
+        return JsonResponse({'error': str(e)}, status=502)
+    
+    tool_call = await sync_to_async(get_tool_call, thread_sensitive=False)(session, trace_id, tool_call_id)
+    if tool_call is None:
+        return JsonResponse({'error': 'Tool call not found'}, status=404)
+    if tool_call['output_truncated']:
+        tool_call['full_output_url'] = reverse(
+            'core:session_tool_output', args=[session_id, trace_id, tool_call_id]
+        )
+    return JsonResponse(tool_call)
+
+
+@login_required
+@require_any_tool_permission('annotation', 'session_viewer')
+async def session_tool_output(request, session_id, trace_id, tool_call_id):
+    """
+    Full output of one tool call as plain text.
+    
+    session_tool_call only returns a preview of outputs larger than
+    SESSION_TOOL_OUTPUT_MAX_BYTES; the chat display loads the rest from here.
+    """
+    try:
+        session = await langfuse_service.aget_session(session_id)
+    except LangfuseAPIError as e:
+        return JsonResponse({'error': str(e)}, status=502)
+    
+    output = await sync_to_async(get_tool_output, thread_sensitive=False)(session, trace_id, tool_call_id)
+    if output is None:
+        return JsonResponse({'error': 'Tool call not found'}, status=404)
+    return HttpResponse(output, content_type='text/plain; charset=utf-8')
+
+
+@login_required
+@require_any_tool_permission('annotation', 'session_viewer')
+async def session_turns(request, session_id):
+    """
+    HTML fragment with one window of a session's chat turns, starting at
+    ?start=, followed by the placeholder that loads the next window.
+    
+    The shared chat display renders the first window of long sessions and
+    fetches the rest from here as the user scrolls.
+    """
+    try:
+        start = int(request.GET.get('start', 0))
+    except ValueError:
+        return HttpResponse('Invalid start', status=400)
+    
+    try:
+        session = await langfuse_service.aget_session(session_id)
+    except LangfuseAPIError as e:
+        return HttpResponse(str(e), status=502)
+    
+    chat_data = await sync_to_async(get_session_chat_data, thread_sensitive=False)(session)
+    context = {'chat_data': chat_data, 'chat_window': get_chat_window(chat_data, start)}
+    html = await sync_to_async(render_to_string, thread_sensitive=False)(
+        'includes/session_chat_turns.html', context
+    )
+    return HttpResponse(html)
@@ -69,4 +69,107 @@ class SessionViewerViewTests(TestCase):
         self.assertEqual(response.status_code, 302)
         self.assertEqual(response.url, reverse('core:dashboard'))
 
+    def make_session(self, session_id, turns=1):
+        """Build a Session whose traces are given newest first."""
+        from core.langfuse.models import Session
 
+        traces = []
+        for turn in range(turns):
+            traces.append({
+                'id': f"trace-{turn}",
+                'timestamp': f"2024-01-01T00:{turn:02d}:00Z",
+                'input': {'messages': [{'id': f"h{turn}", 'type': 'human', 'content': f"Question {turn}"}]},
+                'output': {'messages': [
+                    {'id': f"h{turn}", 'type': 'human', 'content': f"Question {turn}"},
+                    {'id': f"a{turn}", 'type': 'ai', 'content': [{'type': 'text', 'text': f"Answer {turn}"}]},
+                ]},
+            })
+        return Session.from_api({
+            'id': session_id,
+            'createdAt': '2024-01-01T00:00:00Z',
+            'projectId': 'project-1',
+            'traces': list(reversed(traces)),
+        })
+
+    async def test_session_detail_awaits_service(self):
+        """Test that the async session detail view renders a mocked session."""
+        from unittest.mock import AsyncMock, patch
+
+        session = self.make_session('session-1')
+        await self.async_client.aforce_login(self.authorized_user)
+        with self.settings(SESSION_VIEWER_STREAMING=False), patch(
+            'session_viewer.views.langfuse_service.aget_session',
+            new=AsyncMock(return_value=session)
+        ):
+            response = await self.async_client.get(
+                reverse('session_viewer:session_detail', kwargs={'session_id': 'session-1'})
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Answer 0')
+
+    async def test_session_detail_streams_turns_in_order(self):
+        """Test that an unparsed session is streamed head, turns in order, then tail."""
+        from unittest.mock import AsyncMock, patch
+        from core.session_parser import get_cached_chat_data
+
+        session = self.make_session('session-stream', turns=3)
+        await self.async_client.aforce_login(self.authorized_user)
+        with patch(
+            'session_viewer.views.langfuse_service.aget_session',
+            new=AsyncMock(return_value=session)
+        ):
+            response = await self.async_client.get(
+                reverse('session_viewer:session_detail', kwargs={'session_id': 'session-stream'})
+            )
+            self.assertTrue(response.streaming)
+            chunks = [chunk async for chunk in response.streaming_content]
+
+        # Page head, one chunk per turn, the (empty) placeholder for more
+        # turns, page tail
+        self.assertEqual(len(chunks), 6)
+        self.assertIn(b'class="chat-messages"', chunks[0])
+        for turn, chunk in enumerate(chunks[1:4]):
+            self.assertIn(f"Answer {turn}".encode(), chunk)
+        self.assertNotIn(b'chat-more', chunks[4])
+        self.assertIn(b'</html>', chunks[-1])
+        self.assertNotIn(b'session-chat-turns', b''.join(chunks))
+
+        # The fully streamed session is memoized, so the next view renders at once
+        self.assertEqual(get_cached_chat_data(session)['total_traces'], 3)
+
+    async def test_long_sessions_render_first_window_and_load_the_rest(self):
+        """Test that only the first window is in the page and later turns come as fragments."""
+        from unittest.mock import AsyncMock, patch
+
+        session = self.make_session('session-window', turns=5)
+        await self.async_client.aforce_login(self.authorized_user)
+        with self.settings(SESSION_CHAT_WINDOW_SIZE=2), patch(
+            'session_viewer.views.langfuse_service.aget_session',
+            new=AsyncMock(return_value=session)
+        ), patch('core.views.langfuse_service.aget_session', new=AsyncMock(return_value=session)):
+            for streaming in (True, False):
+                with self.settings(SESSION_VIEWER_STREAMING=streaming):
+                    response = await self.async_client.get(
+                        reverse('session_viewer:session_detail', kwargs={'session_id': 'session-window'})
+                    )
+                    if response.streaming:
+                        content = b''.join([chunk async for chunk in response.streaming_content]).decode()
+                    else:
+                        content = response.content.decode()
+                self.assertIn('Answer 1', content)
+                self.assertNotIn('Answer 2', content)
+                self.assertIn(reverse('core:session_turns', args=['session-window']) + '?start=2', content)
+
+            response = await self.async_client.get(
+                reverse('core:session_turns', args=['session-window']), {'start': 2}
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, 'Answer 3')
+            self.assertContains(response, '?start=4')
+
+            response = await self.async_client.get(
+                reverse('core:session_turns', args=['session-window']), {'start': 4}
+            )
+            self.assertContains(response, 'Answer 4')
+            self.assertNotContains(response, 'chat-more')
@@ -1,11 +1,23 @@
+import logging
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
+from django.template.loader import get_template, render_to_string
+from django.utils.html import format_html
 from core.langfuse.service import langfuse_service
 from core.langfuse.exceptions import LangfuseAPIError
-from core.session_parser import get_session_chat_data
+from core.session_parser import (
+    get_cached_chat_data, get_chat_window, get_session_chat_data, iter_session_chat_data
+)
 from core.permissions import require_tool_permission
 
+logger = logging.getLogger(__name__)
+
+# Placeholder the chat display outputs in place of the turns when streaming
+STREAM_MARKER = '<!-- session-chat-turns -->'
+
 @login_required
 @require_tool_permission('session_viewer')
 def index(request):
@@ -14,35 +26,39 @@ def index(request):
 
 @login_required
 @require_tool_permission('session_viewer')
-def session_detail(request, session_id):
+async def session_detail(request, session_id):
     """
     Display detailed view of a session with chat-like interface.
     
     Args:
         request: Django request object
         session_id: The unique identifier of the session to display
+    
+    Pass ?refresh=1 to bypass the session cache and refetch from Langfuse.
+    
+    Sessions that have not been parsed yet are streamed when
+    SESSION_VIEWER_STREAMING is on: the page is sent up to the chat
+    messages, then each turn as soon as it is parsed, then the rest.
+    
+    Only the first SESSION_CHAT_WINDOW_SIZE turns are part of the page; the
+    chat display loads later ones from core:session_turns on scroll.
     """
     try:
         # Fetch session data using service layer
-        session_data = langfuse_service.get_session(session_id)
-        # Convert to Session object for parser compatibility
-        from core.langfuse.models import Session
-        session = Session(
-            id=session_data['id'],
-            created_at=session_data['createdAt'],
-            updated_at=session_data.get('updatedAt', ''),
-            project_id=session_data['projectId'],
-            public=session_data.get('public', False),
-            bookmarked=session_data.get('bookmarked', False),
-            traces=session_data.get('traces', [])
-        )
+        refresh = request.GET.get('refresh') == '1'
+        session = await langfuse_service.aget_session(session_id, refresh=refresh)
+        
+        if (getattr(settings, 'SESSION_VIEWER_STREAMING', True) and session.traces
+                and get_cached_chat_data(session) is None):
+            return await _stream_session_detail(request, session_id, session)
         
         # Parse session data into chat format
-        chat_data = get_session_chat_data(session)
+        chat_data = await sync_to_async(get_session_chat_data, thread_sensitive=False)(session)
         
         context = {
             'session_id': session_id,
             'chat_data': chat_data,
+            'chat_window': get_chat_window(chat_data),
             'error': None
         }
         
@@ -59,4 +75,51 @@ def session_detail(request, session_id):
             'error': f"Unexpected error: {str(e)}"
         }
     
-    return render(request, 'session_viewer/session_detail.html', context)
\ No newline at end of file
+    return await sync_to_async(render)(request, 'session_viewer/session_detail.html', context)
+
+
+async def _stream_session_detail(request, session_id, session):
+    """Stream the session detail page, parsing and rendering one turn at a time."""
+    context = {
+        'session_id': session_id,
+        'chat_data': {'session_id': session.id, 'total_traces': len(session.traces)},
+        'error': None,
+        'stream_marker': STREAM_MARKER,
+    }
+    page = await sync_to_async(render_to_string)('session_viewer/session_detail.html', context, request)
+    head, tail = page.split(STREAM_MARKER, 1)
+
+    window_size = getattr(settings, 'SESSION_CHAT_WINDOW_SIZE', 50)
+    turns = iter_session_chat_data(session)
+    turn_template = get_template('includes/session_chat_turn.html')
+    more_template = get_template('includes/session_chat_more.html')
+
+    def render_next_turn():
+        turn = next(turns, None)
+        return None if turn is None else turn_template.render({'trace': turn, 'chat_data': context['chat_data']})
+
+    def render_more():
+        # Parse the turns after the first window too, which memoizes the
+        # chat data core:session_turns serves them from
+        remaining = sum(1 for _ in turns)
+        chat_window = {'next_start': window_size if remaining else None}
+        return more_template.render({'chat_data': context['chat_data'], 'chat_window': chat_window})
+
+    async def stream():
+        yield head
+        try:
+            for _ in range(window_size):
+                fragment = await sync_to_async(render_next_turn, thread_sensitive=False)()
+                if fragment is None:
+                    break
+                yield fragment
+            yield await sync_to_async(render_more, thread_sensitive=False)()
+        except Exception as e:
+            # The response has already started, so report in the page itself
+            logger.exception(f"Error streaming session {session_id}")
+            yield format_html(
+                '<div class="error-message"><h4>Error Loading Session</h4><p>Unexpected error: {}</p></div>', e
+            )
+        yield tail
+
+    return StreamingHttpResponse(stream())